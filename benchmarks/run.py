@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+from tkeditor.document import PieceTable, TextEdit
+from tkeditor.io import (
+    atomic_write,
+    detect_encoding,
+    is_binary_bytes,
+    read_samples,
+    read_text_file,
+    sniff_encoding,
+)
+from tkeditor.journal import RecoveryJournal
+from tkeditor.search import MatchIndex, compile_pattern, plan_replacements
+
+DEFAULT_SIZES = "1K,1M,16M"
+SIZE_UNITS = {"K": 1024, "M": 1024**2, "G": 1024**3}
+EDIT_COUNT = 1000
+FIND_COUNT = 1000
+WORDS = ("lorem", "ipsum", "dolor", "sit", "amet", "naïve", "café", "needle", "x")
+
+# name -> function(document text, path of the same text on disk, scratch dir)
+# returning (elapsed seconds, operations performed).
+Case = Callable[[str, Path, Path], tuple[float, int]]
+
+
+def parse_size(value: str) -> int:
+    value = value.strip().upper()
+    if value[-1:] in SIZE_UNITS:
+        return int(float(value[:-1]) * SIZE_UNITS[value[-1]])
+    return int(value)
+
+
+def generate_lines(size: int, seed: int = 0) -> Iterator[str]:
+    """Yield deterministic lines of words totalling about ``size`` characters."""
+    rng = random.Random(seed)
+    produced = 0
+    while produced < size:
+        line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 16))) + "\n"
+        produced += len(line)
+        yield line
+
+
+def _timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def bench_read(text: str, path: Path, scratch: Path) -> tuple[float, int]:
+    return _timed(lambda: read_text_file(path)), 1
+
+
+def bench_write(text: str, path: Path, scratch: Path) -> tuple[float, int]:
+    target = scratch / "write.txt"
+    return _timed(lambda: atomic_write(target, text, "utf-8")), 1
+
+
+def bench_sniff(text: str, path: Path, scratch: Path) -> tuple[float, int]:
+    data = path.read_bytes()
+
+    def run() -> None:
+        sniff_encoding(data[:4])
+        is_binary_bytes(data)
+
+    return _timed(run), 1
+
+
+def bench_detect(text: str, path: Path, scratch: Path) -> tuple[float, int]:
+    return _timed(lambda: detect_encoding(read_samples(path))), 1
+
+
+def bench_find_index(text: str, path: Path, scratch: Path) -> tuple[float, int]:
+    pattern = compile_pattern("needle", False)
+    return _timed(lambda: MatchIndex.build(pattern, True, text)), 1
+
+
+def bench_find_next(text: str, path: Path, scratch: Path) -> tuple[float, int]:
+    index = MatchIndex.build(compile_pattern("needle", False), True, text)
+    rng = random.Random(1)
+    offsets = [rng.randrange(len(text) + 1) for _ in range(FIND_COUNT)]
+
+    def run() -> None:
+        for offset in offsets:
+            index.next_after(offset)
+            index.previous_before(offset)
+
+    return _timed(run), FIND_COUNT * 2
+
+
+def bench_replace_plan(text: str, path: Path, scratch: Path) -> tuple[float, int]:
+    pattern = compile_pattern("needle", False)
+    return _timed(lambda: plan_replacements(pattern, text, "pin", False)), 1
+
+
+def _random_edits(length: int, count: int) -> list[tuple[int, str]]:
+    rng = random.Random(2)
+    edits = []
+    for _ in range(count):
+        edits.append((rng.randrange(length + 1), rng.choice(("a", "\n", ""))))
+        length += 1 if edits[-1][1] else -1
+    return edits
+
+
+def bench_typing(text: str, path: Path, scratch: Path) -> tuple[float, int]:
+    document = PieceTable(text)
+    edits = _random_edits(len(text), EDIT_COUNT)
+
+    def run() -> None:
+        for offset, inserted in edits:
+            if inserted:
+                document.insert(offset, inserted)
+            else:
+                document.delete(offset, 1)
+            document.line_col(offset)
+
+    return _timed(run), EDIT_COUNT
+
+
+def bench_autosave(text: str, path: Path, scratch: Path) -> tuple[float, int]:
+    journal = RecoveryJournal(
+        scratch / "recovery.txt", scratch / "recovery.json", scratch / "journal"
+    )
+    journal.clear(path)
+    document = PieceTable(text)
+    for offset, inserted in _random_edits(len(text), EDIT_COUNT):
+        deleted = "" if inserted else document.delete(offset, 1)
+        document.insert(offset, inserted)
+        journal.record(TextEdit(offset, deleted, inserted))
+
+    def run() -> None:
+        snapshot = document.snapshot()
+        snapshot.fingerprint()
+        journal.queue_batch(snapshot, {"path": str(path), "encoding": "utf-8"})
+        journal.flush()
+
+    return _timed(run), EDIT_COUNT
+
+
+CASES: dict[str, Case] = {
+    "io.read_text_file": bench_read,
+    "io.atomic_write": bench_write,
+    "io.sniff_and_binary_check": bench_sniff,
+    "io.detect_encoding": bench_detect,
+    "search.build_index": bench_find_index,
+    "search.find_next_previous": bench_find_next,
+    "search.plan_replace_all": bench_replace_plan,
+    "edit.typing": bench_typing,
+    "autosave.journal_flush": bench_autosave,
+}
+
+
+def run_benchmarks(
+    sizes: list[int], cases: list[str], repeat: int
+) -> list[dict[str, Any]]:
+    results = []
+    with tempfile.TemporaryDirectory(prefix="tkeditor-bench-") as tmp:
+        scratch = Path(tmp)
+        for size in sizes:
+            path = scratch / f"doc-{size}.txt"
+            with path.open("w", encoding="utf-8", newline="") as handle:
+                handle.writelines(generate_lines(size))
+            text = path.read_text(encoding="utf-8")
+            for name in cases:
+                timings = [CASES[name](text, path, scratch) for _ in range(repeat)]
+                seconds, operations = min(timings)
+                results.append(
+                    {
+                        "name": name,
+                        "size": size,
+                        "seconds": seconds,
+                        "operations": operations,
+                        "mb_per_s": size / 1024**2 / seconds if seconds else None,
+                    }
+                )
+                print(
+                    f"{name:<28} {size:>12,} B {seconds * 1000:>10.2f} ms",
+                    file=sys.stderr,
+                )
+            del text
+            path.unlink()
+    return results
+
+
+def compare(
+    results: list[dict[str, Any]], baseline_path: Path, tolerance: float
+) -> list[str]:
+    """Return descriptions of results slower than baseline by over ``tolerance``."""
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    previous = {(r["name"], r["size"]): r["seconds"] for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get((result["name"], result["size"]))
+        if before and result["seconds"] > before * (1 + tolerance):
+            regressions.append(
+                f"{result['name']} @ {result['size']:,} B: "
+                f"{before * 1000:.2f} ms -> {result['seconds'] * 1000:.2f} ms"
+            )
+    return regressions
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="TkEditor benchmarks")
+    parser.add_argument(
+        "--sizes",
+        default=DEFAULT_SIZES,
+        help="comma-separated document sizes, e.g. 1K,1M,1G (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--case", action="append", choices=sorted(CASES), help="run only these cases"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="write JSON results here")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    results = run_benchmarks(sizes, args.case or list(CASES), max(1, args.repeat))
+    report = {
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
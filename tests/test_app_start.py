@@ -1,3 +1,5 @@
+from pathlib import Path
+
 import pytest
 
 
@@ -14,3 +16,51 @@ def test_app_smoke() -> None:
     TextEditorApp(root, EditorConfig())
     root.update_idletasks()
     root.destroy()
+
+
+def test_typing_after_astral_character_saves_correctly(tmp_path: Path) -> None:
+    tk = pytest.importorskip("tkinter")
+    from tkeditor.app import TextEditorApp
+    from tkeditor.config import EditorConfig
+
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("tkinter not available in this environment")
+    root.withdraw()
+    app = TextEditorApp(root, EditorConfig())
+    app.text.insert("1.0", "a\U0001f600b")
+    app.text.insert("1.end -1c", "X")
+    path = tmp_path / "out.txt"
+    assert app._save_file_sync(app.tab, path, "utf-8")
+    assert path.read_bytes() == "a\U0001f600Xb".encode()
+    root.destroy()
+
+
+def test_cancelled_reload_keeps_file_and_text(tmp_path: Path) -> None:
+    tk = pytest.importorskip("tkinter")
+    from tkeditor.app import TextEditorApp
+    from tkeditor.config import EditorConfig
+
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("tkinter not available in this environment")
+    root.withdraw()
+    app = TextEditorApp(root, EditorConfig())
+    path = tmp_path / "doc.txt"
+    path.write_text("one\ntwo\n", encoding="utf-8")
+    app.open_path(path)
+    for _ in range(200):
+        if not app.tab.loading:
+            break
+        root.after(10)
+        root.update()
+    app.text.insert("1.0", "zero\n")
+    app._reload_tab(app.tab)
+    app.cancel_load()
+    assert app.tab.path == path
+    assert app.tab.dirty
+    assert app.document.text() == "zero\none\ntwo\n"
+    assert app.text.get("1.0", "end-1c") == "zero\none\ntwo\n"
+    root.destroy()
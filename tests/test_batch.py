@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pytest
+
+from tkeditor import batch
+from tkeditor.batch import BatchOptions, iter_files, process_file
+
+BINARY = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR" + bytes(range(256))
+
+
+def _tree(root: Path) -> None:
+    (root / "conf").mkdir()
+    (root / ".git").mkdir()
+    (root / "a.cfg").write_text("host = old\nport = 1\n", encoding="utf-8")
+    (root / "conf" / "b.cfg").write_bytes("name = café old\n".encode("cp1252"))
+    (root / "conf" / "c.txt").write_text("old\n", encoding="utf-8")
+    (root / ".git" / "d.cfg").write_text("old\n", encoding="utf-8")
+    (root / "e.cfg").write_bytes(BINARY)
+
+
+def test_batch_replaces_across_tree_in_process_pool(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    _tree(tmp_path)
+    args = [str(tmp_path), "--find", r"\bold\b", "--replace", "new", "--regex"]
+
+    assert batch.main([*args, "--include", "*.cfg", "--dry-run"]) == 0
+    out = capsys.readouterr()
+    assert "+host = new" in out.out
+    assert "3 file(s): 2 would change, 0 unchanged, 1 skipped" in out.err
+    assert (tmp_path / "a.cfg").read_text(encoding="utf-8").startswith("host = old")
+
+    assert batch.main([*args, "--include", "*.cfg", "--jobs", "2"]) == 0
+    assert (tmp_path / "a.cfg").read_text(encoding="utf-8") == "host = new\nport = 1\n"
+    assert (tmp_path / "conf" / "b.cfg").read_bytes() == "name = café new\n".encode(
+        "cp1252"
+    )
+    assert (tmp_path / "conf" / "c.txt").read_text(encoding="utf-8") == "old\n"
+    assert (tmp_path / ".git" / "d.cfg").read_text(encoding="utf-8") == "old\n"
+    assert (tmp_path / "e.cfg").read_bytes() == BINARY
+
+
+@pytest.mark.parametrize("threshold", [0, batch.STREAM_THRESHOLD])
+def test_batch_reencodes_and_normalises_bom(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, threshold: int
+) -> None:
+    monkeypatch.setattr(batch, "STREAM_THRESHOLD", threshold)
+    # Blocks of a line or two, split inside the CRLF pairs.
+    monkeypatch.setattr(batch, "STREAM_CHUNK_SIZE", 7)
+    path = tmp_path / "doc.txt"
+    text = "".join(f"línea {i} vieja\r\n" for i in range(50))
+    path.write_bytes(text.encode("cp1252"))
+
+    options = BatchOptions(find="vieja", replacement="nueva", encoding="utf-8")
+    preview = process_file(str(path), BatchOptions(find="vieja", dry_run=True))
+    assert (preview.status, preview.replacements) == ("changed", 50)
+    assert preview.diff.count("\n-línea") == preview.diff.count("\n+línea") == 50
+    if threshold == 0:
+        assert "@@ -50 +50 @@\n-línea 49 vieja\r\n+línea 49 \r\n" in preview.diff
+    result = process_file(str(path), options)
+    assert (result.status, result.replacements) == ("changed", 50)
+    assert path.read_bytes() == text.replace("vieja", "nueva").encode("utf-8")
+
+    result = process_file(str(path), BatchOptions(bom="add"))
+    assert result.target_encoding == "utf-8-sig"
+    assert path.read_bytes().startswith(b"\xef\xbb\xbf")
+    assert process_file(str(path), BatchOptions(bom="add")).status == "unchanged"
+    process_file(str(path), BatchOptions(bom="remove"))
+    assert path.read_bytes() == text.replace("vieja", "nueva").encode("utf-8")
+
+
+def test_iter_files_keeps_explicit_files(tmp_path: Path) -> None:
+    _tree(tmp_path)
+    names = [p.name for p in iter_files([tmp_path, tmp_path / "e.cfg"], ["*.cfg"])]
+    assert names == ["a.cfg", "e.cfg", "b.cfg", "e.cfg"]
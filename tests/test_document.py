@@ -0,0 +1,96 @@
+import random
+from pathlib import Path
+
+from tkeditor.document import MAX_PIECE, PieceTable
+from tkeditor.io import write_text_file
+
+
+def test_insert_delete_matches_string() -> None:
+    rng = random.Random(1234)
+    doc = PieceTable("hello\nworld\n")
+    expected = "hello\nworld\n"
+    for _ in range(2000):
+        offset = rng.randint(0, len(expected))
+        if rng.random() < 0.6:
+            text = rng.choice(["a", "bc", "\n", "x\ny", "ünï"])
+            doc.insert(offset, text)
+            expected = expected[:offset] + text + expected[offset:]
+        else:
+            length = rng.randint(0, 5)
+            removed = doc.delete(offset, length)
+            assert removed == expected[offset : offset + length]
+            expected = expected[:offset] + expected[offset + length :]
+    assert doc.text() == expected
+    assert len(doc) == len(expected)
+    assert doc.line_count == expected.count("\n") + 1
+
+
+def test_line_col_roundtrip() -> None:
+    text = "".join(f"line {i}\n" for i in range(MAX_PIECE // 4))
+    doc = PieceTable(text)
+    doc.insert(10, "x\n")
+    text = text[:10] + "x\n" + text[10:]
+    for offset in (0, 5, 11, 12, len(text) // 2, len(text)):
+        line, col = doc.line_col(offset)
+        assert doc.offset_of(line, col) == offset
+        assert line == text.count("\n", 0, offset) + 1
+
+
+def test_snapshot_is_immutable() -> None:
+    doc = PieceTable("abc")
+    snapshot = doc.snapshot()
+    doc.insert(1, "XYZ")
+    doc.delete(0, 2)
+    assert snapshot.text() == "abc"
+    assert snapshot.get(1, 3) == "bc"
+    assert doc.text() == "YZbc"
+
+
+def test_fingerprint_ignores_piece_layout() -> None:
+    doc = PieceTable("hello world")
+    saved = doc.snapshot().fingerprint()
+    doc.insert(5, ",")
+    assert doc.snapshot().fingerprint() != saved
+    doc.delete(5, 1)
+    assert doc.snapshot().fingerprint() == saved
+    doc.delete(0, 1)
+    doc.insert(0, "j")
+    changed = doc.snapshot().fingerprint()
+    assert changed.length == saved.length
+    assert changed != saved
+
+
+def test_line_lookups_stay_correct_between_edits() -> None:
+    rng = random.Random(99)
+    expected = "".join(f"row {i}\n" for i in range(MAX_PIECE // 3))
+    doc = PieceTable(expected)
+    for _ in range(500):
+        offset = rng.randint(0, len(expected))
+        text = rng.choice(["", "z", "\n", "a\nb\n"])
+        if text:
+            doc.insert(offset, text)
+            expected = expected[:offset] + text + expected[offset:]
+        else:
+            doc.delete(offset, 3)
+            expected = expected[:offset] + expected[offset + 3 :]
+        line = rng.randint(1, expected.count("\n") + 1)
+        start = 0
+        for _ in range(line - 1):
+            start = expected.index("\n", start) + 1
+        assert doc.offset_of(line, 0) == start
+        probe = rng.randint(0, len(expected))
+        assert doc.line_col(probe)[0] == expected.count("\n", 0, probe) + 1
+    assert doc.line_count == expected.count("\n") + 1
+
+
+def test_columns_count_astral_characters_like_tk(tmp_path: Path) -> None:
+    doc = PieceTable("a\U0001f600b\nc\U0001f600")
+    # Tk puts "b" at column 3: the emoji takes two columns.
+    assert doc.offset_of(1, 3) == 2
+    assert doc.offset_of(2, 3) == len(doc)
+    assert doc.line_col(2) == (1, 3)
+    assert doc.line_col(len(doc)) == (2, 3)
+    doc.insert(doc.offset_of(1, 3), "X")
+    path = tmp_path / "out.txt"
+    write_text_file(path, doc.snapshot().iter_chunks(), "utf-8")
+    assert path.read_bytes() == "a\U0001f600Xb\nc\U0001f600".encode()
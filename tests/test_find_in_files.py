@@ -0,0 +1,59 @@
+import re
+from pathlib import Path
+
+from tkeditor import find_in_files
+from tkeditor.find_in_files import FileHits, FileSearch, search_file
+
+
+def test_search_file_reports_first_match_per_line(tmp_path: Path) -> None:
+    path = tmp_path / "a.txt"
+    path.write_text("alpha\r\nbeta beta\nno\nxbeta\n", encoding="utf-8")
+    assert search_file(path, re.compile("beta"), True) == [
+        (2, 0, "beta beta"),
+        (4, 1, "xbeta"),
+    ]
+    # Matches spanning lines are found with a whole-file scan.
+    assert search_file(path, re.compile(r"alpha\s+beta"), False) == [(1, 0, "alpha")]
+
+
+def test_search_file_columns_count_astral_characters(tmp_path: Path) -> None:
+    path = tmp_path / "a.txt"
+    path.write_text("\U0001f600beta\n", encoding="utf-8")
+    assert search_file(path, re.compile("beta"), True) == [(1, 2, "\U0001f600beta")]
+
+
+def test_file_search_streams_hits_from_worker_processes(tmp_path: Path) -> None:
+    for i in range(150):
+        folder = tmp_path / f"pkg{i % 3}"
+        folder.mkdir(exist_ok=True)
+        body = "needle\n" if i % 10 == 0 else "hay\n"
+        (folder / f"f{i}.py").write_text("x\n" * i + body, encoding="utf-8")
+    (tmp_path / "skip").mkdir()
+    (tmp_path / "skip" / "s.py").write_text("needle\n", encoding="utf-8")
+    (tmp_path / "bin.py").write_bytes(b"needle\x00\x00\x00\x01\x02")
+
+    search = FileSearch(tmp_path, "needle", False, exclude=["skip"], jobs=2)
+    search.start()
+    results: list[FileHits] = []
+    while (item := search.results.get(timeout=60)) is not None:
+        results.append(item)
+
+    assert search.files_scanned == 151
+    found = {Path(item.path).name: item.hits for item in results}
+    assert len(found) == 15
+    assert found["f40.py"] == [(41, 0, "needle")]
+
+
+def test_file_search_cancel_stops_submitting(tmp_path: Path) -> None:
+    total = find_in_files.FILES_PER_TASK * 60
+    for i in range(total):
+        (tmp_path / f"f{i:05}.txt").write_text("needle\n", encoding="utf-8")
+    search = FileSearch(tmp_path, "needle", False, jobs=1)
+    search.start()
+    assert search.results.get(timeout=60) is not None
+    search.cancel()
+    while search.results.get(timeout=60) is not None:
+        pass
+    # Only batches already in flight, at most a couple of rounds, finish.
+    in_flight = find_in_files.FILES_PER_TASK * find_in_files.TASKS_PER_WORKER
+    assert 0 < search.files_scanned <= 2 * in_flight < total
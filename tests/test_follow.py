@@ -0,0 +1,59 @@
+import os
+from pathlib import Path
+
+from tkeditor.follow import LogTail, keep_last_lines
+
+
+def _append(path: Path, data: bytes) -> None:
+    with path.open("ab") as handle:
+        handle.write(data)
+
+
+def test_tail_starts_at_a_line_near_the_end_and_reads_appends(tmp_path: Path) -> None:
+    path = tmp_path / "service.log"
+    path.write_bytes(b"".join(b"line %d\n" % i for i in range(1000)))
+    tail = LogTail(path, "utf-8", start_bytes=30)
+    text, restarted = tail.read()
+    assert not restarted
+    assert text.startswith("line 99") and text.endswith("line 999\n")
+    assert tail.read() == ("", False)
+
+    # A multi-byte character split across two appends is decoded once whole.
+    _append(path, "café ".encode()[:-2])
+    assert tail.read() == ("caf", False)
+    _append(path, "é ".encode()[-2:] + b"ok\n")
+    assert tail.read() == ("é ok\n", False)
+
+
+def test_tail_restarts_after_truncation_and_rotation(tmp_path: Path) -> None:
+    path = tmp_path / "service.log"
+    path.write_text("old 1\nold 2\n", encoding="utf-8")
+    tail = LogTail(path)
+    assert tail.encoding == "utf-8"
+    assert tail.read() == ("old 1\nold 2\n", False)
+
+    path.write_text("new\n", encoding="utf-8")
+    assert tail.read() == ("new\n", True)
+
+    os.replace(path, tmp_path / "service.log.1")
+    assert tail.read() == ("", False)
+    path.write_text("rotated and much longer\n", encoding="utf-8")
+    assert tail.read() == ("rotated and much longer\n", True)
+
+
+def test_tail_reads_large_bursts_in_bounded_steps(tmp_path: Path) -> None:
+    path = tmp_path / "burst.log"
+    path.write_bytes(b"")
+    tail = LogTail(path, "utf-8")
+    _append(path, b"x" * 2500)
+    first, _ = tail.read(max_bytes=1000)
+    second, _ = tail.read(max_bytes=1000)
+    third, _ = tail.read(max_bytes=1000)
+    assert (len(first), len(second), len(third)) == (1000, 1000, 500)
+
+
+def test_keep_last_lines() -> None:
+    assert keep_last_lines("a\nb\nc\n", 2) == "b\nc\n"
+    assert keep_last_lines("a\nb\nc", 2) == "b\nc"
+    assert keep_last_lines("a\nb\n", 5) == "a\nb\n"
+    assert keep_last_lines("a\nb\n", 0) == "a\nb\n"
@@ -0,0 +1,122 @@
+from pathlib import Path
+
+from tkeditor.highlight import (
+    UNKNOWN,
+    JsonLexer,
+    Lexer,
+    LineStates,
+    LogLexer,
+    PythonLexer,
+    YamlLexer,
+    lexer_for,
+)
+
+
+def _kinds(lexer: Lexer, line: str) -> list[tuple[str, str]]:
+    tokens, _ = lexer.lex_line(line)
+    return [(line[start:end], kind) for start, end, kind in tokens]
+
+
+def test_lexers_tokenize_single_lines() -> None:
+    assert _kinds(PythonLexer(), "def f(x=0x1F): return 'a\\'b' # hi") == [
+        ("def", "keyword"),
+        ("0x1F", "number"),
+        ("return", "keyword"),
+        ("'a\\'b'", "string"),
+        ("# hi", "comment"),
+    ]
+    assert _kinds(JsonLexer(), '"a": [1.5, true, "s"]') == [
+        ('"a"', "key"),
+        ("1.5", "number"),
+        ("true", "constant"),
+        ('"s"', "string"),
+    ]
+    assert _kinds(YamlLexer(), "- name: &x yes # note") == [
+        ("name", "key"),
+        ("&x", "decorator"),
+        ("yes", "constant"),
+        ("# note", "comment"),
+    ]
+    assert _kinds(LogLexer(), "2024-01-02 10:11:12,5 ERROR failed") == [
+        ("2024-01-02 10:11:12,5", "comment"),
+        ("ERROR", "error"),
+    ]
+
+
+def test_python_lexer_carries_triple_quoted_strings_across_lines() -> None:
+    lexer = PythonLexer()
+    tokens, state = lexer.lex_line('x = f"""open')
+    assert tokens == [(4, 12, "string")] and state == 2
+    assert lexer.lex_line("still open", state) == ([(0, 10, "string")], 2)
+    tokens, state = lexer.lex_line('end""" + 1', state)
+    assert tokens == [(0, 6, "string"), (9, 10, "number")] and state == 0
+
+
+def test_lexer_for_picks_by_suffix() -> None:
+    assert isinstance(lexer_for(Path("a.PY")), PythonLexer)
+    assert isinstance(lexer_for(Path("a.yml")), YamlLexer)
+    assert lexer_for(Path("a.json")) is lexer_for(Path("b.json"))
+    assert lexer_for(Path("a.txt")) is None
+    assert lexer_for(None) is None
+
+
+def test_line_states_relex_stops_once_states_converge() -> None:
+    lines = [f"x = {i}" for i in range(1000)]
+    lexed: list[int] = []
+
+    def get_line(line: int) -> str:
+        lexed.append(line)
+        return lines[line]
+
+    states = LineStates(PythonLexer(), len(lines))
+    assert states.relex(get_line, 300) == 299
+    assert states.dirty == [300]
+    states.relex(get_line, 10_000)
+    assert not states.dirty and len(lexed) == 1000
+
+    # An edit that does not change the end state re-lexes one line.
+    lexed.clear()
+    lines[10] = "y = 2"
+    states.edit(10, 0, 0)
+    states.relex(get_line, 10_000)
+    assert lexed == [10]
+
+    # Opening a string re-lexes to the end; closing it stops right after.
+    lexed.clear()
+    lines[500] = '"""'
+    states.edit(500, 0, 0)
+    states.relex(get_line, 10_000)
+    assert lexed == list(range(500, 1000))
+    assert states.states[999] == 2
+
+    lexed.clear()
+    lines.insert(501, '"""')
+    states.edit(500, 0, 1)
+    assert len(states.states) == 1001
+    states.relex(get_line, 10_000)
+    assert lexed == list(range(500, 1001))
+    assert states.states[502] == 0 and states.states[1000] == 0
+
+
+def test_line_states_edit_shifts_and_drops_dirty_lines() -> None:
+    states = LineStates(PythonLexer(), 20)
+    states.dirty = [2, 5, 8, 15]
+    # Lines 4..7 (three line breaks) replaced by lines 4..5.
+    states.edit(4, 3, 1)
+    assert len(states.states) == 18
+    assert states.dirty == [2, 4, 6, 13]
+
+
+def test_line_states_single_line_edits_and_restart() -> None:
+    states = LineStates(PythonLexer(), 20)
+    states.dirty = [2, 5, 8, 15]
+    states.edit(10, 0, 0)
+    states.edit(5, 0, 0)
+    states.edit(7, 1, 1)
+    assert states.dirty == [2, 5, 7, 10, 15]
+    assert len(states.states) == 20
+
+    states.restart(6, 25)
+    assert states.dirty == [2, 5, 6]
+    assert len(states.states) == 25
+    assert states.states[7:] == [UNKNOWN] * 18
@@ -0,0 +1,32 @@
+import tkinter as tk
+
+from tkeditor.ui.idle import IdleCoalescer
+
+
+def test_requests_run_once_per_idle_in_order() -> None:
+    interp = tk.Tcl()
+    coalescer = IdleCoalescer(interp)
+    calls: list[str] = []
+
+    def title() -> None:
+        calls.append("title")
+
+    def cursor() -> None:
+        calls.append("cursor")
+
+    for _ in range(50):
+        coalescer.request(cursor)
+        coalescer.request(title)
+    assert calls == []
+    interp.update()
+    assert calls == ["cursor", "title"]
+
+    coalescer.request(title)
+    coalescer.flush()
+    interp.update()
+    assert calls == ["cursor", "title", "title"]
+
+    coalescer.request(cursor)
+    coalescer.cancel()
+    interp.update()
+    assert calls == ["cursor", "title", "title"]
@@ -1,9 +1,18 @@
+import time
 from pathlib import Path
 
 import pytest
 
-from tkeditor.config import EditorConfig, load_config, save_config
-from tkeditor.io import TextIOError, atomic_write, read_text_file
+from tkeditor import io as io_module
+from tkeditor.config import ConfigStore, EditorConfig, load_config, save_config
+from tkeditor.io import (
+    TextIOError,
+    TextStreamReader,
+    atomic_write,
+    detect_encoding,
+    read_samples,
+    read_text_file,
+)
 
 
 def test_atomic_write_and_read(tmp_path: Path) -> None:
@@ -13,6 +22,10 @@ def test_atomic_write_and_read(tmp_path: Path) -> None:
     assert content == "hello world"
     assert encoding == "utf-8"
 
+    path.chmod(0o644)
+    atomic_write(path, "again", encoding="utf-8")
+    assert path.stat().st_mode & 0o777 == 0o644
+
 
 def test_utf8_bom_detection(tmp_path: Path) -> None:
     path = tmp_path / "bom.txt"
@@ -29,6 +42,55 @@ def test_binary_detection(tmp_path: Path) -> None:
         read_text_file(path)
 
 
+@pytest.mark.parametrize(
+    ("data", "encoding"),
+    [
+        (b"plain ascii\n", "utf-8"),
+        ("naïve café ✓\n".encode(), "utf-8"),
+        ("little endian\r\n".encode("utf-16-le"), "utf-16-le"),
+        ("big endian ü\n".encode("utf-16-be"), "utf-16-be"),
+        ("“quoted” café – ok\n".encode("cp1252"), "cp1252"),
+        (b"caf\xe9 \x81\n", "iso-8859-1"),
+    ],
+)
+def test_detect_encoding(tmp_path: Path, data: bytes, encoding: str) -> None:
+    path = tmp_path / "sample.txt"
+    path.write_bytes(data * 2000)
+    samples = read_samples(path, sample_size=1000)
+    assert len(samples) == 3
+    assert sum(map(len, samples)) <= 3000
+    guess = detect_encoding(samples)
+    assert (guess.encoding, guess.binary) == (encoding, False)
+    assert 0.5 <= guess.confidence <= 1.0
+    assert read_text_file(path) == (data.decode(encoding) * 2000, encoding)
+
+
+def test_stream_reader_splits_multibyte_chunks(tmp_path: Path) -> None:
+    path = tmp_path / "stream.txt"
+    text = "héllo wörld ✓\n" * 100
+    path.write_bytes(text.encode("utf-8"))
+    reader = TextStreamReader(path, chunk_size=7)
+    chunks = list(reader)
+    assert len(chunks) > 1
+    assert "".join(chunks) == text
+    assert reader.bytes_read == reader.size
+
+
+def test_atomic_write_streams_chunks(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(io_module, "WRITE_CHUNK_SIZE", 5)
+    path = tmp_path / "chunks.txt"
+    chunks = ["héllo ", "", "wörld ✓\n" * 10]
+    atomic_write(path, iter(chunks), encoding="utf-16")
+    assert path.read_bytes() == "".join(chunks).encode("utf-16")
+
+    with pytest.raises(TextIOError):
+        atomic_write(path, "ascii ✓", encoding="ascii")
+    assert path.read_bytes() == "".join(chunks).encode("utf-16")
+    assert list(tmp_path.iterdir()) == [path]
+
+
 def test_config_roundtrip(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("TKEDITOR_CONFIG_DIR", str(tmp_path))
     config = EditorConfig(
@@ -47,3 +109,26 @@ def test_config_roundtrip(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> No
     assert loaded.autosave_enabled is False
     assert loaded.autosave_interval == 45
     assert loaded.recent_files == ["/tmp/a.txt"]
+
+
+def test_config_store_batches_writes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("TKEDITOR_CONFIG_DIR", str(tmp_path))
+    store = ConfigStore(EditorConfig(), delay=60)
+    for theme in ("dark", "light", "dark"):
+        store.config.theme = theme
+        store.mark_dirty()
+    assert not (tmp_path / "config.json").exists()
+    store.flush()
+    assert load_config().theme == "dark"
+    assert not store.dirty
+
+    store = ConfigStore(store.config, delay=0.01)
+    store.config.font_size = 20
+    store.mark_dirty()
+    deadline = time.monotonic() + 5
+    while store.dirty and time.monotonic() < deadline:
+        time.sleep(0.01)
+    store.flush()  # waits for an in-flight timer write
+    assert load_config().font_size == 20
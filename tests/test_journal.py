@@ -0,0 +1,166 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from tkeditor import journal as journal_module
+from tkeditor.document import PieceTable, TextEdit
+from tkeditor.io import TextIOError
+from tkeditor.journal import RecoveryJournal
+
+
+def _journal(tmp_path: Path) -> RecoveryJournal:
+    return RecoveryJournal(
+        tmp_path / "recovery.txt",
+        tmp_path / "recovery.json",
+        tmp_path / "recovery.journal",
+    )
+
+
+def _edit(journal: RecoveryJournal, doc: PieceTable, offset: int, text: str) -> None:
+    deleted = doc.delete(offset, 1) if not text else ""
+    doc.insert(offset, text)
+    journal.record(TextEdit(offset, deleted, text))
+
+
+def test_journal_replays_edits_on_top_of_file(tmp_path: Path) -> None:
+    base = tmp_path / "doc.txt"
+    base.write_text("hello\nworld\n", encoding="utf-8")
+    doc = PieceTable("hello\nworld\n")
+    journal = _journal(tmp_path)
+    journal.clear(base)
+
+    _edit(journal, doc, 5, ", ünïcode")
+    journal.queue_batch(doc.snapshot(), {"path": str(base), "encoding": "utf-8"})
+    journal.flush()
+    _edit(journal, doc, 0, "")
+    journal.queue_batch(doc.snapshot(), {"path": str(base), "encoding": "utf-8"})
+    journal.flush()
+
+    assert not (tmp_path / "recovery.txt").exists()
+    text, meta = _journal(tmp_path).recover()
+    assert text == doc.text()
+    assert meta["path"] == str(base)
+
+    os.utime(base, ns=(0, 0))
+    with pytest.raises(TextIOError):
+        _journal(tmp_path).recover()
+
+
+def test_journal_compacts_into_checkpoint(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(journal_module, "JOURNAL_COMPACT_BYTES", 64)
+    doc = PieceTable()
+    journal = _journal(tmp_path)
+    for i in range(20):
+        _edit(journal, doc, len(doc), f"line {i}\n")
+        journal.queue_batch(doc.snapshot(), {"path": "", "encoding": "utf-8"})
+        journal.flush()
+
+    assert (tmp_path / "recovery.txt").exists()
+    assert (tmp_path / "recovery.journal").stat().st_size <= 64
+    recovered = _journal(tmp_path)
+    text, _ = recovered.recover()
+    assert text == doc.text()
+
+    # Edits after recovery keep appending to the same journal.
+    doc = PieceTable(text)
+    _edit(recovered, doc, 0, "head\n")
+    recovered.queue_batch(doc.snapshot(), {"path": "", "encoding": "utf-8"})
+    recovered.flush()
+    assert _journal(tmp_path).recover()[0] == doc.text()
+
+
+def test_journal_ignores_torn_tail_and_stale_batches(tmp_path: Path) -> None:
+    doc = PieceTable()
+    journal = _journal(tmp_path)
+    _edit(journal, doc, 0, "kept")
+    journal.queue_batch(doc.snapshot(), {})
+    journal.flush()
+    with (tmp_path / "recovery.journal").open("a", encoding="ascii") as handle:
+        handle.write('[4, 0, "tor')
+    recovered = _journal(tmp_path)
+    assert recovered.recover()[0] == "kept"
+    _edit(recovered, doc, 4, "!")
+    recovered.queue_batch(doc.snapshot(), {})
+    recovered.flush()
+    assert _journal(tmp_path).recover()[0] == "kept!"
+
+    _edit(journal, doc, 0, "stale")
+    journal.queue_batch(doc.snapshot(), {})
+    journal.clear()
+    journal.flush()
+    assert not journal.exists()
+
+
+def test_journal_clear_defers_removal_and_stats_the_base(tmp_path: Path) -> None:
+    base = tmp_path / "doc.txt"
+    base.write_text("one\n", encoding="utf-8")
+    doc = PieceTable("one\n")
+    journal = _journal(tmp_path)
+    journal.clear(base)
+    _edit(journal, doc, 0, "zero ")
+    journal.queue_batch(doc.snapshot(), {})
+    journal.flush()
+
+    journal.clear(base)
+    assert journal.exists()
+    journal.purge()
+    assert not journal.exists()
+
+    # The base is the file as it was at clear(), not at the first flush.
+    base.write_text("one, longer\n", encoding="utf-8")
+    _edit(journal, doc, 0, "!")
+    journal.queue_batch(doc.snapshot(), {})
+    journal.flush()
+    with pytest.raises(TextIOError):
+        _journal(tmp_path).recover()
+
+
+def test_journal_rebase_keeps_edits_made_during_a_save(tmp_path: Path) -> None:
+    base = tmp_path / "doc.txt"
+    base.write_text("abc\n", encoding="utf-8")
+    doc = PieceTable("abc\n")
+    journal = _journal(tmp_path)
+    journal.clear(base)
+    _edit(journal, doc, 3, "d")
+    journal.queue_batch(doc.snapshot(), {"path": str(base)})
+    journal.flush()
+
+    # A save writes this snapshot while the user keeps typing.
+    saved = doc.snapshot()
+    _edit(journal, doc, 0, ">")
+    base.write_text(saved.text(), encoding="utf-8")
+    journal.rebase()
+    assert journal.has_pending
+    _edit(journal, doc, len(doc), "!")
+    journal.queue_batch(doc.snapshot(), {"path": str(base)})
+    journal.flush()
+
+    text, _ = _journal(tmp_path).recover()
+    assert text == doc.text() == ">abcd\n!"
+
+
+def test_journal_decodes_base_with_the_document_encoding(tmp_path: Path) -> None:
+    text = "日本語\n"
+    base = tmp_path / "doc.txt"
+    base.write_bytes(text.encode("utf-16-le"))
+    doc = PieceTable(text)
+    journal = _journal(tmp_path)
+    journal.clear(base)
+    _edit(journal, doc, 3, "!")
+    journal.queue_batch(doc.snapshot(), {"path": str(base), "encoding": "utf-16-le"})
+    journal.flush()
+    assert _journal(tmp_path).recover()[0] == doc.text()
+
+
+def test_journal_checkpoint_keeps_leading_bom_character(tmp_path: Path) -> None:
+    doc = PieceTable()
+    journal = _journal(tmp_path)
+    journal.rebase()
+    _edit(journal, doc, 0, "\ufeffbom")
+    journal.queue_batch(doc.snapshot(), {"path": "", "encoding": "utf-8-sig"})
+    journal.flush()
+    assert (tmp_path / "recovery.txt").exists()
+    assert _journal(tmp_path).recover()[0] == "\ufeffbom"
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+import pytest
+
+from tkeditor.io import TextIOError
+from tkeditor.large_file import INDEX_STRIDE, MappedTextFile
+
+
+def test_mapped_file_lines(tmp_path: Path) -> None:
+    path = tmp_path / "big.log"
+    lines = [f"line {i} ✓" for i in range(INDEX_STRIDE * 3 + 5)]
+    path.write_bytes("\r\n".join(lines).encode("utf-8"))
+    mapped = MappedTextFile(path)
+    try:
+        mapped.build_index()
+        assert mapped.index_complete
+        assert mapped.line_count == len(lines)
+        assert mapped.lines(0, 2) == lines[:2]
+        assert mapped.lines(INDEX_STRIDE * 2 + 3, 4) == lines[131:135]
+        assert mapped.lines(len(lines) - 1, 10) == lines[-1:]
+    finally:
+        mapped.close()
+
+
+def test_mapped_file_utf16(tmp_path: Path) -> None:
+    path = tmp_path / "wide.txt"
+    path.write_bytes("a\nbc\n਍".encode("utf-16"))
+    mapped = MappedTextFile(path)
+    try:
+        mapped.build_index()
+        assert mapped.lines(0, 5) == ["a", "bc", "਍"]
+    finally:
+        mapped.close()
+
+
+def test_mapped_file_rejects_binary(tmp_path: Path) -> None:
+    path = tmp_path / "bin.dat"
+    path.write_bytes(b"\x00\x01\x02")
+    with pytest.raises(TextIOError):
+        MappedTextFile(path)
@@ -0,0 +1,70 @@
+import json
+import logging
+from pathlib import Path
+
+import pytest
+
+from tkeditor.logging import RateLimitFilter, get_logger, shutdown_logging
+
+
+def _record(level: int = logging.DEBUG, lineno: int = 1) -> logging.LogRecord:
+    return logging.LogRecord("tkeditor.test", level, "x.py", lineno, "tick", None, None)
+
+
+def test_rate_limit_filter_drops_bursts_and_reports_count() -> None:
+    limiter = RateLimitFilter(burst=3, interval=60.0)
+    passed = [limiter.filter(_record()) for _ in range(10)]
+    assert passed == [True] * 3 + [False] * 7
+    assert limiter.filter(_record(logging.WARNING))
+    assert limiter.filter(_record(lineno=2))
+
+    limiter.interval = 0.0
+    record = _record()
+    assert limiter.filter(record)
+    assert "7 similar messages suppressed" in record.getMessage()
+
+
+def test_queued_json_log_lines(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("TKEDITOR_CONFIG_DIR", str(tmp_path))
+    logger = get_logger("tkeditor.test-json", debug=True, json_lines=True)
+    try:
+        logger.info("saved %s", "ünïcode.txt")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed")
+    finally:
+        shutdown_logging()
+    assert not logger.handlers
+
+    lines = (tmp_path / "tkeditor.log").read_text(encoding="utf-8").splitlines()
+    entries = [json.loads(line) for line in lines]
+    assert [entry["message"] for entry in entries] == ["saved ünïcode.txt", "failed"]
+    assert entries[0]["level"] == "INFO"
+    assert "ValueError: boom" in entries[1]["exception"]
+
+
+def test_suppression_note_stays_in_the_log_file(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("TKEDITOR_CONFIG_DIR", str(tmp_path))
+    logger = get_logger("tkeditor.test-copy", debug=True)
+    limiter = logger.handlers[0].filters[0]
+    assert isinstance(limiter, RateLimitFilter)
+    limiter.burst = 1
+    seen: list[str] = []
+    other = logging.Handler()
+    other.emit = lambda record: seen.append(record.getMessage())  # type: ignore
+    logger.addHandler(other)
+    try:
+        for interval in (60.0, 60.0, 60.0, 0.0):
+            limiter.interval = interval
+            logger.debug("tick")
+    finally:
+        logger.removeHandler(other)
+        shutdown_logging()
+
+    assert seen == ["tick"] * 4
+    lines = (tmp_path / "tkeditor.log").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    assert lines[-1].endswith("tick (2 similar messages suppressed)")
@@ -0,0 +1,53 @@
+import time
+import tkinter as tk
+
+import pytest
+
+from tkeditor import perf
+from tkeditor.perf import Histogram, PerfRecorder
+from tkeditor.ui.perf_window import STALL_SPAN, StallMonitor
+
+
+def test_histogram_buckets_and_percentiles() -> None:
+    hist = Histogram()
+    for ms in (0.5, 0.5, 3, 3, 3, 40, 40, 40, 40, 7000):
+        hist.add(ms / 1000)
+    assert hist.count == 10
+    assert hist.max == pytest.approx(7.0)
+    assert hist.percentile(0.2) == pytest.approx(0.001)
+    assert hist.percentile(0.5) == pytest.approx(0.005)
+    assert hist.percentile(0.9) == pytest.approx(0.05)
+    assert hist.percentile(1.0) == pytest.approx(7.0)
+
+
+def test_timed_records_on_shared_recorder_even_on_error(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    recorder = PerfRecorder()
+    monkeypatch.setattr(perf, "recorder", recorder)
+
+    @perf.timed("test.fail")
+    def fail() -> None:
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        fail()
+    with perf.span("test.block"):
+        pass
+    snapshot = recorder.snapshot()
+    assert snapshot["test.fail"].count == 1
+    assert snapshot["test.block"].count == 1
+
+
+def test_stall_monitor_records_late_ticks() -> None:
+    interp = tk.Tcl()
+    recorder = PerfRecorder()
+    monitor = StallMonitor(interp, recorder, interval_ms=1, threshold=0.01)
+    monitor.start()
+    monitor._expected -= 0.2  # as if the loop had been blocked for 200 ms
+    time.sleep(0.005)
+    interp.update()
+    monitor.stop()
+    stalls = recorder.snapshot()[STALL_SPAN]
+    assert stalls.count == 1
+    assert stalls.max >= 0.2
@@ -0,0 +1,40 @@
+import threading
+import time
+
+from tkeditor.scheduler import IOScheduler
+
+
+def test_same_key_runs_in_order_and_never_concurrently() -> None:
+    scheduler = IOScheduler(workers=3)
+    order: list[int] = []
+    active = []
+
+    def task(value: int) -> None:
+        active.append(value)
+        assert len(active) == 1
+        time.sleep(0.001)
+        order.append(value)
+        active.remove(value)
+
+    for value in range(20):
+        scheduler.submit("file.txt", task, value)
+    assert scheduler.drain(5)
+    assert order == list(range(20))
+
+
+def test_coalesce_and_cancel_skip_queued_work() -> None:
+    scheduler = IOScheduler(workers=1)
+    gate = threading.Event()
+    ran: list[str] = []
+    scheduler.submit("slow", gate.wait)
+    for name in ("a", "b", "c"):
+        scheduler.submit("autosave", ran.append, name, coalesce=True)
+    scheduler.submit("load", ran.append, "stale").cancel()
+    gate.set()
+    assert scheduler.drain(5)
+    assert ran == ["c"]
+
+    scheduler.close()
+    assert scheduler.submit("load", ran.append, "late").cancelled
+    assert scheduler.drain(5)
+    assert ran == ["c"]
@@ -0,0 +1,119 @@
+import random
+
+import pytest
+
+from tkeditor import search
+from tkeditor.document import PieceTable, TextEdit
+from tkeditor.search import (
+    MatchIndex,
+    SearchEngine,
+    compile_pattern,
+    is_line_local,
+    plan_replacements,
+)
+
+
+def _random_edit(doc: PieceTable, rng: random.Random) -> TextEdit:
+    offset = rng.randint(0, len(doc))
+    inserted = "".join(rng.choice("ab \n") for _ in range(rng.randint(0, 4)))
+    deleted = doc.delete(offset, rng.randint(0, 4))
+    doc.insert(offset, inserted)
+    return TextEdit(offset, deleted, inserted)
+
+
+@pytest.mark.parametrize(
+    ("query", "use_regex"), [("ab", False), ("a+b?", True), (r"\bab", True)]
+)
+def test_index_repair_matches_full_scan(
+    query: str, use_regex: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(search, "BLOCK_SIZE", 4)
+    rng = random.Random(7)
+    doc = PieceTable("".join(rng.choice("ab \n") for _ in range(300)))
+    pattern = compile_pattern(query, use_regex)
+    index = MatchIndex.build(pattern, is_line_local(query, use_regex), doc.text())
+    for _ in range(300):
+        assert index.apply_edit(_random_edit(doc, rng), doc)
+    expected = [match.span() for match in pattern.finditer(doc.text())]
+    assert list(index.spans()) == expected
+    assert len(index) == len(expected)
+
+
+def test_next_and_previous_wrap() -> None:
+    pattern = compile_pattern("ab", False)
+    index = MatchIndex.build(pattern, True, "ab xx ab xx ab")
+    assert index.next_after(0) == (0, 2)
+    assert index.next_after(2) == (6, 8)
+    assert index.next_after(13) == (0, 2)
+    assert index.previous_before(8) == (0, 2)
+    assert index.previous_before(2) == (12, 14)
+
+
+def test_edits_during_build_are_repaired() -> None:
+    rng = random.Random(3)
+    doc = PieceTable("".join(rng.choice("ab \n") for _ in range(300)))
+    engine = SearchEngine()
+    pattern = engine.begin_build("ab", False)
+    snapshot = doc.snapshot()
+    for _ in range(20):
+        engine.note_edit(_random_edit(doc, rng), doc)
+    built = MatchIndex.build(pattern, True, snapshot.text())
+    index = engine.finish_build(built, doc)
+    assert index is not None
+    assert list(index.spans()) == [m.span() for m in pattern.finditer(doc.text())]
+
+
+def test_multiline_regex_is_not_repaired() -> None:
+    assert not is_line_local(r"a\nb", True)
+    assert not is_line_local("^ab", True)
+    assert is_line_local("a.b", True)
+
+
+@pytest.mark.parametrize(
+    ("query", "local"),
+    [
+        (r"[\t-\r]+", False),
+        (r"[^a]", False),
+        (r"\x0a|x", False),
+        (r"(?s:a.)b", False),
+        (r"a(?=b)", False),
+        (r"(x|\s)", False),
+        (r"[^\n]+", True),
+        (r"\S+\b", True),
+        (r"(?i)(\w+) \1{2,}", True),
+    ],
+)
+def test_line_locality_is_read_from_the_parsed_pattern(query: str, local: bool) -> None:
+    assert is_line_local(query, True) is local
+
+
+def test_plan_replacements_applied_in_reverse() -> None:
+    text = "foo bar\nbar foo bar\nbaz"
+    pattern = compile_pattern(r"ba(r|z)", True)
+    count, edits = plan_replacements(pattern, text, r"B\1", True)
+    assert count == 4
+    doc = PieceTable(text)
+    for start, end, new_text in reversed(edits):
+        start_offset = doc.offset_of(*map(int, start.split(".")))
+        end_offset = doc.offset_of(*map(int, end.split(".")))
+        doc.delete(start_offset, end_offset - start_offset)
+        doc.insert(start_offset, new_text)
+    assert doc.text() == pattern.sub(r"B\1", text)
+
+
+def test_replacement_indices_use_tk_columns() -> None:
+    text = "\U0001f600 bar\nx\U0001f600\U0001f600bar bar"
+    pattern = compile_pattern("bar", False)
+    _, edits = plan_replacements(pattern, text, "q", False)
+    assert [start for start, _, _ in edits] == ["1.3", "2.5", "2.9"]
+    doc = PieceTable(text)
+    assert [doc.offset_of(*map(int, start.split("."))) for start, _, _ in edits] == [
+        m.start() for m in pattern.finditer(text)
+    ]
+
+
+def test_plan_replacements_skips_unchanged_matches() -> None:
+    pattern = compile_pattern("a", False)
+    count, edits = plan_replacements(pattern, "a b a", "a", False)
+    assert count == 2
+    assert edits == []
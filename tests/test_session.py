@@ -0,0 +1,40 @@
+import json
+from pathlib import Path
+
+from tkeditor.session import Session, SessionDocument, load_session, save_session
+
+
+def test_session_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "session.json"
+    session = Session(
+        [
+            SessionDocument("/tmp/a.py", "latin-1", "12.4", 0.25, (1, 2, 3)),
+            SessionDocument(None, unsaved_id="abc123"),
+        ],
+        active=1,
+    )
+    save_session(path, session)
+    assert load_session(path) == session
+
+
+def test_load_session_skips_malformed_entries(tmp_path: Path) -> None:
+    path = tmp_path / "session.json"
+    assert load_session(path) is None
+    path.write_text("{not json", encoding="utf-8")
+    assert load_session(path) is None
+
+    path.write_text(
+        json.dumps(
+            {
+                "documents": [
+                    "junk",
+                    {"path": ""},
+                    {"path": "/tmp/b.txt", "stat": [1, "2", 3], "top": "x"},
+                ],
+                "active": "first",
+            }
+        ),
+        encoding="utf-8",
+    )
+    session = load_session(path)
+    assert session == Session([SessionDocument("/tmp/b.txt")], active=0)
@@ -0,0 +1,44 @@
+import io
+import subprocess
+import sys
+import time
+
+import pytest
+
+from tkeditor.startup import StartupProfile
+
+
+def test_profile_reports_phases_and_total() -> None:
+    profile = StartupProfile(time.perf_counter() - 0.5)
+    profile.mark("imports")
+    profile.mark("Tk root")
+
+    assert [phase for phase, _ in profile.phases] == ["imports", "Tk root"]
+    assert profile.phases[0][1] >= 0.5
+    assert profile.total == pytest.approx(sum(s for _, s in profile.phases))
+
+    out = io.StringIO()
+    profile.report(out)
+    lines = out.getvalue().splitlines()
+    assert lines[1].split()[0] == "imports"
+    assert lines[3].split()[0] == "total"
+
+
+def test_app_import_defers_optional_modules() -> None:
+    deferred = [
+        "tkinter.filedialog",
+        "tkeditor.follow",
+        "tkeditor.large_file",
+        "tkeditor.session",
+        "tkeditor.ui.find_in_files",
+        "tkeditor.ui.perf_window",
+        "tkeditor.watcher",
+    ]
+    code = (
+        "import sys, tkeditor.app; "
+        f"print(*(m for m in {deferred!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.split() == []
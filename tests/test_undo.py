@@ -0,0 +1,85 @@
+import pytest
+
+from tkeditor import undo as undo_module
+from tkeditor.document import PieceTable, TextEdit
+from tkeditor.undo import UndoManager
+
+
+def _apply(doc: PieceTable, edits: list[TextEdit]) -> None:
+    for edit in edits:
+        assert doc.delete(edit.offset, len(edit.deleted)) == edit.deleted
+        doc.insert(edit.offset, edit.inserted)
+
+
+def _type(doc: PieceTable, history: UndoManager, offset: int, text: str) -> None:
+    for i, char in enumerate(text):
+        doc.insert(offset + i, char)
+        history.record(TextEdit(offset + i, "", char))
+
+
+def test_typing_groups_and_undo_redo_roundtrip() -> None:
+    doc = PieceTable("hello")
+    history = UndoManager()
+    _type(doc, history, 5, " world")
+    history.record(TextEdit(0, doc.delete(0, 1), ""))
+    doc.insert(0, "J")
+    history.record(TextEdit(0, "", "J"))
+    assert doc.text() == "Jello world"
+
+    _apply(doc, history.undo())
+    assert doc.text() == "ello world"
+    _apply(doc, history.undo())
+    assert doc.text() == "hello world"
+    _apply(doc, history.undo())
+    assert doc.text() == "hello"
+    assert not history.can_undo
+    for expected in ("hello world", "ello world", "Jello world"):
+        _apply(doc, history.redo())
+        assert doc.text() == expected
+    assert not history.can_redo
+
+
+def test_budget_spills_to_disk_then_evicts_oldest() -> None:
+    doc = PieceTable()
+    history = UndoManager(memory_limit=2000, spill_limit=3000)
+    for i in range(100):
+        history.separator()
+        _type(doc, history, len(doc), f"<{i}>")
+    assert history.memory_usage <= 2000
+    assert 0 < history.disk_usage <= 3000
+
+    undone = 0
+    while history.can_undo:
+        _apply(doc, history.undo())
+        undone += 1
+    # The newest groups come back from memory and disk; the oldest were dropped.
+    assert 30 < undone < 100
+    assert doc.text() == "".join(f"<{i}>" for i in range(100 - undone))
+    assert history.disk_usage == 0
+
+
+def test_spill_file_is_compacted_at_twice_its_live_size(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(undo_module, "SPILL_COMPACT_MIN_BYTES", 0)
+    doc = PieceTable()
+    history = UndoManager(memory_limit=500, spill_limit=1000)
+    for i in range(500):
+        history.separator()
+        _type(doc, history, len(doc), f"<{i}>")
+        assert history._spill_end <= 2 * history.disk_usage
+
+
+def test_group_and_applying_suppress_splitting_and_recording() -> None:
+    doc = PieceTable("a-b-c")
+    history = UndoManager()
+    history.begin_group()
+    for offset in (3, 1):
+        history.record(TextEdit(offset, doc.delete(offset, 1), "+"))
+        doc.insert(offset, "+")
+    history.end_group()
+    with history.applying():
+        history.record(TextEdit(0, "", "ignored"))
+    _apply(doc, history.undo())
+    assert doc.text() == "a-b-c"
+    assert not history.can_undo
@@ -0,0 +1,74 @@
+import os
+import queue
+import sys
+from pathlib import Path
+
+import pytest
+
+from tkeditor.watcher import FileWatcher, file_stat
+
+
+def test_file_stat_tracks_content_size_and_inode(tmp_path: Path) -> None:
+    path = tmp_path / "a.txt"
+    assert file_stat(path) is None
+    path.write_text("one", encoding="utf-8")
+    first = file_stat(path)
+    assert first is not None and first[1] == 3
+
+    replacement = tmp_path / "b.txt"
+    replacement.write_text("two", encoding="utf-8")
+    os.utime(replacement, ns=(first[0], first[0]))
+    os.replace(replacement, path)
+    second = file_stat(path)
+    # Same size and mtime, but a new file.
+    assert second is not None and second[:2] == first[:2]
+    assert second != first
+
+
+@pytest.mark.parametrize(
+    "use_inotify",
+    [
+        False,
+        pytest.param(
+            True,
+            marks=pytest.mark.skipif(
+                not sys.platform.startswith("linux"), reason="inotify is Linux only"
+            ),
+        ),
+    ],
+)
+def test_watcher_reports_rewrites_replacements_and_deletions(
+    tmp_path: Path, use_inotify: bool
+) -> None:
+    changes: queue.Queue[Path] = queue.Queue()
+    watcher = FileWatcher(changes.put, interval=0.05, use_inotify=use_inotify)
+    watched = tmp_path / "watched.log"
+    other = tmp_path / "other.log"
+    watched.write_text("start\n", encoding="utf-8")
+    other.write_text("start\n", encoding="utf-8")
+    watcher.watch(watched, file_stat(watched))
+    watcher.start()
+    try:
+        # Unchanged and unwatched files are not reported.
+        other.write_text("changed\n", encoding="utf-8")
+        with pytest.raises(queue.Empty):
+            changes.get(timeout=0.3)
+
+        with watched.open("a", encoding="utf-8") as handle:
+            handle.write("appended\n")
+        assert changes.get(timeout=5) == watched
+
+        rotated = tmp_path / "new.log"
+        rotated.write_text("rotated\n", encoding="utf-8")
+        os.replace(rotated, watched)
+        assert changes.get(timeout=5) == watched
+
+        watched.unlink()
+        assert changes.get(timeout=5) == watched
+
+        watcher.unwatch(watched)
+        watched.write_text("back\n", encoding="utf-8")
+        with pytest.raises(queue.Empty):
+            changes.get(timeout=0.3)
+    finally:
+        watcher.stop()
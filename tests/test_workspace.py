@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pytest
+
+from tkeditor import config
+from tkeditor.workspace import CompressedText, memory_estimate, select_evictions
+
+
+def test_compressed_text_round_trips_in_small_chunks() -> None:
+    text = "".join(f"line {i}: ünïcode \U0001f600 \ud800\n" for i in range(5000))
+    compressed = CompressedText.from_chunks([text[:7], text[7:]])
+    assert compressed.length == len(text)
+    assert compressed.nbytes < memory_estimate(len(text)) // 10
+    chunks = list(compressed.iter_chunks(chunk_size=64))
+    assert len(chunks) > 1
+    assert "".join(chunks) == text == compressed.text()
+    assert CompressedText.from_chunks([]).text() == ""
+
+
+def test_select_evictions_takes_least_recently_used_until_under_budget() -> None:
+    candidates = [("a", 30), ("b", 50), ("c", 40)]
+    assert select_evictions(candidates, 200, 250) == []
+    assert select_evictions(candidates, 200, 170) == ["a"]
+    assert select_evictions(candidates, 200, 120) == ["a", "b"]
+    assert select_evictions(candidates, 200, 0) == ["a", "b", "c"]
+
+
+def test_recovery_ids_are_per_document_and_migrate_legacy_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(config.CONFIG_ENV, str(tmp_path))
+    assert config.list_recovery_ids() == []
+
+    (tmp_path / config.RECOVERY_TEXT).write_text("old", encoding="utf-8")
+    (tmp_path / config.RECOVERY_META).write_text("{}", encoding="utf-8")
+    [legacy_id] = config.list_recovery_ids()
+    text_path, meta_path, journal_path = config.get_recovery_paths(legacy_id)
+    assert text_path.read_text(encoding="utf-8") == "old"
+    assert meta_path.exists() and not journal_path.exists()
+    assert not (tmp_path / config.RECOVERY_TEXT).exists()
+
+    new_id = config.new_recovery_id()
+    config.get_recovery_paths(new_id)[1].write_text("{}", encoding="utf-8")
+    assert set(config.list_recovery_ids()) == {legacy_id, new_id}
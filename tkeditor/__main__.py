@@ -1,6 +1,11 @@
 """Module entry point for `python -m tkeditor`."""
 
-from .app import main
+import time
+
+# Taken before the editor is imported so --startup-profile can time imports.
+_STARTED = time.perf_counter()
+
+from .app import main  # noqa: E402
 
 if __name__ == "__main__":
-    main()
+    main(started=_STARTED)
@@ -1,38 +1,146 @@
 from __future__ import annotations
 
+import argparse
 import contextlib
+import itertools
 import json
+import logging
 import os
+import queue
 import re
 import sys
 import threading
+import time
 import tkinter as tk
+from collections.abc import Callable, Iterator
 from functools import partial
 from pathlib import Path
-from tkinter import filedialog, font, messagebox, simpledialog
-
-from .config import EditorConfig, get_recovery_paths, load_config, save_config
-from .io import TextIOError, read_text_file, write_text_file
-from .logging import get_logger
-from .ui.encoding_dialog import EncodingDialog
-from .ui.find_replace import FindReplaceDialog
+from tkinter import font, ttk
+from typing import TYPE_CHECKING
+
+from . import perf
+from .config import (
+    ConfigStore,
+    EditorConfig,
+    get_recovery_paths,
+    get_session_path,
+    list_recovery_ids,
+    load_config,
+)
+from .document import DocumentSnapshot, Fingerprint, PieceTable, TextEdit
+from .highlight import lexer_for
+from .io import TextIOError, TextStreamReader, write_text_file
+from .journal import RecoveryJournal
+from .scheduler import IOScheduler
+from .search import (
+    MatchIndex,
+    Replacement,
+    SearchEngine,
+    compile_pattern,
+    is_line_local,
+    plan_replacements,
+)
+from .startup import StartupProfile
+from .ui.document_tab import DocumentTab
+from .ui.idle import IdleCoalescer
+from .ui.text_proxy import Position
 from .ui.window_utils import center_window
+from .undo import UndoManager
+from .workspace import CompressedText, memory_estimate, select_evictions
+
+if TYPE_CHECKING:
+    from .follow import LogTail
+    from .session import SessionDocument
+    from .ui.find_in_files import FindInFilesPanel
+    from .ui.find_replace import FindReplaceDialog
+    from .ui.perf_window import PerformanceWindow, StallMonitor
+    from .ui.syntax import SyntaxHighlighter
+    from .watcher import FileWatcher
 
 RECENT_LIMIT = 10
+HIGHLIGHT_LIMIT = 5000
+HIGHLIGHT_MARGIN_LINES = 500
+HIGHLIGHT_SLICE_SECONDS = 0.01
+HIGHLIGHT_EDIT_DELAY_MS = 150
+REPLACE_BATCH_SECONDS = 0.02
+# Longest document hashed on the Tk thread to tell a revert from a change.
+FINGERPRINT_SYNC_LIMIT = 1024 * 1024
+LOAD_QUEUE_SIZE = 8
+LOAD_POLL_MS = 15
+LOAD_BATCH_SECONDS = 0.03
+FOLLOW_POLL_MS = 250
+IO_DRAIN_SECONDS = 10.0
+IO_DRAIN_POLL_SECONDS = 0.05
+
+SYNTAX_THEMES = {
+    "light": {
+        "keyword": "#0033b3",
+        "string": "#067d17",
+        "comment": "#8c8c8c",
+        "number": "#1750eb",
+        "constant": "#871094",
+        "key": "#871094",
+        "decorator": "#9e880d",
+        "warning": "#b26a00",
+        "error": "#d32f2f",
+    },
+    "dark": {
+        "keyword": "#cc7832",
+        "string": "#6a8759",
+        "comment": "#808080",
+        "number": "#6897bb",
+        "constant": "#9876aa",
+        "key": "#9876aa",
+        "decorator": "#bbb529",
+        "warning": "#e0b050",
+        "error": "#ff6b68",
+    },
+}
+
+LoadItem = tuple[str, str, int]
+
+
+def _theme_colors(theme: str) -> tuple[str, str, str]:
+    """Editor background, foreground and status bar background."""
+    if theme == "dark":
+        return "#1e1e1e", "#f5f5f5", "#2b2b2b"
+    return "#ffffff", "#111111", "#f0f0f0"
 
 
 class TextEditorApp:
     """Main application class for TkEditor."""
 
-    def __init__(self, root: tk.Tk, config: EditorConfig | None = None) -> None:
+    def __init__(
+        self,
+        root: tk.Tk,
+        config: EditorConfig | None = None,
+        profile: StartupProfile | None = None,
+    ) -> None:
         self.root = root
         self.config = config or load_config()
-        self.logger = get_logger(debug=bool(os.environ.get("TKEDITOR_DEBUG")))
-
-        self._current_file: Path | None = None
-        self._current_encoding = "utf-8"
-        self._dirty = False
+        self.config_store = ConfigStore(self.config)
+        # Handlers are attached in _finish_startup; until then records only
+        # reach logging's last-resort stderr handler.
+        self.logger = logging.getLogger("tkeditor")
+        self._profile = profile
+
+        self.io = IOScheduler()
+        # Created on first use and started once the window is up.
+        self._watcher: FileWatcher | None = None
+        # Open documents in tab order; self.tab is the one on screen.
+        self.tabs: list[DocumentTab] = []
+        self._evicting: set[DocumentTab] = set()
+        self._editor_font: font.Font | None = None
+        self._search_generation = 0
+        self._search_waiters: list[Callable[[MatchIndex], None]] = []
+        self._highlight_query: tuple[str, bool] | None = None
+        self._highlight_job: str | None = None
+        self._highlight_refresh_job: str | None = None
+        self._highlight_lines = (0, 0)
         self._find_dialog: FindReplaceDialog | None = None
+        self._perf_window: PerformanceWindow | None = None
+        self._find_in_files: FindInFilesPanel | None = None
+        self.stall_monitor: StallMonitor | None = None
 
         self._autosave_enabled = self.config.autosave_enabled
         self._autosave_interval = self.config.autosave_interval
@@ -45,12 +153,37 @@ class TextEditorApp:
         self._apply_theme(self.config.theme)
         self._apply_font(self.config.font_family, self.config.font_size)
         self._bind_shortcuts()
-        self._update_recent_menu()
-        self._check_recovery()
-        self._schedule_autosave()
+        self._update_title()
         center_window(self.root)
 
         self.root.protocol("WM_DELETE_WINDOW", self.on_exit)
+        # Everything that can wait runs once the window has been painted: the
+        # first idle pass draws it, the timer then fires on the next loop turn.
+        self.root.after_idle(self._on_first_idle)
+
+    def _on_first_idle(self) -> None:
+        if self._profile is not None:
+            self._profile.mark("first paint")
+        self.root.after(0, self._finish_startup)
+
+    def _finish_startup(self) -> None:
+        from .logging import get_logger
+        from .ui.perf_window import StallMonitor
+
+        self.logger = get_logger(
+            debug=bool(os.environ.get("TKEDITOR_DEBUG")),
+            json_lines=self.config.log_format == "json",
+        )
+        self._update_recent_menu()
+        self._restore_session()
+        self._check_recovery()
+        self._schedule_autosave()
+        self.watcher.start()
+        self.stall_monitor = StallMonitor(self.root, perf.recorder)
+        self.stall_monitor.start()
+        if self._profile is not None:
+            self._profile.mark("deferred startup")
+            self._profile.report()
 
     def _build_ui(self) -> None:
         self.root.title("TkEditor")
@@ -72,6 +205,15 @@ class TextEditorApp:
             command=self.save_file_as,
             accelerator=f"{self._accel}+Shift+S",
         )
+        self.file_menu.add_command(
+            label="Close Tab", command=self.close_tab, accelerator=f"{self._accel}+W"
+        )
+        self.file_menu.add_command(
+            label="Cancel Open",
+            command=self.cancel_load,
+            accelerator="Esc",
+            state="disabled",
+        )
         self.file_menu.add_separator()
         self.recent_menu = tk.Menu(self.file_menu, tearoff=0)
         self.file_menu.add_cascade(label="Open Recent", menu=self.recent_menu)
@@ -111,6 +253,12 @@ class TextEditorApp:
             command=self.open_find_replace,
             accelerator=f"{self._accel}+H",
         )
+        self.search_menu.add_separator()
+        self.search_menu.add_command(
+            label="Find in Files",
+            command=self.open_find_in_files,
+            accelerator=f"{self._accel}+Shift+F",
+        )
         self.menu_bar.add_cascade(label="Search", menu=self.search_menu)
 
         self.view_menu = tk.Menu(self.menu_bar, tearoff=0)
@@ -124,6 +272,11 @@ class TextEditorApp:
         self.view_menu.add_cascade(label="Theme", menu=self.theme_menu)
         self.view_menu.add_command(label="Font Family", command=self.set_font_family)
         self.view_menu.add_command(label="Font Size", command=self.set_font_size)
+        self.view_menu.add_separator()
+        self.follow_var = tk.BooleanVar(value=False)
+        self.view_menu.add_checkbutton(
+            label="Follow File", variable=self.follow_var, command=self.toggle_follow
+        )
         self.menu_bar.add_cascade(label="View", menu=self.view_menu)
 
         self.tools_menu = tk.Menu(self.menu_bar, tearoff=0)
@@ -137,6 +290,10 @@ class TextEditorApp:
             label="Set Autosave Interval",
             command=self.set_autosave_interval,
         )
+        self.tools_menu.add_separator()
+        self.tools_menu.add_command(
+            label="Performance", command=self.open_performance_window
+        )
         self.menu_bar.add_cascade(label="Tools", menu=self.tools_menu)
 
         self.help_menu = tk.Menu(self.menu_bar, tearoff=0)
@@ -145,14 +302,13 @@ class TextEditorApp:
 
         self.root.config(menu=self.menu_bar)
 
-        self.text = tk.Text(
-            self.root, wrap="word", undo=True, autoseparators=True, maxundo=-1
-        )
-        self.text.pack(expand=True, fill="both")
-        self.text.bind("<<Modified>>", self._on_modified)
-        self.text.bind("<KeyRelease>", self._update_cursor_position)
-        self.text.bind("<ButtonRelease-1>", self._update_cursor_position)
-        self.text.tag_configure("find_match", background="#ffe082")
+        self.notebook = ttk.Notebook(self.root)
+        self.notebook.pack(expand=True, fill="both")
+        # Ctrl+Tab / Ctrl+Shift+Tab cycle through the tabs.
+        self.notebook.enable_traversal()
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self.ui_updates = IdleCoalescer(self.root)
+        self.tab = self._add_tab()
 
         status_frame = tk.Frame(self.root)
         status_frame.pack(side="bottom", fill="x")
@@ -160,6 +316,9 @@ class TextEditorApp:
         self.status_label.pack(side="left", fill="x", expand=True)
         self.pos_label = tk.Label(status_frame, text="Ln 1, Col 1", anchor="e")
         self.pos_label.pack(side="right")
+        self.progress = ttk.Progressbar(
+            status_frame, mode="determinate", maximum=100, length=160
+        )
 
     def _bind_shortcuts(self) -> None:
         mod = self._modifier
@@ -167,8 +326,10 @@ class TextEditorApp:
         self.root.bind_all(f"<{mod}-o>", lambda _e: self.open_file())
         self.root.bind_all(f"<{mod}-s>", lambda _e: self.save_file())
         self.root.bind_all(f"<{mod}-Shift-s>", lambda _e: self.save_file_as())
+        self.root.bind_all(f"<{mod}-w>", lambda _e: self.close_tab())
         self.root.bind_all(f"<{mod}-f>", lambda _e: self.open_find_replace())
         self.root.bind_all(f"<{mod}-h>", lambda _e: self.open_find_replace())
+        self.root.bind_all(f"<{mod}-Shift-F>", lambda _e: self.open_find_in_files())
         self.root.bind_all(f"<{mod}-a>", lambda _e: self.select_all())
         self.root.bind_all(f"<{mod}-z>", lambda _e: self.undo())
         self.root.bind_all(f"<{mod}-y>", lambda _e: self.redo())
@@ -177,201 +338,1154 @@ class TextEditorApp:
         self.root.bind_all(f"<{mod}-x>", lambda _e: self.cut())
         self.root.bind_all(f"<{mod}-c>", lambda _e: self.copy())
         self.root.bind_all(f"<{mod}-v>", lambda _e: self.paste())
+        self.root.bind("<Escape>", lambda _e: self.cancel_load())
 
     def _apply_theme(self, theme: str) -> None:
-        if theme == "dark":
-            bg = "#1e1e1e"
-            fg = "#f5f5f5"
-            status_bg = "#2b2b2b"
-        else:
-            bg = "#ffffff"
-            fg = "#111111"
-            status_bg = "#f0f0f0"
-
-        self.text.config(bg=bg, fg=fg, insertbackground=fg)
+        _, fg, status_bg = _theme_colors(theme)
+        for tab in self.tabs:
+            self._style_tab(tab, theme)
         self.status_label.config(bg=status_bg, fg=fg)
         self.pos_label.config(bg=status_bg, fg=fg)
 
     def _apply_font(self, family: str, size: int) -> None:
         editor_font = font.Font(family=family, size=size)
-        self.text.config(font=editor_font)
+        self._editor_font = editor_font
+        for tab in self.tabs:
+            tab.text.config(font=editor_font)
         self.status_label.config(font=editor_font)
         self.pos_label.config(font=editor_font)
 
-    def _on_modified(self, _event: tk.Event | None = None) -> None:
-        if self.text.edit_modified():
-            self._set_dirty(True)
-            self.text.edit_modified(False)
+    def _style_tab(self, tab: DocumentTab, theme: str) -> None:
+        bg, fg, _ = _theme_colors(theme)
+        tab.text.config(bg=bg, fg=fg, insertbackground=fg)
+        tab.syntax.set_colors(SYNTAX_THEMES.get(theme, SYNTAX_THEMES["light"]))
+        if self._editor_font is not None:
+            tab.text.config(font=self._editor_font)
 
-    def _set_dirty(self, dirty: bool) -> None:
-        if self._dirty != dirty:
-            self._dirty = dirty
-            self._update_title()
+    # The widgets and models of the tab on screen.
+
+    @property
+    def text(self) -> tk.Text:
+        return self.tab.text
+
+    @property
+    def document(self) -> PieceTable:
+        return self.tab.document
+
+    @property
+    def search(self) -> SearchEngine:
+        return self.tab.search
+
+    @property
+    def history(self) -> UndoManager:
+        return self.tab.history
+
+    @property
+    def journal(self) -> RecoveryJournal:
+        return self.tab.journal
+
+    @property
+    def syntax(self) -> SyntaxHighlighter:
+        return self.tab.syntax
+
+    @property
+    def watcher(self) -> FileWatcher:
+        if self._watcher is None:
+            from .watcher import FileWatcher
+
+            self._watcher = FileWatcher(
+                self._on_file_changed, self.config.file_watch_interval
+            )
+        return self._watcher
+
+    def _on_text_change(
+        self, tab: DocumentTab, start: Position, end: Position, inserted: str
+    ) -> None:
+        """Mirror a widget edit into the tab's document model."""
+        document = tab.document
+        offset = document.offset_of(*start)
+        deleted = ""
+        if end != start:
+            deleted = document.delete(offset, document.offset_of(*end) - offset)
+        document.insert(offset, inserted)
+        edit = TextEdit(offset, deleted, inserted)
+        tab.search.note_edit(edit, document)
+        tab.syntax.note_edit(start, end, inserted)
+        # Loading, restoring an evicted tab, paging a large file and following
+        # one are not user edits.
+        if not (
+            tab.loading
+            or tab.large_view is not None
+            or tab.evicted is not None
+            or tab.follow is not None
+        ):
+            tab.edit_count += 1
+            tab.journal.record(edit)
+            tab.history.record(edit)
+            self._set_dirty(tab, True)
+            self.ui_updates.request(self._update_cursor_position)
+        if (
+            tab is self.tab
+            and self._highlight_query is not None
+            and not (tab.loading or tab.replacing)
+        ):
+            self._schedule_highlight_refresh(HIGHLIGHT_EDIT_DELAY_MS)
+
+    def _offset_at(self, index: str) -> int:
+        line, col = (int(part) for part in self.text.index(index).split("."))
+        return self.document.offset_of(line, col)
+
+    def _index_at(self, offset: int) -> str:
+        line, col = self.document.line_col(offset)
+        return f"{line}.{col}"
+
+    def _content_unchanged(self, tab: DocumentTab) -> bool:
+        """Return True if the document matches the last saved or loaded text.
+
+        Longer documents are not hashed here and count as changed; autosave
+        still notices reverts to them on a worker thread.
+        """
+        saved = tab.saved_fingerprint
+        if (
+            saved is None
+            or tab.evicted is not None
+            or len(tab.document) != saved.length
+            or saved.length > FINGERPRINT_SYNC_LIMIT
+        ):
+            return False
+        return tab.document.snapshot().fingerprint() == saved
+
+    def _file_unchanged(self, tab: DocumentTab, path: Path) -> bool:
+        from .watcher import file_stat
+
+        stat = file_stat(path)
+        return stat is not None and stat == tab.saved_stat
+
+    def _set_saved_state(
+        self, tab: DocumentTab, path: Path | None, fingerprint: Fingerprint | None
+    ) -> None:
+        from .watcher import file_stat
+
+        tab.saved_fingerprint = fingerprint
+        tab.saved_stat = None
+        if path is not None:
+            tab.saved_stat = file_stat(path)
+            self.watcher.watch(path, tab.saved_stat)
+
+    def _set_dirty(self, tab: DocumentTab, dirty: bool) -> None:
+        if tab.dirty != dirty:
+            tab.dirty = dirty
+            self.ui_updates.request(self._update_title)
 
     def _update_title(self) -> None:
-        name = self._current_file.name if self._current_file else "Untitled"
-        marker = "*" if self._dirty else ""
+        name = self.tab.path.name if self.tab.path else "Untitled"
+        marker = "*" if self.tab.dirty else ""
         self.root.title(f"{name}{marker} - TkEditor")
+        for tab in self.tabs:
+            self.notebook.tab(tab.frame, text=tab.title)
 
     def _set_status(self, message: str) -> None:
         self.status_label.config(text=message)
 
+    def _schedule_cursor_update(self, _event: tk.Event | None = None) -> None:
+        self.ui_updates.request(self._update_cursor_position)
+
     def _update_cursor_position(self, _event: tk.Event | None = None) -> None:
         index = self.text.index(tk.INSERT)
-        line, col = index.split(".")
-        self.pos_label.config(text=f"Ln {line}, Col {int(col) + 1}")
-
-    def _confirm_discard(self) -> bool:
-        if not self._dirty:
+        line, col = (int(part) for part in index.split("."))
+        large_view = self.tab.large_view
+        if large_view is not None:
+            line = large_view.absolute_line(line)
+            total = large_view.source.line_count
+            selected = 0
+        else:
+            total = self.document.line_count
+            selected = self._selection_length()
+        parts = [f"Ln {line}, Col {col + 1}", f"{total:,} lines"]
+        if selected:
+            parts.append(f"{selected:,} selected")
+        self.pos_label.config(text=" | ".join(parts))
+
+    def _selection_length(self) -> int:
+        # Measured on the document model: counting in the widget is linear
+        # in the selection size.
+        ranges = self.text.tag_ranges(tk.SEL)
+        if not ranges:
+            return 0
+        return self._offset_at(str(ranges[-1])) - self._offset_at(str(ranges[0]))
+
+    def _confirm_discard(self, tab: DocumentTab) -> bool:
+        from tkinter import messagebox
+
+        if tab.replacing:
+            self._set_status("Please wait until Replace All has finished")
+            return False
+        if tab.dirty and self._content_unchanged(tab):
+            self._set_dirty(tab, False)
+        if not tab.dirty:
             return True
+        self._select_tab(tab)
+        name = tab.path.name if tab.path else "Untitled"
         choice = messagebox.askyesnocancel(
             "Unsaved Changes",
-            "You have unsaved changes. Save before continuing?",
+            f"{name} has unsaved changes. Save before continuing?",
         )
         if choice is None:
             return False
         if choice:
-            return self._save_before_close()
+            return self._save_before_close(tab)
         return True
 
-    def _save_before_close(self) -> bool:
-        if self._current_file is None:
-            return self._save_file_as_sync()
-        return self._save_file_sync(self._current_file, self._current_encoding)
+    def _save_before_close(self, tab: DocumentTab) -> bool:
+        if isinstance(tab.evicted, RecoveryJournal):
+            # Unsaved text from the last session that is still being read.
+            self._set_status("Please wait until the file has finished loading")
+            return False
+        if tab.path is None:
+            return self._save_file_as_sync(tab)
+        if not self._confirm_overwrite(tab, tab.path):
+            return False
+        return self._save_file_sync(tab, tab.path, tab.encoding)
 
-    def new_file(self) -> None:
-        if not self._confirm_discard():
+    def _add_tab(self, doc_id: str | None = None) -> DocumentTab:
+        tab = DocumentTab(
+            self.notebook, self.config, self._on_text_change, self.ui_updates, doc_id
+        )
+        for sequence in ("<KeyRelease>", "<ButtonRelease-1>", "<<Selection>>"):
+            tab.text.bind(sequence, self._schedule_cursor_update)
+        tab.text.config(yscrollcommand=self._on_text_scroll)
+        self._style_tab(tab, self.config.theme)
+        self.tabs.append(tab)
+        return tab
+
+    def _find_tab(self, path: Path) -> DocumentTab | None:
+        target = path.resolve()
+        for tab in self.tabs:
+            if tab.path is not None and tab.path.resolve() == target:
+                return tab
+        return None
+
+    def _select_tab(self, tab: DocumentTab) -> None:
+        self.notebook.select(tab.frame)
+        self._activate(tab)
+
+    def _on_tab_changed(self, _event: tk.Event | None = None) -> None:
+        selected = self.notebook.select()
+        for tab in self.tabs:
+            if str(tab.frame) == selected:
+                self._activate(tab)
+                return
+
+    def _activate(self, tab: DocumentTab) -> None:
+        if tab is self.tab:
             return
-        self.text.delete("1.0", tk.END)
-        self.text.edit_reset()
-        self._current_file = None
-        self._current_encoding = "utf-8"
-        self._set_dirty(False)
+        # Searches and highlights belong to the tab being left.
+        self._clear_highlights()
+        self._search_generation += 1
+        self._search_waiters = []
+        if self.tab.search.building:
+            self.tab.search.clear()
+        self.tab = tab
+        tab.last_used = time.monotonic()
+        self.follow_var.set(tab.follow is not None)
+        if tab.evicted is not None and not tab.loading:
+            self._restore_tab(tab)
+        self._show_progress(tab)
+        self._update_title()
+        self._update_cursor_position()
+        tab.text.focus_set()
+        if tab.pending_goto is not None and not tab.loading:
+            goto, tab.pending_goto = tab.pending_goto, None
+            self._goto(*goto)
+        if self._highlight_query is not None:
+            self._schedule_highlight_refresh()
+        self._check_disk_change(tab)
+        self._enforce_memory_budget()
+
+    def new_file(self) -> None:
+        self._select_tab(self._add_tab())
         self._set_status("New file")
 
+    def close_tab(self, tab: DocumentTab | None = None) -> None:
+        tab = tab or self.tab
+        if self._confirm_discard(tab):
+            self._discard_tab(tab)
+
+    def _discard_tab(self, tab: DocumentTab) -> None:
+        if tab.load_cancel is not None:
+            tab.load_cancel.set()
+        self._stop_follow(tab)
+        self._close_large_file(tab)
+        tab.journal.clear()
+        self._purge_journal(tab.doc_id, tab.journal)
+        self._remove_tab(tab)
+
+    def _remove_tab(self, tab: DocumentTab) -> None:
+        index = self.tabs.index(tab)
+        self.tabs.remove(tab)
+        if not self.tabs:
+            self._add_tab()
+        if tab is self.tab:
+            self._select_tab(self.tabs[min(index, len(self.tabs) - 1)])
+        if tab.path is not None:
+            self.watcher.unwatch(tab.path)
+        self.notebook.forget(tab.frame)
+        tab.close()
+        self._update_title()
+
     def open_file(self) -> None:
-        if not self._confirm_discard():
-            return
+        from tkinter import filedialog
+
         path_str = filedialog.askopenfilename(
             defaultextension=".txt",
             filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")],
         )
-        if not path_str:
+        if path_str:
+            self.open_path(Path(path_str))
+
+    def open_path(self, path: Path, goto: tuple[int, int] | None = None) -> None:
+        """Show ``path``, opening it in a new tab unless it is already open.
+
+        An empty Untitled tab on screen is reused. ``goto`` is a 1-based line
+        and 0-based column to move the cursor to once the text is loaded.
+        """
+        tab = self._find_tab(path)
+        if tab is not None:
+            self._select_tab(tab)
+            if goto is not None and tab.large_view is None:
+                if tab.loading:
+                    tab.pending_goto = goto
+                else:
+                    self._goto(*goto)
             return
-        path = Path(path_str)
-        self._set_status("Opening...")
-        threading.Thread(
-            target=self._load_file_thread,
-            args=(path,),
-            daemon=True,
-        ).start()
+        reuse = self.tab.pristine
+        tab = self.tab if reuse else self._add_tab()
+        tab.pending_goto = goto
+        self._select_tab(tab)
+        if not self._start_load(tab, path) and not reuse:
+            self._remove_tab(tab)
+
+    def _start_load(self, tab: DocumentTab, path: Path) -> bool:
+        try:
+            size = path.stat().st_size
+        except OSError as exc:
+            self._show_error("Open Error", str(exc))
+            return False
+        if size >= self.config.large_file_threshold:
+            return self._open_large_file(tab, path)
+        cancel = threading.Event()
+        chunks: queue.Queue[LoadItem] = queue.Queue(maxsize=LOAD_QUEUE_SIZE)
+        tab.load_cancel = cancel
+        tab.load_started = time.perf_counter()
+        tab.reload_backup = tab.document.snapshot() if tab.path is not None else None
+        self._begin_load(tab)
+        self._set_status(f"Opening {path.name}...")
+        self.io.submit(
+            path, self._load_file_thread, path, chunks, cancel, cancel=cancel
+        )
+        self.root.after(
+            LOAD_POLL_MS,
+            self._drain_load_queue,
+            tab,
+            path.name,
+            chunks,
+            cancel,
+            partial(self._finish_load, tab, path),
+        )
+        return True
 
-    def _load_file_thread(self, path: Path) -> None:
+    def _load_file_thread(
+        self,
+        path: Path,
+        chunks: queue.Queue[LoadItem],
+        cancel: threading.Event,
+        encoding: str | None = None,
+    ) -> None:
         try:
-            text, encoding = read_text_file(path)
-            self.root.after(0, self._apply_loaded_file, path, text, encoding)
+            reader = TextStreamReader(path, encoding=encoding)
+            for text in reader:
+                progress = reader.bytes_read * 100 // max(reader.size, 1)
+                if not self._put_load_item(chunks, cancel, ("chunk", text, progress)):
+                    return
+            self._put_load_item(chunks, cancel, ("done", reader.encoding, 100))
         except (TextIOError, OSError) as exc:
-            self.root.after(0, self._show_open_error, exc)
-
-    def _apply_loaded_file(self, path: Path, text: str, encoding: str) -> None:
-        self.text.delete("1.0", tk.END)
-        self.text.insert("1.0", text)
-        self.text.edit_reset()
-        self._current_file = path
-        self._current_encoding = encoding
-        self._set_dirty(False)
+            self._put_load_item(chunks, cancel, ("error", str(exc), 0))
+
+    @staticmethod
+    def _put_load_item(
+        chunks: queue.Queue[LoadItem], cancel: threading.Event, item: LoadItem
+    ) -> bool:
+        # The queue is bounded so the reader never runs far ahead of the widget.
+        while not cancel.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @perf.timed("app.load_batch")
+    def _drain_load_queue(
+        self,
+        tab: DocumentTab,
+        name: str,
+        chunks: queue.Queue[LoadItem],
+        cancel: threading.Event,
+        finish: Callable[[str], None],
+    ) -> None:
+        if cancel.is_set():
+            return
+        deadline = time.monotonic() + LOAD_BATCH_SECONDS
+        tab.text.config(state="normal")
+        try:
+            while time.monotonic() < deadline:
+                try:
+                    kind, payload, progress = chunks.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == "chunk":
+                    tab.text.insert("end-1c", payload)
+                    tab.load_progress = progress
+                elif kind == "done":
+                    finish(payload)
+                    return
+                else:
+                    self._abort_load(tab)
+                    self._show_error("Open Error", payload)
+                    return
+        finally:
+            if tab.loading:
+                tab.text.config(state="disabled")
+        if tab is self.tab:
+            self.progress["value"] = tab.load_progress
+            hint = " (Esc to cancel)" if tab.evicted is None else ""
+            self._set_status(f"Opening {name}... {tab.load_progress}%{hint}")
+        self.root.after(
+            LOAD_POLL_MS, self._drain_load_queue, tab, name, chunks, cancel, finish
+        )
+
+    def _begin_load(self, tab: DocumentTab) -> None:
+        tab.loading = True
+        tab.disk_changed = False
+        tab.load_progress = 0
+        tab.search.clear()
+        tab.syntax.set_lexer(None)
+        tab.journal.clear()
+        self._purge_journal(tab.doc_id, tab.journal)
+        tab.text.delete("1.0", tk.END)
+        tab.text.config(state="disabled")
+        self._show_progress(tab)
+
+    def _end_load(self, tab: DocumentTab) -> None:
+        tab.loading = False
+        tab.load_cancel = None
+        tab.text.config(state="normal")
+        self._show_progress(tab)
+
+    def _show_progress(self, tab: DocumentTab) -> None:
+        if tab is not self.tab:
+            return
+        if tab.loading:
+            self.progress["value"] = tab.load_progress
+            self.progress.pack(side="right", padx=4)
+        else:
+            self.progress.pack_forget()
+        # Restoring an evicted tab cannot be cancelled.
+        cancellable = tab.loading and tab.evicted is None
+        self.file_menu.entryconfigure(
+            "Cancel Open", state="normal" if cancellable else "disabled"
+        )
+
+    def _abort_load(self, tab: DocumentTab) -> None:
+        """Stop a load; reloading an open file keeps the file and its text."""
+        backup, tab.reload_backup = tab.reload_backup, None
+        tab.text.config(state="normal")
+        tab.text.delete("1.0", tk.END)
+        if backup is not None:
+            # Still loading, so putting the text back is not an edit.
+            for chunk in backup.iter_chunks():
+                tab.text.insert("end-1c", chunk)
+        self._end_load(tab)
+        tab.evicted = None
+        if tab.path is None:
+            tab.history.reset()
+            tab.encoding = "utf-8"
+            self._clear_recovery(tab)
+            self._set_dirty(tab, False)
+            self._update_title()
+            return
+        if backup is None:
+            tab.history.reset()
+        elif tab.dirty:
+            # _begin_load dropped the recovery journal of the unsaved text.
+            tab.journal.rebase()
+        tab.syntax.set_lexer(lexer_for(tab.path))
+        self._update_title()
+        self._after_load(tab)
+
+    def cancel_load(self) -> None:
+        tab = self.tab
+        if not tab.loading or tab.load_cancel is None or tab.evicted is not None:
+            return
+        tab.load_cancel.set()
+        self._abort_load(tab)
+        self._set_status("Open cancelled")
+
+    def _finish_load(self, tab: DocumentTab, path: Path, encoding: str) -> None:
+        perf.recorder.record("app.load", time.perf_counter() - tab.load_started)
+        tab.reload_backup = None
+        self._end_load(tab)
+        tab.history.reset()
+        tab.text.mark_set(tk.INSERT, "1.0")
+        tab.text.see(tk.INSERT)
+        tab.path = path
+        tab.encoding = encoding
+        # The fingerprint follows from a worker; the stat is taken right away
+        # so that changes from now on are noticed.
+        self._set_saved_state(tab, path, None)
+        self.io.submit(
+            path, self._fingerprint_thread, tab, path, tab.document.snapshot()
+        )
+        self._clear_recovery(tab)
+        self._set_dirty(tab, False)
+        self._update_title()
         self._add_recent_file(path)
         self._set_status(f"Opened: {path}")
         self._update_cursor_position()
+        tab.syntax.set_lexer(lexer_for(path))
+        self._after_load(tab)
+
+    def _after_load(self, tab: DocumentTab) -> None:
+        if tab is self.tab:
+            if self._highlight_query is not None:
+                self._schedule_highlight_refresh()
+            goto, tab.pending_goto = tab.pending_goto, None
+            if goto is not None:
+                self._goto(*goto)
+            self._check_disk_change(tab)
+        self._enforce_memory_budget()
+
+    def _fingerprint_thread(
+        self, tab: DocumentTab, path: Path, snapshot: DocumentSnapshot
+    ) -> None:
+        fingerprint = snapshot.fingerprint()
+        self.root.after(0, self._finish_fingerprint, tab, path, fingerprint)
+
+    def _finish_fingerprint(
+        self, tab: DocumentTab, path: Path, fingerprint: Fingerprint
+    ) -> None:
+        if tab.path == path and not tab.loading and tab.evicted is None:
+            self._set_saved_state(tab, path, fingerprint)
+
+    def _on_file_changed(self, path: Path) -> None:
+        # Runs on the watcher thread. Queued behind any save of the same
+        # file, so that our own writes are recorded before they are checked.
+        self.io.submit(path, self._disk_change_thread, path)
+
+    def _disk_change_thread(self, path: Path) -> None:
+        with contextlib.suppress(RuntimeError):
+            self.root.after(0, self._on_disk_change, path)
+
+    def _on_disk_change(self, path: Path) -> None:
+        tab = self._find_tab(path)
+        if (
+            tab is None
+            or tab.large_view is not None
+            or tab.follow is not None
+            or tab.saved_stat is None
+        ):
+            return
+        tab.disk_changed = True
+        if tab is self.tab:
+            self._check_disk_change(tab)
+
+    def _check_disk_change(self, tab: DocumentTab) -> None:
+        """Reload or ask about a file another program has changed.
+
+        Clean tabs reload on their own when ``auto_reload`` is on; otherwise
+        the user decides. Background tabs are dealt with when shown.
+        """
+        from tkinter import messagebox
+
+        from .watcher import file_stat
+
+        path = tab.path
+        if (
+            not tab.disk_changed
+            or path is None
+            or tab.loading
+            or tab.replacing
+            or tab.evicted is not None
+        ):
+            return
+        tab.disk_changed = False
+        stat = file_stat(path)
+        if tab.saved_stat is None or stat == tab.saved_stat:
+            return
+        if stat is None:
+            # The buffer is the only copy left.
+            self._set_dirty(tab, True)
+            self._set_status(f"{path.name} was deleted or moved on disk")
+            return
+        if not tab.dirty and self.config.auto_reload:
+            self._reload_tab(tab)
+            return
+        question = "Reload it and discard your changes?" if tab.dirty else "Reload it?"
+        if messagebox.askyesno(
+            "File Changed", f"{path.name} has changed on disk. {question}"
+        ):
+            self._reload_tab(tab)
+        else:
+            self._set_status(f"{path.name} has changed on disk")
+
+    def _reload_tab(self, tab: DocumentTab) -> None:
+        assert tab.path is not None
+        line, column = tab.text.index(tk.INSERT).split(".")
+        tab.pending_goto = (int(line), int(column))
+        if self._start_load(tab, tab.path):
+            self._set_status(f"Reloading {tab.path.name}, which changed on disk...")
+
+    def _confirm_overwrite(self, tab: DocumentTab, path: Path) -> bool:
+        """Ask before saving over changes another program made to ``path``."""
+        from tkinter import messagebox
+
+        from .watcher import file_stat
+
+        stat = file_stat(path)
+        if tab.saved_stat is None or stat is None or stat == tab.saved_stat:
+            return True
+        return messagebox.askyesno(
+            "File Changed",
+            f"{path.name} has changed on disk since it was opened or saved. "
+            "Overwrite it?",
+            icon="warning",
+        )
+
+    def _open_large_file(self, tab: DocumentTab, path: Path) -> bool:
+        from .large_file import MappedTextFile
+        from .ui.large_file_view import LargeFileView
+
+        try:
+            source = MappedTextFile(path)
+        except (TextIOError, OSError) as exc:
+            self._show_error("Open Error", str(exc))
+            return False
+        tab.syntax.set_lexer(None)
+        tab.scrollbar.pack(side="right", fill="y", before=tab.text)
+        tab.large_view = LargeFileView(
+            tab.text,
+            tab.scrollbar,
+            source,
+            on_progress=partial(self._on_index_progress, path),
+        )
+        self.io.submit(path, source.build_index)
+        tab.path = path
+        tab.encoding = source.encoding
+        tab.saved_fingerprint = None
+        self._set_dirty(tab, False)
+        self._update_title()
+        self._add_recent_file(path)
+        return True
+
+    def _on_index_progress(self, path: Path, progress: int) -> None:
+        if progress >= 100:
+            self._set_status(f"Opened read-only (large file): {path}")
+        else:
+            self._set_status(f"Indexing {path.name}... {progress}%")
+
+    def _close_large_file(self, tab: DocumentTab) -> None:
+        if tab.large_view is None:
+            return
+        tab.large_view.close()
+        tab.large_view = None
+        tab.scrollbar.pack_forget()
+
+    def _enforce_memory_budget(self) -> None:
+        """Evict least recently used background tabs while over the budget."""
+        idle = sorted(
+            (
+                tab
+                for tab in self.tabs
+                if tab is not self.tab
+                and tab.evicted is None
+                and tab.large_view is None
+                and tab.follow is None
+                and not (tab.loading or tab.replacing)
+                and tab not in self._evicting
+                and len(tab.document)
+            ),
+            key=lambda tab: tab.last_used,
+        )
+        total = sum(
+            tab.memory_usage() for tab in self.tabs if tab not in self._evicting
+        )
+        candidates = [(tab, memory_estimate(len(tab.document))) for tab in idle]
+        for tab in select_evictions(candidates, total, self.config.tab_memory_budget):
+            self._evict_tab(tab)
+
+    def _evict_tab(self, tab: DocumentTab) -> None:
+        tab.view = (tab.text.index(tk.INSERT), tab.text.yview()[0])
+        if self._autosave_enabled and tab.dirty and tab.journal.has_pending:
+            self._queue_autosave(tab)
+        path = tab.path
+        if (
+            not tab.dirty
+            and path is not None
+            and tab.saved_stat is not None
+            and self._file_unchanged(tab, path)
+        ):
+            # Clean: the file on disk is the copy to restore from.
+            self._release_tab(tab, path)
+            return
+        self._evicting.add(tab)
+        self.io.submit(
+            ("evict", tab.doc_id),
+            self._compress_thread,
+            tab,
+            tab.document.snapshot(),
+            tab.edit_count,
+        )
+
+    @perf.timed("app.evict")
+    def _compress_thread(
+        self, tab: DocumentTab, snapshot: DocumentSnapshot, edit_count: int
+    ) -> None:
+        compressed = CompressedText.from_chunks(snapshot.iter_chunks())
+        self.root.after(0, self._finish_evict, tab, compressed, edit_count)
+
+    def _finish_evict(
+        self, tab: DocumentTab, compressed: CompressedText, edit_count: int
+    ) -> None:
+        self._evicting.discard(tab)
+        # The tab may have been closed, shown or edited in the meantime.
+        if (
+            tab in self.tabs
+            and tab is not self.tab
+            and tab.evicted is None
+            and not (tab.loading or tab.replacing)
+            and tab.edit_count == edit_count
+        ):
+            self._release_tab(tab, compressed)
+
+    def _release_tab(self, tab: DocumentTab, evicted: CompressedText | Path) -> None:
+        tab.evicted = evicted
+        tab.syntax.set_lexer(None)
+        tab.search.clear()
+        tab.text.delete("1.0", tk.END)
+
+    def _restore_tab(self, tab: DocumentTab) -> None:
+        """Stream an evicted tab's text back into its widget."""
+        if isinstance(tab.evicted, RecoveryJournal):
+            # Unsaved text from the last session: replay the journal first.
+            tab.loading = True
+            tab.load_progress = 0
+            tab.text.config(state="disabled")
+            self.io.submit(
+                ("evict", tab.doc_id), self._recover_thread, tab, tab.evicted
+            )
+            return
+        if isinstance(tab.evicted, Path):
+            path = tab.evicted
+            with contextlib.suppress(OSError):
+                if path.stat().st_size >= self.config.large_file_threshold:
+                    # Grown past the threshold since it was last shown.
+                    tab.evicted = None
+                    if not self._open_large_file(tab, path):
+                        self._abort_load(tab)
+                    return
+        cancel = threading.Event()
+        chunks: queue.Queue[LoadItem] = queue.Queue(maxsize=LOAD_QUEUE_SIZE)
+        tab.loading = True
+        tab.load_progress = 0
+        tab.load_cancel = cancel
+        tab.load_started = time.perf_counter()
+        tab.text.config(state="disabled")
+        key = ("evict", tab.doc_id)
+        if isinstance(tab.evicted, CompressedText):
+            self.io.submit(
+                key, self._restore_thread, tab.evicted, chunks, cancel, cancel=cancel
+            )
+        elif tab.evicted is not None:
+            self.io.submit(
+                key,
+                self._load_file_thread,
+                tab.evicted,
+                chunks,
+                cancel,
+                tab.encoding,
+                cancel=cancel,
+            )
+        self.root.after(
+            LOAD_POLL_MS,
+            self._drain_load_queue,
+            tab,
+            tab.path.name if tab.path else "Untitled",
+            chunks,
+            cancel,
+            partial(self._finish_restore, tab),
+        )
+
+    def _restore_thread(
+        self,
+        compressed: CompressedText,
+        chunks: queue.Queue[LoadItem],
+        cancel: threading.Event,
+    ) -> None:
+        done = 0
+        for text in compressed.iter_chunks():
+            done += len(text)
+            progress = done * 100 // max(compressed.length, 1)
+            if not self._put_load_item(chunks, cancel, ("chunk", text, progress)):
+                return
+        self._put_load_item(chunks, cancel, ("done", "", 100))
+
+    def _recover_thread(self, tab: DocumentTab, journal: RecoveryJournal) -> None:
+        try:
+            text, _ = journal.recover()
+        except (OSError, json.JSONDecodeError, TextIOError) as exc:
+            self.root.after(0, self._abort_recover, tab, str(exc))
+            return
+        compressed = CompressedText.from_chunks([text])
+        self.root.after(0, self._finish_recover, tab, compressed)
+
+    def _finish_recover(self, tab: DocumentTab, compressed: CompressedText) -> None:
+        if tab not in self.tabs:
+            return
+        tab.loading = False
+        tab.evicted = compressed
+        self._restore_tab(tab)
+        self._show_progress(tab)
+
+    def _abort_recover(self, tab: DocumentTab, message: str) -> None:
+        if tab not in self.tabs:
+            return
+        # The recovery files are kept and offered again at the next launch.
+        self._remove_tab(tab)
+        self._show_error("Recovery Error", message)
+
+    def _finish_restore(self, tab: DocumentTab, _encoding: str) -> None:
+        released, tab.evicted = tab.evicted, None
+        perf.recorder.record("app.restore", time.perf_counter() - tab.load_started)
+        self._end_load(tab)
+        if isinstance(released, Path):
+            if not self._file_unchanged(tab, released):
+                # Changed on disk while the tab was released: what was just
+                # read is the saved text now, and the old undo history no
+                # longer fits.
+                tab.history.reset()
+                tab.disk_changed = False
+                tab.saved_fingerprint = None
+                self._clear_recovery(tab)
+                self._set_status(f"Reloaded {released.name}, which changed on disk")
+            if tab.saved_fingerprint is None:
+                # Also the first read of a tab restored from the last session.
+                self._set_saved_state(tab, released, None)
+                self.io.submit(
+                    released,
+                    self._fingerprint_thread,
+                    tab,
+                    released,
+                    tab.document.snapshot(),
+                )
+        index, top = tab.view
+        tab.text.mark_set(tk.INSERT, index)
+        tab.text.yview_moveto(top)
+        tab.syntax.set_lexer(lexer_for(tab.path))
+        if tab is self.tab:
+            self._update_cursor_position()
+        self._after_load(tab)
+
+    def _ensure_editable(self) -> bool:
+        if self.tab.loading:
+            self._set_status("Please wait until the file has finished loading")
+            return False
+        if self.tab.replacing:
+            self._set_status("Please wait until Replace All has finished")
+            return False
+        if self.tab.large_view is not None:
+            self._set_status("Large files are opened read-only")
+            return False
+        if self.tab.follow is not None:
+            self._set_status("Stop following the file to edit it")
+            return False
+        return True
+
+    def toggle_follow(self) -> None:
+        tab = self.tab
+        if tab.follow is None:
+            self._start_follow(tab)
+        elif tab.path is not None:
+            self._stop_follow(tab)
+            # The buffer only holds the end of the file; show all of it again.
+            self._start_load(tab, tab.path)
+        self.follow_var.set(tab.follow is not None)
+
+    def _start_follow(self, tab: DocumentTab) -> None:
+        if tab.path is None:
+            self._set_status("Save the file before following it")
+            return
+        if tab.loading or tab.replacing:
+            self._set_status("Please wait until the file has finished loading")
+            return
+        if tab.dirty:
+            self._set_status("Save or discard your changes before following the file")
+            return
+        from .follow import LogTail
+
+        try:
+            tail = LogTail(tab.path, tab.encoding)
+        except (OSError, TextIOError) as exc:
+            self._show_error("Follow Error", str(exc))
+            return
+        self._close_large_file(tab)
+        tab.follow = tail
+        tab.search.clear()
+        tab.text.config(state="normal")
+        tab.text.delete("1.0", tk.END)
+        tab.text.config(state="disabled")
+        tab.history.reset()
+        tab.syntax.set_lexer(lexer_for(tab.path))
+        self._set_status(f"Following {tab.path.name}")
+        self._follow_tick(tab)
+
+    def _stop_follow(self, tab: DocumentTab) -> None:
+        if tab.follow_job is not None:
+            self.root.after_cancel(tab.follow_job)
+            tab.follow_job = None
+        if tab.follow is not None:
+            tab.follow = None
+            tab.text.config(state="normal")
+
+    def _follow_tick(self, tab: DocumentTab) -> None:
+        tab.follow_job = None
+        if tab.follow is None:
+            return
+        self.io.submit(
+            ("follow", tab.doc_id),
+            self._follow_thread,
+            tab,
+            tab.follow,
+            self.config.follow_max_lines,
+            coalesce=True,
+        )
+        tab.follow_job = self.root.after(FOLLOW_POLL_MS, self._follow_tick, tab)
+
+    def _follow_thread(self, tab: DocumentTab, tail: LogTail, max_lines: int) -> None:
+        from .follow import keep_last_lines
+
+        try:
+            text, restarted = tail.read()
+        except OSError as exc:
+            self.logger.warning("Could not follow %s: %s", tail.path, exc)
+            return
+        if text or restarted:
+            # Lines that would be trimmed straight away are not inserted.
+            text = keep_last_lines(text, max_lines)
+            with contextlib.suppress(RuntimeError):
+                self.root.after(0, self._append_follow, tab, tail, text, restarted)
+
+    @perf.timed("app.follow_append")
+    def _append_follow(
+        self, tab: DocumentTab, tail: LogTail, text: str, restarted: bool
+    ) -> None:
+        if tab.follow is not tail:
+            return
+        if restarted and tab is self.tab:
+            self._set_status(
+                f"{tail.path.name} was truncated or replaced; following it from "
+                "the start"
+            )
+        if not text:
+            return
+        at_end = tab.text.yview()[1] >= 1.0
+        tab.text.config(state="normal")
+        tab.text.insert("end-1c", text)
+        limit = self.config.follow_max_lines
+        if limit > 0:
+            excess = tab.document.line_count - limit
+            if excess > 0:
+                tab.text.delete("1.0", f"{excess + 1}.0")
+        tab.text.config(state="disabled")
+        if at_end:
+            tab.text.see("end-1c")
+        if tab is self.tab:
+            self.ui_updates.request(self._update_cursor_position)
 
     def save_file(self) -> None:
-        if self._current_file is None:
+        if not self._ensure_editable():
+            return
+        tab = self.tab
+        if tab.path is None:
             self.save_file_as()
             return
-        self._write_file(self._current_file, self._current_encoding)
+        if self._content_unchanged(tab) and self._file_unchanged(tab, tab.path):
+            self._set_dirty(tab, False)
+            self._set_status("No changes to save")
+            return
+        if self._confirm_overwrite(tab, tab.path):
+            self._write_file(tab, tab.path, tab.encoding)
 
     def save_file_as(self) -> None:
-        prompt = self._prompt_save_path_and_encoding()
+        if not self._ensure_editable():
+            return
+        tab = self.tab
+        prompt = self._prompt_save_path_and_encoding(tab)
         if not prompt:
             return
         path, encoding = prompt
-        self._write_file(path, encoding)
+        self._write_file(tab, path, encoding)
+
+    def _prompt_save_path_and_encoding(
+        self, tab: DocumentTab
+    ) -> tuple[Path, str] | None:
+        from tkinter import filedialog
+
+        from .ui.encoding_dialog import EncodingDialog
 
-    def _prompt_save_path_and_encoding(self) -> tuple[Path, str] | None:
         path_str = filedialog.asksaveasfilename(
             defaultextension=".txt",
             filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")],
         )
         if not path_str:
             return None
-        dialog = EncodingDialog(self.root, initial=self._current_encoding or "utf-8")
+        dialog = EncodingDialog(self.root, initial=tab.encoding or "utf-8")
         encoding = dialog.show()
         if not encoding:
             return None
         return Path(path_str), encoding
 
-    def _save_file_sync(self, path: Path, encoding: str) -> bool:
-        text = self.text.get("1.0", "end-1c")
+    def _tab_snapshot(self, tab: DocumentTab) -> DocumentSnapshot:
+        if isinstance(tab.evicted, CompressedText):
+            # Still compressed, or only partly restored into the widget.
+            return PieceTable(tab.evicted.text()).snapshot()
+        return tab.document.snapshot()
+
+    def _save_file_sync(self, tab: DocumentTab, path: Path, encoding: str) -> bool:
+        snapshot = self._tab_snapshot(tab)
         try:
-            write_text_file(path, text, encoding)
+            write_text_file(path, snapshot.iter_chunks(), encoding)
         except (OSError, TextIOError) as exc:
             self._show_error("Save Error", str(exc))
             return False
-        self._finish_save(path, encoding)
+        tab.save_generation += 1
+        self._finish_save(
+            tab,
+            path,
+            encoding,
+            snapshot.fingerprint(),
+            (tab.save_generation, tab.edit_count),
+        )
         return True
 
-    def _save_file_as_sync(self) -> bool:
-        prompt = self._prompt_save_path_and_encoding()
+    def _save_file_as_sync(self, tab: DocumentTab) -> bool:
+        prompt = self._prompt_save_path_and_encoding(tab)
         if not prompt:
             return False
         path, encoding = prompt
-        return self._save_file_sync(path, encoding)
+        return self._save_file_sync(tab, path, encoding)
 
-    def _write_file(self, path: Path, encoding: str) -> None:
-        text = self.text.get("1.0", "end-1c")
+    def _write_file(self, tab: DocumentTab, path: Path, encoding: str) -> None:
+        snapshot = tab.document.snapshot()
+        tab.save_generation += 1
         self._set_status("Saving...")
-        threading.Thread(
-            target=self._write_file_thread,
-            args=(path, text, encoding),
-            daemon=True,
-        ).start()
+        self.io.submit(
+            path,
+            self._write_file_thread,
+            tab,
+            path,
+            snapshot,
+            encoding,
+            (tab.save_generation, tab.edit_count),
+        )
 
-    def _write_file_thread(self, path: Path, text: str, encoding: str) -> None:
+    @perf.timed("app.save")
+    def _write_file_thread(
+        self,
+        tab: DocumentTab,
+        path: Path,
+        snapshot: DocumentSnapshot,
+        encoding: str,
+        counters: tuple[int, int],
+    ) -> None:
         try:
-            write_text_file(path, text, encoding)
-            self.root.after(0, self._finish_save, path, encoding)
+            write_text_file(path, snapshot.iter_chunks(), encoding)
+            fingerprint = snapshot.fingerprint()
+            self.root.after(
+                0, self._finish_save, tab, path, encoding, fingerprint, counters
+            )
         except (OSError, TextIOError) as exc:
             self.root.after(0, self._show_save_error, exc)
 
-    def _finish_save(self, path: Path, encoding: str) -> None:
-        self._current_file = path
-        self._current_encoding = encoding
-        self._set_dirty(False)
+    def _finish_save(
+        self,
+        tab: DocumentTab,
+        path: Path,
+        encoding: str,
+        fingerprint: Fingerprint,
+        counters: tuple[int, int],
+    ) -> None:
+        generation, edit_count = counters
+        if generation != tab.save_generation or tab not in self.tabs:
+            # A newer save was started; it decides the document state.
+            self._add_recent_file(path)
+            self._set_status(f"Saved: {path}")
+            return
+        if path != tab.path:
+            if tab.path is not None:
+                self.watcher.unwatch(tab.path)
+            if tab.evicted is None and not tab.loading:
+                tab.syntax.set_lexer(lexer_for(path))
+        tab.path = path
+        tab.encoding = encoding
+        self._set_saved_state(tab, path, fingerprint)
+        # Edits made while the snapshot was being written are still unsaved.
+        self._set_dirty(tab, edit_count != tab.edit_count)
         self._add_recent_file(path)
-        self._clear_recovery()
+        if tab.dirty:
+            # The journal's edits apply to text the file no longer holds, and
+            # the file lacks the newer ones: restart it from a checkpoint.
+            tab.journal.rebase()
+        else:
+            self._clear_recovery(tab)
         self._set_status(f"Saved: {path}")
 
     def _show_error(self, title: str, message: str) -> None:
+        from tkinter import messagebox
+
         messagebox.showerror(title, message)
         self._set_status(message)
 
-    def _show_open_error(self, exc: BaseException) -> None:
-        self._show_error("Open Error", str(exc))
-
     def _show_save_error(self, exc: BaseException) -> None:
         self._show_error("Save Error", str(exc))
 
     def _show_info(self, title: str, message: str) -> None:
+        from tkinter import messagebox
+
         messagebox.showinfo(title, message)
         self._set_status(message)
 
     def undo(self) -> None:
-        with contextlib.suppress(tk.TclError):
-            self.text.edit_undo()
+        if self._ensure_editable():
+            self._apply_history(self.history.undo())
 
     def redo(self) -> None:
-        with contextlib.suppress(tk.TclError):
-            self.text.edit_redo()
+        if self._ensure_editable():
+            self._apply_history(self.history.redo())
+
+    @perf.timed("app.apply_history")
+    def _apply_history(self, edits: list[TextEdit]) -> None:
+        if not edits:
+            return
+        with self.history.applying():
+            for edit in edits:
+                start = self._index_at(edit.offset)
+                end = self._index_at(edit.offset + len(edit.deleted))
+                self.text.replace(start, end, edit.inserted)
+        last = edits[-1]
+        self.text.tag_remove(tk.SEL, "1.0", tk.END)
+        self.text.mark_set(tk.INSERT, self._index_at(last.offset + len(last.inserted)))
+        self.text.see(tk.INSERT)
+        self._schedule_cursor_update()
 
     def cut(self) -> None:
         self.text.event_generate("<<Cut>>")
@@ -389,105 +1503,368 @@ class TextEditorApp:
 
     def open_find_replace(self) -> None:
         if self._find_dialog is None:
+            from .ui.find_replace import FindReplaceDialog
+
             self._find_dialog = FindReplaceDialog(
                 self.root,
                 on_find=self.find_next,
+                on_find_previous=self.find_previous,
                 on_replace=self.replace_current,
                 on_replace_all=self.replace_all,
                 on_close=self._on_find_dialog_close,
+                on_highlight_all=self.highlight_all,
             )
         else:
             self._find_dialog.focus()
 
+    def open_find_in_files(self) -> None:
+        if self._find_in_files is None:
+            from .ui.find_in_files import FindInFilesPanel
+
+            initial_dir = self.tab.path.parent if self.tab.path else Path.cwd()
+            self._find_in_files = FindInFilesPanel(
+                self.root,
+                on_open=self._open_search_hit,
+                initial_dir=initial_dir,
+                on_close=self._on_find_in_files_close,
+            )
+        else:
+            self._find_in_files.focus()
+
+    def _on_find_in_files_close(self) -> None:
+        self._find_in_files = None
+
+    def _open_search_hit(self, path: Path, line: int, column: int) -> None:
+        self.open_path(path, (line, column))
+
+    def _goto(self, line: int, column: int) -> None:
+        index = f"{line}.{column}"
+        self.text.tag_remove(tk.SEL, "1.0", tk.END)
+        self.text.mark_set(tk.INSERT, index)
+        self.text.see(tk.INSERT)
+        self.text.focus_set()
+        self._schedule_cursor_update()
+
+    def open_performance_window(self) -> None:
+        from .ui.perf_window import PerformanceWindow
+
+        if self._perf_window is None:
+            self._perf_window = PerformanceWindow(
+                self.root, perf.recorder, on_close=self._on_perf_window_close
+            )
+        else:
+            self._perf_window.focus()
+
+    def _on_perf_window_close(self) -> None:
+        self._perf_window = None
+
     def _on_find_dialog_close(self) -> None:
         self._find_dialog = None
-
-    def find_next(self, query: str, use_regex: bool) -> None:
-        self.text.tag_remove("find_match", "1.0", tk.END)
-        start_index = self.text.index(tk.INSERT)
-        content = self.text.get("1.0", "end-1c")
-        start_count = self.text.count("1.0", start_index, "chars")
-        if not start_count:
+        self._highlight_query = None
+        self._clear_highlights()
+
+    @perf.timed("app.find_next")
+    def find_next(
+        self,
+        query: str,
+        use_regex: bool,
+        on_found: Callable[[str, str], None] | None = None,
+    ) -> None:
+        self._find(query, use_regex, backwards=False, on_found=on_found)
+
+    @perf.timed("app.find_previous")
+    def find_previous(self, query: str, use_regex: bool) -> None:
+        self._find(query, use_regex, backwards=True)
+
+    def _find(
+        self,
+        query: str,
+        use_regex: bool,
+        backwards: bool,
+        on_found: Callable[[str, str], None] | None = None,
+    ) -> None:
+        if not self._ensure_editable():
             return
-        start_offset = int(start_count[0])
+        self._with_index(
+            query,
+            use_regex,
+            partial(self._show_match, backwards=backwards, on_found=on_found),
+        )
 
-        if use_regex:
-            try:
-                pattern = re.compile(query)
-            except re.error as exc:
-                self._show_error("Find Error", str(exc))
-                return
-            match = pattern.search(content, pos=start_offset)
-            if not match:
-                match = pattern.search(content, pos=0)
-            if not match:
-                self._show_info("Find", "No matches found.")
-                return
-            start = match.start()
-            end = match.end()
-        else:
-            match_index = self.text.search(query, start_index, tk.END)
-            if not match_index:
-                match_index = self.text.search(query, "1.0", tk.END)
-            if not match_index:
-                self._show_info("Find", "No matches found.")
-                return
-            match_count = self.text.count("1.0", match_index, "chars")
-            if not match_count:
-                return
-            start = int(match_count[0])
-            end = start + len(query)
+    def _with_index(
+        self, query: str, use_regex: bool, callback: Callable[[MatchIndex], None]
+    ) -> None:
+        """Run ``callback`` with the match index for the query, building it if needed."""
+        index = self.search.lookup(query, use_regex)
+        if index is not None:
+            callback(index)
+            return
+        if self.search.building and self.search.key == (query, use_regex):
+            self._search_waiters.append(callback)
+            return
+        try:
+            pattern = self.search.begin_build(query, use_regex)
+        except re.error as exc:
+            self._show_error("Find Error", str(exc))
+            return
+        self._search_generation += 1
+        self._search_waiters = [callback]
+        self._set_status("Searching...")
+        threading.Thread(
+            target=self._search_thread,
+            args=(
+                pattern,
+                is_line_local(query, use_regex),
+                self.document.snapshot(),
+                self._search_generation,
+            ),
+            daemon=True,
+        ).start()
 
-        start_idx = self.text.index(f"1.0 + {start} chars")
-        end_idx = self.text.index(f"1.0 + {end} chars")
+    @perf.timed("app.search_index")
+    def _search_thread(
+        self,
+        pattern: re.Pattern[str],
+        line_local: bool,
+        snapshot: DocumentSnapshot,
+        generation: int,
+    ) -> None:
+        index = MatchIndex.build(pattern, line_local, snapshot.text())
+        self.root.after(0, self._finish_search, index, generation)
+
+    def _finish_search(self, index: MatchIndex, generation: int) -> None:
+        if generation != self._search_generation or not self.search.building:
+            return
+        key = self.search.key
+        waiters, self._search_waiters = self._search_waiters, []
+        installed = self.search.finish_build(index, self.document)
+        for callback in waiters:
+            if installed is not None:
+                callback(installed)
+            elif key is not None:
+                self.search.clear()
+                self._with_index(*key, callback)
+
+    def _show_match(
+        self,
+        index: MatchIndex,
+        backwards: bool,
+        on_found: Callable[[str, str], None] | None = None,
+    ) -> None:
+        self.text.tag_remove("find_match", "1.0", tk.END)
+        offset = self._offset_at(tk.INSERT)
+        span = index.previous_before(offset) if backwards else index.next_after(offset)
+        if span is None:
+            self._show_info("Find", "No matches found.")
+            return
+        start_idx = self._index_at(span[0])
+        end_idx = self._index_at(span[1])
         self.text.tag_add("find_match", start_idx, end_idx)
         self.text.mark_set(tk.INSERT, end_idx)
         self.text.see(start_idx)
+        self._set_status(f"{len(index)} match(es)")
+        if self._find_dialog is not None:
+            self._find_dialog.set_match_count(len(index))
+        if on_found:
+            on_found(start_idx, end_idx)
+
+    def highlight_all(self, query: str, use_regex: bool, enabled: bool) -> None:
+        self._highlight_query = (query, use_regex) if enabled else None
+        self._clear_highlights()
+        if enabled and self._ensure_editable():
+            self._with_index(query, use_regex, self._paint_highlights)
+
+    def _clear_highlights(self) -> None:
+        for job in (self._highlight_job, self._highlight_refresh_job):
+            if job is not None:
+                self.root.after_cancel(job)
+        self._highlight_job = None
+        self._highlight_refresh_job = None
+        self._highlight_lines = (0, 0)
+        self.text.tag_remove("find_all", "1.0", tk.END)
+
+    def _schedule_highlight_refresh(self, delay_ms: int = 0) -> None:
+        if self._highlight_refresh_job is not None:
+            self.root.after_cancel(self._highlight_refresh_job)
+        self._highlight_refresh_job = self.root.after(
+            delay_ms, self._refresh_highlights
+        )
 
-    def replace_current(self, query: str, replacement: str, use_regex: bool) -> None:
-        self.find_next(query, use_regex)
-        if not self.text.tag_ranges("find_match"):
+    def _refresh_highlights(self) -> None:
+        self._highlight_refresh_job = None
+        if self._highlight_query is not None and not self.tab.loading:
+            self._with_index(*self._highlight_query, self._paint_highlights)
+
+    def _visible_lines(self) -> tuple[int, int]:
+        first = int(self.text.index("@0,0").split(".")[0])
+        last = int(self.text.index(f"@0,{self.text.winfo_height()}").split(".")[0])
+        return first, last
+
+    def _paint_highlights(self, index: MatchIndex) -> None:
+        """Tag matches on screen first, then nearby ones, in time-sliced batches.
+
+        Only matches within ``HIGHLIGHT_MARGIN_LINES`` of the viewport are
+        tagged (at most ``HIGHLIGHT_LIMIT``); scrolling repaints the window.
+        """
+        if self._highlight_query != self.search.key:
             return
-        start, end = self.text.tag_ranges("find_match")
+        self._clear_highlights()
+        if self._find_dialog is not None:
+            self._find_dialog.set_match_count(len(index))
+        first, last = self._visible_lines()
+        low = max(1, first - HIGHLIGHT_MARGIN_LINES)
+        high = last + HIGHLIGHT_MARGIN_LINES
+        self._highlight_lines = (low, high)
+        offset_of = self.document.offset_of
+        visible_start, visible_end = offset_of(first, 0), offset_of(last + 1, 0)
+        spans = itertools.islice(
+            itertools.chain(
+                index.spans_between(visible_start, visible_end),
+                index.spans_between(visible_end, offset_of(high + 1, 0)),
+                index.spans_between(offset_of(low, 0), visible_start),
+            ),
+            HIGHLIGHT_LIMIT,
+        )
+        self._highlight_batch(spans)
+
+    def _highlight_batch(self, spans: Iterator[tuple[int, int]]) -> None:
+        deadline = time.monotonic() + HIGHLIGHT_SLICE_SECONDS
+        for start, end in spans:
+            self.text.tag_add("find_all", self._index_at(start), self._index_at(end))
+            if time.monotonic() > deadline:
+                self._highlight_job = self.root.after(1, self._highlight_batch, spans)
+                return
+        self._highlight_job = None
+
+    def _on_text_scroll(self, *_args: object) -> None:
+        self.ui_updates.request(self.syntax.refresh_window)
+        if self._highlight_query is None or self._highlight_refresh_job is not None:
+            return
+        low, high = self._highlight_lines
+        top, bottom = self._visible_lines()
+        if top < low or bottom > high:
+            self._schedule_highlight_refresh()
+
+    def replace_current(self, query: str, replacement: str, use_regex: bool) -> None:
+        self.find_next(
+            query,
+            use_regex,
+            on_found=partial(self._replace_range, query, replacement, use_regex),
+        )
+
+    def _replace_range(
+        self, query: str, replacement: str, use_regex: bool, start: str, end: str
+    ) -> None:
         selected = self.text.get(start, end)
         if use_regex:
             try:
-                replaced = re.sub(query, replacement, selected)
+                replaced = compile_pattern(query, True).sub(replacement, selected)
             except re.error as exc:
                 self._show_error("Replace Error", str(exc))
                 return
         else:
             replaced = replacement
+        self.history.begin_group()
         self.text.delete(start, end)
         self.text.insert(start, replaced)
-        self._set_dirty(True)
+        self.history.end_group()
 
     def replace_all(self, query: str, replacement: str, use_regex: bool) -> None:
-        content = self.text.get("1.0", "end-1c")
-        if use_regex:
-            try:
-                new_content, count = re.subn(query, replacement, content)
-            except re.error as exc:
-                self._show_error("Replace Error", str(exc))
-                return
-        else:
-            count = content.count(query)
-            new_content = content.replace(query, replacement)
+        if not self._ensure_editable():
+            return
+        try:
+            pattern = compile_pattern(query, use_regex)
+        except re.error as exc:
+            self._show_error("Replace Error", str(exc))
+            return
+        tab = self.tab
+        self._begin_replace(tab)
+        threading.Thread(
+            target=self._plan_replace_thread,
+            args=(tab, pattern, tab.document.snapshot(), replacement, use_regex),
+            daemon=True,
+        ).start()
 
+    @perf.timed("app.replace_plan")
+    def _plan_replace_thread(
+        self,
+        tab: DocumentTab,
+        pattern: re.Pattern[str],
+        snapshot: DocumentSnapshot,
+        replacement: str,
+        use_regex: bool,
+    ) -> None:
+        try:
+            count, edits = plan_replacements(
+                pattern, snapshot.text(), replacement, use_regex
+            )
+        except re.error as exc:
+            self.root.after(0, self._abort_replace, tab, str(exc))
+            return
+        self.root.after(0, self._apply_replacements, tab, edits, count)
+
+    def _begin_replace(self, tab: DocumentTab) -> None:
+        # Block edits until the plan is applied; it refers to this snapshot.
+        tab.replacing = True
+        tab.replace_started = time.perf_counter()
+        tab.search.clear()
+        tab.text.config(state="disabled")
+        self._set_status("Replacing...")
+
+    def _end_replace(self, tab: DocumentTab) -> None:
+        tab.replacing = False
+        tab.text.config(state="normal")
+        if tab is self.tab and self._highlight_query is not None:
+            self._schedule_highlight_refresh()
+
+    def _abort_replace(self, tab: DocumentTab, message: str) -> None:
+        self._end_replace(tab)
+        self._show_error("Replace Error", message)
+
+    def _apply_replacements(
+        self, tab: DocumentTab, edits: list[Replacement], count: int
+    ) -> None:
+        if tab not in self.tabs:
+            return
         if count == 0:
+            self._end_replace(tab)
             self._show_info("Replace", "No matches found.")
             return
-        self.text.delete("1.0", tk.END)
-        self.text.insert("1.0", new_content)
-        self._set_dirty(True)
+        tab.history.begin_group()
+        tab.syntax.begin_bulk()
+        self._apply_replace_batch(tab, edits, count)
+
+    @perf.timed("app.replace_batch")
+    def _apply_replace_batch(
+        self, tab: DocumentTab, edits: list[Replacement], count: int
+    ) -> None:
+        """Apply planned edits last-to-first in time-sliced batches."""
+        deadline = time.monotonic() + REPLACE_BATCH_SECONDS
+        tab.text.config(state="normal")
+        while edits and time.monotonic() < deadline:
+            start, end, new_text = edits.pop()
+            tab.text.replace(start, end, new_text)
+        if edits:
+            tab.text.config(state="disabled")
+            self._set_status(f"Replacing... {len(edits)} remaining")
+            self.root.after(1, self._apply_replace_batch, tab, edits, count)
+            return
+        tab.history.end_group()
+        tab.syntax.end_bulk()
+        self._end_replace(tab)
+        perf.recorder.record(
+            "app.replace_all", time.perf_counter() - tab.replace_started
+        )
         self._show_info("Replace", f"Replaced {count} occurrence(s).")
 
     def set_theme(self, theme: str) -> None:
         self.config.theme = theme
         self._apply_theme(theme)
-        save_config(self.config)
+        self.config_store.mark_dirty()
 
     def set_font_family(self) -> None:
+        from tkinter import simpledialog
+
         family = simpledialog.askstring(
             "Font Family", "Enter font family:", initialvalue=self.config.font_family
         )
@@ -495,9 +1872,11 @@ class TextEditorApp:
             return
         self.config.font_family = family
         self._apply_font(self.config.font_family, self.config.font_size)
-        save_config(self.config)
+        self.config_store.mark_dirty()
 
     def set_font_size(self) -> None:
+        from tkinter import simpledialog
+
         size = simpledialog.askinteger(
             "Font Size", "Enter font size:", initialvalue=self.config.font_size
         )
@@ -505,17 +1884,19 @@ class TextEditorApp:
             return
         self.config.font_size = size
         self._apply_font(self.config.font_family, self.config.font_size)
-        save_config(self.config)
+        self.config_store.mark_dirty()
 
     def toggle_autosave(self) -> None:
         self._autosave_enabled = self.autosave_var.get()
         self.config.autosave_enabled = self._autosave_enabled
-        save_config(self.config)
+        self.config_store.mark_dirty()
         self._set_status(
             "Autosave enabled" if self._autosave_enabled else "Autosave disabled"
         )
 
     def set_autosave_interval(self) -> None:
+        from tkinter import simpledialog
+
         interval = simpledialog.askinteger(
             "Autosave Interval",
             "Enter autosave interval in seconds:",
@@ -525,7 +1906,7 @@ class TextEditorApp:
             return
         self._autosave_interval = interval
         self.config.autosave_interval = interval
-        save_config(self.config)
+        self.config_store.mark_dirty()
         self._schedule_autosave()
         self._set_status(f"Autosave interval set to {interval}s")
 
@@ -537,75 +1918,123 @@ class TextEditorApp:
         )
 
     def _autosave_tick(self) -> None:
-        if self._autosave_enabled and self._dirty:
-            text = self.text.get("1.0", "end-1c")
-            threading.Thread(
-                target=self._autosave_thread,
-                args=(text,),
-                daemon=True,
-            ).start()
+        if self._autosave_enabled:
+            for tab in self.tabs:
+                if (
+                    tab.dirty
+                    and tab.journal.has_pending
+                    and tab.evicted is None
+                    and not tab.loading
+                ):
+                    self._queue_autosave(tab)
         self._schedule_autosave()
 
-    def _autosave_thread(self, text: str) -> None:
-        recovery_text, recovery_meta = get_recovery_paths()
+    def _queue_autosave(self, tab: DocumentTab) -> None:
         meta = {
-            "path": str(self._current_file) if self._current_file else "",
-            "encoding": self._current_encoding,
+            "path": str(tab.path) if tab.path else "",
+            "encoding": tab.encoding,
         }
+        snapshot = tab.document.snapshot()
+        tab.journal.queue_batch(snapshot, meta)
+        self.io.submit(
+            ("autosave", tab.doc_id),
+            self._autosave_thread,
+            tab,
+            snapshot,
+            tab.saved_fingerprint,
+            tab.edit_count,
+            coalesce=True,
+        )
+
+    @perf.timed("app.autosave")
+    def _autosave_thread(
+        self,
+        tab: DocumentTab,
+        snapshot: DocumentSnapshot,
+        saved: Fingerprint | None,
+        edit_count: int,
+    ) -> None:
+        unchanged = saved is not None and len(snapshot) == saved.length
+        if unchanged and snapshot.fingerprint() == saved:
+            self.root.after(0, self._on_content_reverted, tab, edit_count)
+            return
         try:
-            write_text_file(recovery_text, text, "utf-8")
-            write_text_file(recovery_meta, json.dumps(meta, indent=2), "utf-8")
-        except OSError:
-            pass
+            tab.journal.flush()
+        except (OSError, TextIOError) as exc:
+            self.logger.warning("Autosave failed: %s", exc)
+
+    def _on_content_reverted(self, tab: DocumentTab, edit_count: int) -> None:
+        # Edits undone back to the saved text: nothing needs recovering. Queued
+        # batches are dropped by the clear, or flushed next tick if newer
+        # edits arrived in the meantime.
+        if tab in self.tabs and edit_count == tab.edit_count:
+            self._set_dirty(tab, False)
+            self._clear_recovery(tab)
 
     def _check_recovery(self) -> None:
-        recovery_text, recovery_meta = get_recovery_paths()
-        if not recovery_text.exists():
-            return
-        if recovery_text.stat().st_size == 0:
-            self._clear_recovery()
+        from tkinter import messagebox
+
+        # Journals of tabs restored from the session are already in use.
+        in_use = {tab.doc_id for tab in self.tabs}
+        doc_ids = [doc_id for doc_id in list_recovery_ids() if doc_id not in in_use]
+        if not doc_ids:
             return
 
-        if messagebox.askyesno(
+        if not messagebox.askyesno(
             "Recovery",
-            "An autosave recovery file was found. Recover it?",
+            f"Autosave recovery data was found for {len(doc_ids)} document(s). "
+            "Recover it?",
         ):
-            try:
-                text, _ = read_text_file(recovery_text)
-                meta = {}
-                if recovery_meta.exists():
-                    meta = json.loads(recovery_meta.read_text(encoding="utf-8"))
-                self.text.delete("1.0", tk.END)
-                self.text.insert("1.0", text)
-                self.text.edit_reset()
-                path_value = meta.get("path")
-                if isinstance(path_value, str) and path_value:
-                    self._current_file = Path(path_value)
-                else:
-                    self._current_file = None
-                self._current_encoding = meta.get("encoding") or "utf-8"
-                self._set_dirty(True)
-                self._set_status("Recovery loaded. Please save your work.")
-            except (OSError, json.JSONDecodeError, TextIOError) as exc:
-                self._show_error("Recovery Error", str(exc))
-        else:
-            self._clear_recovery()
+            for doc_id in doc_ids:
+                journal = RecoveryJournal(*get_recovery_paths(doc_id))
+                journal.clear()
+                self._purge_journal(doc_id, journal)
+            return
+        initial = self.tab
+        with perf.span("app.recovery"):
+            recovered = [doc_id for doc_id in doc_ids if self._recover_document(doc_id)]
+        if recovered:
+            if initial.pristine:
+                self._remove_tab(initial)
+            self._set_status("Recovery loaded. Please save your work.")
+
+    def _recover_document(self, doc_id: str) -> bool:
+        tab = self._add_tab(doc_id)
+        try:
+            text, meta = tab.journal.recover()
+        except (OSError, json.JSONDecodeError, TextIOError) as exc:
+            # Keep the files so that a later version can still try.
+            self._remove_tab(tab)
+            self._show_error("Recovery Error", str(exc))
+            return False
+        tab.text.insert("1.0", text)
+        tab.history.reset()
+        tab.journal.discard_pending()
+        tab.saved_fingerprint = None
+        path_value = meta.get("path")
+        if isinstance(path_value, str) and path_value:
+            tab.path = Path(path_value)
+        tab.encoding = meta.get("encoding") or "utf-8"
+        tab.syntax.set_lexer(lexer_for(tab.path))
+        self._set_dirty(tab, True)
+        self._select_tab(tab)
+        return True
 
-    def _clear_recovery(self) -> None:
-        recovery_text, recovery_meta = get_recovery_paths()
-        for path in (recovery_text, recovery_meta):
-            try:
-                if path.exists():
-                    path.unlink()
-            except OSError:
-                pass
+    def _clear_recovery(self, tab: DocumentTab) -> None:
+        tab.journal.clear(tab.path)
+        self._purge_journal(tab.doc_id, tab.journal)
+
+    def _purge_journal(self, doc_id: str, journal: RecoveryJournal) -> None:
+        # Removing the files waits for a running flush, so it is queued behind
+        # the document's autosaves rather than done on the Tk thread.
+        self.io.submit(("autosave", doc_id), journal.purge)
 
     def _add_recent_file(self, path: Path) -> None:
         path_str = str(path)
         recent = [p for p in self.config.recent_files if p != path_str]
         recent.insert(0, path_str)
         self.config.recent_files = recent[:RECENT_LIMIT]
-        save_config(self.config)
+        self.config_store.mark_dirty()
         self._update_recent_menu()
 
     def _update_recent_menu(self) -> None:
@@ -626,28 +2055,188 @@ class TextEditorApp:
             self.config.recent_files = [
                 p for p in self.config.recent_files if p != path_str
             ]
-            save_config(self.config)
+            self.config_store.mark_dirty()
             self._update_recent_menu()
             return
-        if not self._confirm_discard():
-            return
-        self._set_status("Opening...")
-        threading.Thread(
-            target=self._load_file_thread, args=(path,), daemon=True
-        ).start()
+        self.open_path(path)
 
     def about(self) -> None:
+        from tkinter import messagebox
+
         messagebox.showinfo("About", "TkEditor\nA simple, modern Tkinter text editor.")
 
     def on_exit(self) -> None:
-        if not self._confirm_discard():
+        if self.config.restore_session:
+            if not all(self._keep_for_session(tab) for tab in list(self.tabs)):
+                return
+            self._save_session()
+        elif not all(self._confirm_discard(tab) for tab in list(self.tabs)):
             return
-        save_config(self.config)
+        for tab in self.tabs:
+            if tab.load_cancel is not None:
+                tab.load_cancel.set()
+            self._stop_follow(tab)
+            self._close_large_file(tab)
+        if self._find_in_files is not None:
+            self._find_in_files.close()
+        self._drain_io()
+        if self.stall_monitor is not None:
+            self.stall_monitor.stop()
+        if self._watcher is not None:
+            self._watcher.stop()
+        perf.recorder.log_summary()
+        try:
+            self.config_store.flush()
+        except OSError:
+            self.logger.exception("Could not save settings")
+        for tab in self.tabs:
+            tab.history.close()
         self.root.destroy()
 
+    def _restore_session(self) -> None:
+        """Reopen the tabs of the last session.
+
+        Only the active tab is read now; the others stay evicted until they
+        are first shown.
+        """
+        from .session import load_session
 
-def main() -> None:
+        if not self.config.restore_session or not self.tab.pristine:
+            return
+        session = load_session(get_session_path())
+        if session is None:
+            return
+        initial = self.tab
+        with perf.span("app.session_restore"):
+            restored = [self._add_session_tab(entry) for entry in session.documents]
+        tabs = [tab for tab in restored if tab is not None]
+        if not tabs:
+            return
+        active = tabs[0]
+        if 0 <= session.active < len(restored):
+            active = restored[session.active] or active
+        self._select_tab(active)
+        self._remove_tab(initial)
+
+    def _add_session_tab(self, entry: SessionDocument) -> DocumentTab | None:
+        path = Path(entry.path) if entry.path else None
+        unsaved = entry.unsaved_id
+        if (
+            unsaved is not None
+            and not RecoveryJournal(*get_recovery_paths(unsaved)).exists()
+        ):
+            unsaved = None
+        if unsaved is None and (path is None or not path.is_file()):
+            return None
+        tab = self._add_tab(unsaved)
+        tab.path = path
+        tab.encoding = entry.encoding
+        tab.view = (entry.cursor, entry.top)
+        tab.saved_fingerprint = None
+        tab.saved_stat = entry.stat
+        if unsaved is not None:
+            tab.evicted = tab.journal
+            tab.dirty = True
+        else:
+            tab.evicted = path
+        if path is not None and entry.stat is not None:
+            self.watcher.watch(path, entry.stat)
+        return tab
+
+    def _keep_for_session(self, tab: DocumentTab) -> bool:
+        """Write unsaved changes to the tab's journal for the next launch.
+
+        Falls back to asking about them if they could not be written.
+        """
+        if tab.replacing:
+            self._set_status("Please wait until Replace All has finished")
+            return False
+        if not tab.dirty or isinstance(tab.evicted, RecoveryJournal):
+            return True
+        if tab.journal.has_pending:
+            meta = {"path": str(tab.path) if tab.path else "", "encoding": tab.encoding}
+            tab.journal.queue_batch(self._tab_snapshot(tab), meta)
+            try:
+                tab.journal.flush()
+            except (OSError, TextIOError) as exc:
+                self.logger.warning("Could not keep unsaved changes: %s", exc)
+        return tab.journal.exists() or self._confirm_discard(tab)
+
+    def _save_session(self) -> None:
+        from .session import Session, SessionDocument, save_session
+
+        documents: list[SessionDocument] = []
+        active = 0
+        for tab in self.tabs:
+            if tab.pristine or (tab.path is None and not tab.dirty):
+                continue
+            if tab is self.tab:
+                active = len(documents)
+            cursor, top = tab.view
+            if tab.large_view is not None or tab.follow is not None:
+                # Positions in these views do not map onto the file.
+                cursor, top = "1.0", 0.0
+            elif tab.evicted is None and not tab.loading:
+                cursor, top = tab.text.index(tk.INSERT), tab.text.yview()[0]
+            documents.append(
+                SessionDocument(
+                    path=str(tab.path) if tab.path else None,
+                    encoding=tab.encoding,
+                    cursor=cursor,
+                    top=top,
+                    stat=tab.saved_stat,
+                    unsaved_id=tab.doc_id if tab.dirty else None,
+                )
+            )
+        try:
+            save_session(get_session_path(), Session(documents, active))
+        except (OSError, TextIOError):
+            self.logger.exception("Could not save the session")
+
+    def _drain_io(self) -> None:
+        self.io.close()
+        deadline = time.monotonic() + IO_DRAIN_SECONDS
+        # Workers report back through root.after, so keep the event loop
+        # turning while they finish.
+        while not self.io.drain(IO_DRAIN_POLL_SECONDS):
+            if time.monotonic() >= deadline:
+                self.logger.warning("Exiting with background file operations pending")
+                return
+            self.root.update()
+
+
+def main(argv: list[str] | None = None, started: float | None = None) -> None:
+    if getattr(sys, "frozen", False):
+        import multiprocessing
+
+        # Lets `tkeditor batch` worker processes start from a frozen build.
+        multiprocessing.freeze_support()
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["batch"]:
+        from .batch import main as batch_main
+
+        raise SystemExit(batch_main(argv[1:]))
+
+    parser = argparse.ArgumentParser(
+        prog="tkeditor",
+        description="TkEditor",
+        epilog="Run `tkeditor batch --help` for headless find/replace.",
+    )
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="print import and startup timings to stderr",
+    )
+    args = parser.parse_args(argv)
+
+    profile = StartupProfile(started) if args.startup_profile else None
+    if profile is not None and started is not None:
+        profile.mark("imports")
     root = tk.Tk()
-    app = TextEditorApp(root)
-    app._update_title()
+    if profile is not None:
+        profile.mark("Tk root")
+    TextEditorApp(root, profile=profile)
+    if profile is not None:
+        profile.mark("build window")
     root.mainloop()
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import argparse
+import codecs
+import difflib
+import fnmatch
+import itertools
+import os
+import re
+import sys
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from .io import TextIOError, TextStreamReader, iter_line_blocks, write_text_file
+from .search import compile_pattern, is_line_local, replace_text
+
+# Files above this size are rewritten line block by line block when the
+# pattern allows it, instead of being decoded into memory whole.
+STREAM_THRESHOLD = 8 * 1024 * 1024
+STREAM_CHUNK_SIZE = 256 * 1024
+BATCH_CHUNKSIZE = 16
+BOM_CHOICES = ("keep", "add", "remove")
+DEFAULT_EXCLUDES = (".git", ".hg", ".svn", "__pycache__")
+
+_HUNK_HEADER = re.compile(r"@@ -(\d+)(,\d+)? \+(\d+)(,\d+)? @@")
+_NATIVE_UTF16 = "utf-16-le" if sys.byteorder == "little" else "utf-16-be"
+_WITH_BOM = {"utf-8": "utf-8-sig", "utf-16-le": "utf-16", "utf-16-be": "utf-16"}
+_WITHOUT_BOM = {"utf-8-sig": "utf-8", "utf-16": _NATIVE_UTF16}
+
+
+@dataclass(frozen=True)
+class BatchOptions:
+    find: str | None = None
+    replacement: str = ""
+    regex: bool = False
+    encoding: str | None = None
+    bom: str = "keep"
+    dry_run: bool = False
+
+
+@dataclass(frozen=True)
+class FileResult:
+    path: str
+    status: str  # "changed", "unchanged", "skipped" or "error"
+    replacements: int = 0
+    source_encoding: str = ""
+    target_encoding: str = ""
+    diff: str = ""
+    message: str = ""
+
+
+def target_encoding(source: str, requested: str | None, bom: str) -> str:
+    """Encoding to write a file decoded as ``source`` with.
+
+    ``bom="keep"`` uses ``requested`` (or ``source``) as given; ``add`` and
+    ``remove`` switch between the BOM and BOM-less forms of UTF-8/UTF-16.
+    """
+    encoding = requested or source
+    name = codecs.lookup(encoding).name
+    if bom == "add":
+        return _WITH_BOM.get(name, encoding)
+    if bom == "remove":
+        return _WITHOUT_BOM.get(name, encoding)
+    return encoding
+
+
+def iter_files(
+    paths: Iterable[Path], include: Sequence[str] = (), exclude: Sequence[str] = ()
+) -> Iterator[Path]:
+    """Yield the files under ``paths`` whose names match the glob filters.
+
+    Files named explicitly are always yielded. In directories, names matching
+    ``exclude`` (files or directories) are skipped and, when ``include`` is
+    given, only files matching one of its patterns are kept.
+    """
+    excluded = (*DEFAULT_EXCLUDES, *exclude)
+    for path in paths:
+        if not path.is_dir():
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not _matches(d, excluded))
+            for name in sorted(files):
+                if _matches(name, excluded):
+                    continue
+                if include and not _matches(name, include):
+                    continue
+                yield Path(root, name)
+
+
+def _matches(name: str, patterns: Sequence[str]) -> bool:
+    return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+
+def process_file(path: str, options: BatchOptions) -> FileResult:
+    """Apply ``options`` to one file; never raises for per-file problems."""
+    try:
+        return _process(Path(path), options)
+    except (OSError, TextIOError, re.error) as exc:
+        return FileResult(path, "error", message=str(exc))
+
+
+def _process(path: Path, options: BatchOptions) -> FileResult:
+    try:
+        reader = TextStreamReader(path, STREAM_CHUNK_SIZE)
+    except TextIOError as exc:
+        return FileResult(str(path), "skipped", message=str(exc))
+    source = reader.encoding
+    target = target_encoding(source, options.encoding, options.bom)
+    reencode = not _same_codec(source, target)
+    pattern = compile_pattern(options.find, options.regex) if options.find else None
+
+    def replace(text: str) -> tuple[str, int]:
+        if pattern is None:
+            return text, 0
+        return replace_text(pattern, text, options.replacement, options.regex)
+
+    diff = ""
+    if reader.size > STREAM_THRESHOLD and _streamable(options):
+        # Two passes over the file: one to find out whether anything changes,
+        # one to write. Neither holds more than a block of lines in memory,
+        # so a dry run diffs block by block.
+        count = 0
+        edited = False
+        hunks: list[str] = []
+        old_line = new_line = 0
+        for block in iter_line_blocks(reader):
+            new_block, matches = replace(block)
+            count += matches
+            if new_block != block:
+                edited = True
+                if options.dry_run:
+                    hunks += _block_hunks(block, new_block, old_line, new_line)
+            old_line += block.count("\n")
+            new_line += new_block.count("\n")
+        changed = edited or reencode
+        if hunks:
+            diff = f"--- {path}\n+++ {path}\n" + "".join(hunks)
+        if changed and not options.dry_run:
+            blocks = iter_line_blocks(TextStreamReader(path, STREAM_CHUNK_SIZE))
+            write_text_file(path, (replace(block)[0] for block in blocks), target)
+    else:
+        text = "".join(reader)
+        new_text, count = replace(text)
+        changed = new_text != text or reencode
+        if changed and options.dry_run:
+            diff = _unified_diff(str(path), text, new_text)
+        elif changed:
+            write_text_file(path, new_text, target)
+    return FileResult(
+        str(path),
+        "changed" if changed else "unchanged",
+        replacements=count,
+        source_encoding=source,
+        target_encoding=target,
+        diff=diff,
+    )
+
+
+def _same_codec(first: str, second: str) -> bool:
+    return codecs.lookup(first).name == codecs.lookup(second).name
+
+
+def _unified_diff(path: str, old: str, new: str) -> str:
+    return "".join(
+        difflib.unified_diff(
+            old.splitlines(keepends=True),
+            new.splitlines(keepends=True),
+            fromfile=path,
+            tofile=path,
+        )
+    )
+
+
+def _block_hunks(old: str, new: str, old_line: int, new_line: int) -> list[str]:
+    """Unified diff hunks of one block that starts after the given lines.
+
+    Context stops at the edges of the block.
+    """
+    hunks = []
+    diff = difflib.unified_diff(
+        old.splitlines(keepends=True), new.splitlines(keepends=True)
+    )
+    for line in itertools.islice(diff, 2, None):  # skip the ---/+++ header
+        header = _HUNK_HEADER.match(line)
+        if header is not None:
+            old_start, old_count, new_start, new_count = header.groups()
+            line = (
+                f"@@ -{int(old_start) + old_line}{old_count or ''} "
+                f"+{int(new_start) + new_line}{new_count or ''} @@\n"
+            )
+        hunks.append(line)
+    return hunks
+
+
+def _streamable(options: BatchOptions) -> bool:
+    if not options.find:
+        return True
+    if not is_line_local(options.find, options.regex):
+        return False
+    # Empty matches would be found twice where two blocks meet.
+    return compile_pattern(options.find, options.regex).search("") is None
+
+
+def run_batch(
+    files: Iterable[Path], options: BatchOptions, jobs: int = 1
+) -> Iterator[FileResult]:
+    """Process ``files`` on ``jobs`` worker processes, yielding results in order."""
+    paths = (str(path) for path in files)
+    if jobs <= 1:
+        for path in paths:
+            yield process_file(path, options)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(
+            process_file, paths, itertools.repeat(options), chunksize=BATCH_CHUNKSIZE
+        )
+
+
+def _describe(result: FileResult, dry_run: bool) -> str:
+    details = []
+    if result.replacements:
+        details.append(f"{result.replacements} replacement(s)")
+    if not _same_codec(result.source_encoding, result.target_encoding):
+        details.append(f"{result.source_encoding} -> {result.target_encoding}")
+    verb = "would change" if dry_run else "changed"
+    suffix = f" ({', '.join(details)})" if details else ""
+    return f"{verb}: {result.path}{suffix}"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="tkeditor batch",
+        description="Find/replace and re-encode text files without the GUI.",
+    )
+    parser.add_argument("paths", nargs="+", type=Path, help="files or directories")
+    parser.add_argument("--find", help="text (or regex with --regex) to replace")
+    parser.add_argument("--replace", default="", help="replacement text")
+    parser.add_argument(
+        "--regex", action="store_true", help="treat --find as a regular expression"
+    )
+    parser.add_argument("--encoding", help="re-encode files to this encoding")
+    parser.add_argument(
+        "--bom",
+        choices=BOM_CHOICES,
+        default="keep",
+        help="add or remove UTF-8/UTF-16 byte order marks (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--include", action="append", default=[], help="only file names matching"
+    )
+    parser.add_argument(
+        "--exclude", action="append", default=[], help="skip names matching"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="print a diff instead of writing"
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="also list skipped files"
+    )
+    args = parser.parse_args(argv)
+
+    if not args.find and not args.encoding and args.bom == "keep":
+        parser.error("nothing to do: give --find, --encoding or --bom")
+    if args.find:
+        try:
+            compile_pattern(args.find, args.regex)
+        except re.error as exc:
+            parser.error(f"invalid pattern: {exc}")
+    if args.encoding:
+        try:
+            codecs.lookup(args.encoding)
+        except LookupError:
+            parser.error(f"unknown encoding: {args.encoding}")
+
+    options = BatchOptions(
+        find=args.find or None,
+        replacement=args.replace,
+        regex=args.regex,
+        encoding=args.encoding,
+        bom=args.bom,
+        dry_run=args.dry_run,
+    )
+    files = iter_files(args.paths, args.include, args.exclude)
+    totals: Counter[str] = Counter()
+    replacements = 0
+    for result in run_batch(files, options, args.jobs):
+        totals[result.status] += 1
+        if result.status == "changed":
+            replacements += result.replacements
+            print(_describe(result, args.dry_run))
+            sys.stdout.write(result.diff)
+        elif result.status == "error":
+            print(f"error: {result.path}: {result.message}", file=sys.stderr)
+        elif result.status == "skipped" and args.verbose:
+            print(f"skipped: {result.path}: {result.message}", file=sys.stderr)
+
+    print(
+        f"{sum(totals.values())} file(s): {totals['changed']} "
+        f"{'would change' if args.dry_run else 'changed'}, "
+        f"{totals['unchanged']} unchanged, {totals['skipped']} skipped, "
+        f"{totals['error']} error(s); {replacements} replacement(s)",
+        file=sys.stderr,
+    )
+    return 1 if totals["error"] else 0
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
 import platform
+import threading
+import uuid
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Any
@@ -11,9 +14,15 @@ from .io import atomic_write
 
 CONFIG_ENV = "TKEDITOR_CONFIG_DIR"
 CONFIG_FILE = "config.json"
+SESSION_FILE = "session.json"
+RECOVERY_DIR = "recovery"
+# Single recovery slot used before documents got one each.
 RECOVERY_TEXT = "recovery.txt"
 RECOVERY_META = "recovery.json"
+RECOVERY_JOURNAL = "recovery.journal"
 LOG_FILE = "tkeditor.log"
+LOG_FORMATS = ("text", "json")
+CONFIG_FLUSH_DELAY = 2.0
 
 
 @dataclass
@@ -24,6 +33,15 @@ class EditorConfig:
     autosave_enabled: bool = True
     autosave_interval: int = 30
     recent_files: list[str] = field(default_factory=list)
+    large_file_threshold: int = 64 * 1024 * 1024
+    undo_memory_limit: int = 64 * 1024 * 1024
+    undo_spill_limit: int = 512 * 1024 * 1024
+    log_format: str = "text"
+    tab_memory_budget: int = 256 * 1024 * 1024
+    auto_reload: bool = True
+    file_watch_interval: float = 2.0
+    follow_max_lines: int = 10_000
+    restore_session: bool = True
 
 
 def get_config_dir() -> Path:
@@ -49,9 +67,55 @@ def get_config_path() -> Path:
     return get_config_dir() / CONFIG_FILE
 
 
-def get_recovery_paths() -> tuple[Path, Path]:
+def get_session_path() -> Path:
+    return get_config_dir() / SESSION_FILE
+
+
+def get_recovery_dir() -> Path:
+    return get_config_dir() / RECOVERY_DIR
+
+
+def new_recovery_id() -> str:
+    return uuid.uuid4().hex
+
+
+def get_recovery_paths(doc_id: str) -> tuple[Path, Path, Path]:
+    """Checkpoint, metadata and journal paths of one document's autosave data."""
+    base = get_recovery_dir()
+    return base / f"{doc_id}.txt", base / f"{doc_id}.json", base / f"{doc_id}.journal"
+
+
+def list_recovery_ids() -> list[str]:
+    """Documents with autosave data, oldest first.
+
+    Data left in the old single recovery slot is first moved to a document
+    of its own.
+    """
+    _migrate_legacy_recovery()
+    found: dict[str, float] = {}
+    try:
+        for path in get_recovery_dir().iterdir():
+            if path.suffix in (".txt", ".json"):
+                mtime = path.stat().st_mtime
+                found[path.stem] = min(mtime, found.get(path.stem, mtime))
+    except OSError:
+        return []
+    return sorted(found, key=found.__getitem__)
+
+
+def _migrate_legacy_recovery() -> None:
     base = get_config_dir()
-    return base / RECOVERY_TEXT, base / RECOVERY_META
+    legacy = [base / RECOVERY_TEXT, base / RECOVERY_META, base / RECOVERY_JOURNAL]
+    if not any(path.exists() for path in legacy):
+        return
+    targets = get_recovery_paths(new_recovery_id())
+    try:
+        targets[0].parent.mkdir(parents=True, exist_ok=True)
+        for source, target in zip(legacy, targets, strict=True):
+            if source.exists():
+                source.replace(target)
+    except OSError:
+        logging.getLogger("tkeditor").exception("Could not move recovery data")
 
 
 def get_log_path() -> Path:
@@ -78,6 +142,65 @@ def save_config(config: EditorConfig) -> None:
     atomic_write(get_config_path(), payload, encoding="utf-8")
 
 
+class ConfigStore:
+    """Keeps ``EditorConfig`` in memory and persists it lazily.
+
+    ``mark_dirty`` schedules a write on a timer thread after ``delay``
+    seconds; further changes inside that window are written together.
+    ``flush`` writes pending changes immediately, e.g. on exit.
+    """
+
+    def __init__(self, config: EditorConfig, delay: float = CONFIG_FLUSH_DELAY) -> None:
+        self.config = config
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._timer: threading.Timer | None = None
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def mark_dirty(self) -> None:
+        with self._lock:
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Write the config now if it has unsaved changes."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self._write()
+
+    def _flush_from_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+        try:
+            self._write()
+        except OSError:
+            logging.getLogger("tkeditor").exception("Could not save settings")
+
+    def _write(self) -> None:
+        # Serialize writers so an older snapshot never lands last.
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                self._dirty = False
+            try:
+                save_config(self.config)
+            except OSError:
+                with self._lock:
+                    self._dirty = True
+                raise
+
+
 def _merge_config(defaults: EditorConfig, data: dict[str, Any]) -> EditorConfig:
     config = EditorConfig()
     config.theme = str(data.get("theme", defaults.theme))
@@ -89,6 +212,28 @@ def _merge_config(defaults: EditorConfig, data: dict[str, Any]) -> EditorConfig:
     config.autosave_interval = int(
         data.get("autosave_interval", defaults.autosave_interval)
     )
+    config.large_file_threshold = int(
+        data.get("large_file_threshold", defaults.large_file_threshold)
+    )
+    config.undo_memory_limit = int(
+        data.get("undo_memory_limit", defaults.undo_memory_limit)
+    )
+    config.undo_spill_limit = int(
+        data.get("undo_spill_limit", defaults.undo_spill_limit)
+    )
+    log_format = str(data.get("log_format", defaults.log_format))
+    config.log_format = log_format if log_format in LOG_FORMATS else "text"
+    config.tab_memory_budget = int(
+        data.get("tab_memory_budget", defaults.tab_memory_budget)
+    )
+    config.auto_reload = bool(data.get("auto_reload", defaults.auto_reload))
+    config.file_watch_interval = float(
+        data.get("file_watch_interval", defaults.file_watch_interval)
+    )
+    config.follow_max_lines = int(
+        data.get("follow_max_lines", defaults.follow_max_lines)
+    )
+    config.restore_session = bool(data.get("restore_session", defaults.restore_session))
     recent = data.get("recent_files", defaults.recent_files)
     if isinstance(recent, list):
         config.recent_files = [str(item) for item in recent]
@@ -0,0 +1,410 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
+from itertools import accumulate
+
+MAX_PIECE = 64 * 1024
+SMALL_PIECE = 1024
+COMPACT_PIECES = 8192
+# Pieces whose prefix sums a lookup first brings up to date; doubled each
+# time the piece it looks for is not among them.
+INDEX_STEP = 4
+# Newline positions kept for the pieces most recently looked up by line.
+NEWLINE_CACHE_POSITIONS = 256 * 1024
+
+# Characters outside the Basic Multilingual Plane take two Tk index columns.
+_ASTRAL = re.compile("[\U00010000-\U0010ffff]")
+
+# (source, start, length, newline count). Pieces are immutable so snapshots can
+# share them with the live table.
+Piece = tuple[str, int, int, int]
+
+
+def tk_length(text: str) -> int:
+    """Length of ``text`` in Tk 8.6 index columns (UTF-16 code units)."""
+    if text.isascii():
+        return len(text)
+    return len(text.encode("utf-16-le", "surrogatepass")) // 2
+
+
+def from_tk_length(text: str, columns: int) -> int:
+    """Number of characters at the start of ``text`` spanning ``columns``."""
+    if columns <= 0:
+        return 0
+    if text.isascii():
+        return min(columns, len(text))
+    units = text.encode("utf-16-le", "surrogatepass")[: 2 * columns]
+    return len(units.decode("utf-16-le", "surrogatepass"))
+
+
+@dataclass(frozen=True)
+class TextEdit:
+    """A single change: ``deleted`` was replaced by ``inserted`` at ``offset``."""
+
+    offset: int
+    deleted: str
+    inserted: str
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """Length and digest of a document's text, for cheap change checks.
+
+    Compare lengths first: most edits change the length, and only texts of
+    equal length need their digests compared.
+    """
+
+    length: int
+    digest: bytes
+
+
+class DocumentSnapshot:
+    """Immutable view of the document at one point in time."""
+
+    __slots__ = ("_pieces", "_length")
+
+    def __init__(self, pieces: tuple[Piece, ...], length: int) -> None:
+        self._pieces = pieces
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def iter_chunks(self) -> Iterator[str]:
+        """Yield the document text piece by piece without joining it."""
+        for source, start, length, _ in self._pieces:
+            yield source[start : start + length]
+
+    def text(self) -> str:
+        return "".join(self.iter_chunks())
+
+    def fingerprint(self) -> Fingerprint:
+        """Hash the text piece by piece; safe to call from a worker thread."""
+        digest = hashlib.blake2b(digest_size=16)
+        for chunk in self.iter_chunks():
+            digest.update(chunk.encode("utf-8", "surrogatepass"))
+        return Fingerprint(self._length, digest.digest())
+
+    def get(self, start: int, end: int) -> str:
+        parts = []
+        pos = 0
+        for source, piece_start, length, _ in self._pieces:
+            piece_end = pos + length
+            if piece_end > start and pos < end:
+                lo = max(start, pos) - pos
+                hi = min(end, piece_end) - pos
+                parts.append(source[piece_start + lo : piece_start + hi])
+            if piece_end >= end:
+                break
+            pos = piece_end
+        return "".join(parts)
+
+
+class PieceTable:
+    """Headless text buffer backed by a piece table.
+
+    Text is never copied on insert: pieces reference slices of the inserted
+    strings, and large inserts are split into pieces of at most ``MAX_PIECE``
+    characters so per-piece scans stay bounded. Offsets are character offsets
+    and lines/columns follow Tk conventions (1-based lines, 0-based columns
+    counted in Tk's units, where a character outside the BMP takes two).
+
+    Per-piece prefix sums of characters and newlines are only valid up to the
+    first piece changed since they were computed, and lookups extend them no
+    further than they need. Edits applied from the end of the document
+    towards its start, as Replace All does, therefore never recompute them.
+    """
+
+    def __init__(self, text: str = "") -> None:
+        self._pieces: list[Piece] = []
+        self._length = 0
+        self._newlines = 0
+        # Set once text outside the BMP is inserted; until then columns and
+        # character counts agree and need no conversion.
+        self._astral = False
+        # Aligned with _pieces; entries from _valid on are stale.
+        self._char_starts: list[int] = []
+        self._line_starts: list[int] = []
+        self._line_ends: list[int] = []
+        self._valid = 0
+        # (id(source), start, length) -> (source, newline positions in source)
+        self._newline_cache: OrderedDict[tuple[int, int, int], tuple[str, list[int]]]
+        self._newline_cache = OrderedDict()
+        self._cached_newlines = 0
+        self._compact_at = COMPACT_PIECES
+        if text:
+            self.insert(0, text)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def line_count(self) -> int:
+        return self._newlines + 1
+
+    def snapshot(self) -> DocumentSnapshot:
+        return DocumentSnapshot(tuple(self._pieces), self._length)
+
+    def text(self) -> str:
+        return self.snapshot().text()
+
+    def get(self, start: int, end: int) -> str:
+        return self.snapshot().get(start, end)
+
+    def reset(self, text: str = "") -> None:
+        self._set_pieces([])
+        self._length = 0
+        self._newlines = 0
+        self._astral = False
+        self._compact_at = COMPACT_PIECES
+        if text:
+            self.insert(0, text)
+
+    def insert(self, offset: int, text: str) -> None:
+        if not text:
+            return
+        offset = max(0, min(offset, self._length))
+        index = self._split_at(offset)
+        new_pieces = [
+            (text, start, end - start, text.count("\n", start, end))
+            for start in range(0, len(text), MAX_PIECE)
+            for end in (min(start + MAX_PIECE, len(text)),)
+        ]
+        if index > 0 and len(new_pieces) == 1:
+            merged = _merge_small(self._pieces[index - 1], new_pieces[0])
+            if merged is not None:
+                self._replace_pieces(index - 1, index, [merged])
+                new_pieces = []
+        self._replace_pieces(index, index, new_pieces)
+        self._length += len(text)
+        self._newlines += text.count("\n")
+        if not self._astral and not text.isascii():
+            self._astral = _ASTRAL.search(text) is not None
+        self._maybe_compact()
+
+    def delete(self, offset: int, length: int) -> str:
+        """Remove ``length`` characters at ``offset`` and return them."""
+        offset = max(0, min(offset, self._length))
+        length = max(0, min(length, self._length - offset))
+        if not length:
+            return ""
+        first = self._split_at(offset)
+        last = self._split_at(offset + length)
+        removed = self._pieces[first:last]
+        self._replace_pieces(first, last, [])
+        self._length -= length
+        self._newlines -= sum(piece[3] for piece in removed)
+        return "".join(
+            source[start : start + size] for source, start, size, _ in removed
+        )
+
+    def offset_of(self, line: int, column: int) -> int:
+        """Convert a Tk ``line.column`` position into a character offset."""
+        column = max(column, 0)
+        if line <= 1 or not self._pieces:
+            offset = 0
+        elif line - 1 > self._newlines:
+            return self._length
+        else:
+            newline = line - 1
+            index = self._piece_with_newline(newline)
+            piece = self._pieces[index]
+            positions = self._newline_positions(piece)
+            pos = positions[newline - self._line_starts[index] - 1]
+            offset = self._char_starts[index] + (pos - piece[1]) + 1
+        end = min(offset + column, self._length)
+        if self._astral and end > offset:
+            return offset + from_tk_length(self._slice(offset, end), column)
+        return end
+
+    def line_col(self, offset: int) -> tuple[int, int]:
+        """Convert a character offset into a Tk ``(line, column)`` pair."""
+        offset = max(0, min(offset, self._length))
+        if not self._pieces:
+            return 1, offset
+        index = self._piece_at(min(offset, self._length - 1))
+        source, start, length, _ = self._pieces[index]
+        inner = min(offset - self._char_starts[index], length)
+        line = self._line_starts[index] + source.count("\n", start, start + inner) + 1
+        line_start = self.offset_of(line, 0)
+        if self._astral:
+            return line, tk_length(self._slice(line_start, offset))
+        return line, offset - line_start
+
+    def _slice(self, start: int, end: int) -> str:
+        """Text between two offsets, without snapshotting every piece."""
+        if start >= end:
+            return ""
+        index = self._piece_at(start)
+        pos = self._char_starts[index]
+        parts = []
+        while pos < end:
+            source, piece_start, length, _ = self._pieces[index]
+            lo = max(start, pos) - pos
+            hi = min(end, pos + length) - pos
+            parts.append(source[piece_start + lo : piece_start + hi])
+            pos += length
+            index += 1
+        return "".join(parts)
+
+    def _split_at(self, offset: int) -> int:
+        """Ensure a piece boundary at ``offset`` and return its piece index."""
+        if offset >= self._length:
+            return len(self._pieces)
+        index = self._piece_at(offset)
+        inner = offset - self._char_starts[index]
+        if inner == 0:
+            return index
+        piece = source, start, length, count = self._pieces[index]
+        cached = self._newline_cache.get(_cache_key(piece))
+        if cached is not None and cached[0] is source:
+            # Splitting a piece must not cost a rescan of its newlines.
+            positions = cached[1]
+            left_count = bisect_left(positions, start + inner)
+            self._remember_newlines(
+                (source, start, inner, left_count), positions[:left_count]
+            )
+            self._remember_newlines(
+                (source, start + inner, length - inner, count - left_count),
+                positions[left_count:],
+            )
+        else:
+            left_count = source.count("\n", start, start + inner)
+        left = (source, start, inner, left_count)
+        right = (source, start + inner, length - inner, count - left_count)
+        self._replace_pieces(index, index + 1, [left, right])
+        return index + 1
+
+    def _piece_at(self, offset: int) -> int:
+        """Index of the piece holding the character at ``offset < len(self)``."""
+        step = INDEX_STEP
+        while True:
+            valid = self._valid
+            if valid:
+                last = self._pieces[valid - 1]
+                if offset < self._char_starts[valid - 1] + last[2]:
+                    return bisect_right(self._char_starts, offset, 0, valid) - 1
+            self._ensure_index(valid + step)
+            step *= 2
+
+    def _piece_with_newline(self, newline: int) -> int:
+        """Index of the piece holding newline number ``newline`` (from 1)."""
+        step = INDEX_STEP
+        index = bisect_left(self._line_ends, newline, 0, self._valid)
+        while index == self._valid:
+            self._ensure_index(self._valid + step)
+            step *= 2
+            index = bisect_left(self._line_ends, newline, index, self._valid)
+        return index
+
+    def _ensure_index(self, stop: int) -> None:
+        """Recompute the prefix sums of the pieces before ``stop``."""
+        lo = self._valid
+        stop = min(stop, len(self._pieces))
+        if stop <= lo:
+            return
+        chars = lines = 0
+        if lo:
+            chars = self._char_starts[lo - 1] + self._pieces[lo - 1][2]
+            lines = self._line_ends[lo - 1]
+        pieces = self._pieces[lo:stop]
+        self._char_starts[lo:stop] = accumulate(
+            (piece[2] for piece in pieces[:-1]), initial=chars
+        )
+        ends = list(accumulate(piece[3] for piece in pieces))
+        self._line_ends[lo:stop] = [lines + end for end in ends]
+        self._line_starts[lo:stop] = [lines] + self._line_ends[lo : stop - 1]
+        self._valid = stop
+
+    def _replace_pieces(self, lo: int, hi: int, pieces: list[Piece]) -> None:
+        for piece in self._pieces[lo:hi]:
+            self._forget_newlines(piece)
+        self._pieces[lo:hi] = pieces
+        # Keep the prefix sums aligned; they are recomputed on demand.
+        filler = [0] * len(pieces)
+        self._char_starts[lo:hi] = filler
+        self._line_starts[lo:hi] = filler
+        self._line_ends[lo:hi] = filler
+        self._valid = min(self._valid, lo)
+
+    def _set_pieces(self, pieces: list[Piece]) -> None:
+        self._pieces = pieces
+        self._char_starts = [0] * len(pieces)
+        self._line_starts = [0] * len(pieces)
+        self._line_ends = [0] * len(pieces)
+        self._valid = 0
+        self._newline_cache.clear()
+        self._cached_newlines = 0
+
+    def _newline_positions(self, piece: Piece) -> list[int]:
+        """Positions in its source of the newlines in ``piece``."""
+        cached = self._newline_cache.get(_cache_key(piece))
+        if cached is not None and cached[0] is piece[0]:
+            self._newline_cache.move_to_end(_cache_key(piece))
+            return cached[1]
+        source, start, _, count = piece
+        positions = []
+        pos = start - 1
+        for _ in range(count):
+            pos = source.find("\n", pos + 1)
+            positions.append(pos)
+        self._remember_newlines(piece, positions)
+        return positions
+
+    def _remember_newlines(self, piece: Piece, positions: list[int]) -> None:
+        self._forget_newlines(piece)
+        self._newline_cache[_cache_key(piece)] = (piece[0], positions)
+        self._cached_newlines += len(positions)
+        while self._cached_newlines > NEWLINE_CACHE_POSITIONS:
+            _, (_, oldest) = self._newline_cache.popitem(last=False)
+            self._cached_newlines -= len(oldest)
+
+    def _forget_newlines(self, piece: Piece) -> None:
+        cached = self._newline_cache.pop(_cache_key(piece), None)
+        if cached is not None:
+            self._cached_newlines -= len(cached[1])
+
+    def _maybe_compact(self) -> None:
+        if len(self._pieces) <= self._compact_at:
+            return
+        compacted: list[Piece] = []
+        run: list[Piece] = []
+        run_length = 0
+        for piece in self._pieces:
+            if piece[2] < SMALL_PIECE and run_length + piece[2] <= MAX_PIECE:
+                run.append(piece)
+                run_length += piece[2]
+                continue
+            if run:
+                compacted.append(_join_pieces(run))
+            run, run_length = ([piece], piece[2]) if piece[2] < SMALL_PIECE else ([], 0)
+            if not run:
+                compacted.append(piece)
+        if run:
+            compacted.append(_join_pieces(run))
+        self._set_pieces(compacted)
+        if len(compacted) * 2 > self._compact_at:
+            self._compact_at *= 2
+
+
+def _cache_key(piece: Piece) -> tuple[int, int, int]:
+    return id(piece[0]), piece[1], piece[2]
+
+
+def _merge_small(left: Piece, right: Piece) -> Piece | None:
+    """Join two adjacent pieces if the result is still short, as when typing."""
+    if left[2] + right[2] > SMALL_PIECE:
+        return None
+    return _join_pieces([left, right])
+
+
+def _join_pieces(pieces: list[Piece]) -> Piece:
+    if len(pieces) == 1:
+        return pieces[0]
+    text = "".join(source[start : start + size] for source, start, size, _ in pieces)
+    return text, 0, len(text), sum(piece[3] for piece in pieces)
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import os
+import queue
+import re
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+
+from .batch import iter_files
+from .document import tk_length
+from .io import TextIOError, TextStreamReader, iter_line_blocks
+from .search import compile_pattern, is_line_local
+
+FILES_PER_TASK = 64
+TASKS_PER_WORKER = 2
+MAX_HITS_PER_FILE = 500
+PREVIEW_CHARS = 200
+WAIT_SECONDS = 0.1
+
+# (line number, Tk column, line text)
+Hit = tuple[int, int, str]
+
+
+@dataclass(frozen=True)
+class FileHits:
+    path: str
+    hits: list[Hit]
+
+
+def search_files(
+    paths: Sequence[str], query: str, use_regex: bool
+) -> tuple[int, list[FileHits]]:
+    """Search ``paths`` and return how many were scanned and those with hits.
+
+    Binary files, unreadable files and files that fail to decode are skipped.
+    """
+    pattern = compile_pattern(query, use_regex)
+    line_local = is_line_local(query, use_regex)
+    found = []
+    for path in paths:
+        try:
+            hits = search_file(Path(path), pattern, line_local)
+        except (OSError, TextIOError):
+            continue
+        if hits:
+            found.append(FileHits(path, hits))
+    return len(paths), found
+
+
+def search_file(path: Path, pattern: re.Pattern[str], line_local: bool) -> list[Hit]:
+    """Return the first match on each matching line, up to a per-file limit.
+
+    With a line-local pattern the file is scanned in blocks of whole lines;
+    otherwise it is decoded in full so matches may span lines.
+    """
+    reader = TextStreamReader(path)
+    blocks: Iterable[str] = (
+        iter_line_blocks(reader) if line_local else ["".join(reader)]
+    )
+    hits: list[Hit] = []
+    line = 1
+    for block in blocks:
+        _collect_hits(block, pattern, line, hits)
+        if len(hits) >= MAX_HITS_PER_FILE:
+            del hits[MAX_HITS_PER_FILE:]
+            break
+        line += block.count("\n")
+    return hits
+
+
+def _collect_hits(
+    text: str, pattern: re.Pattern[str], first_line: int, hits: list[Hit]
+) -> None:
+    line = first_line
+    line_start = 0
+    scanned = 0
+    last_line = 0
+    for match in pattern.finditer(text):
+        start = match.start()
+        newlines = text.count("\n", scanned, start)
+        if newlines:
+            line += newlines
+            line_start = text.rfind("\n", scanned, start) + 1
+        scanned = start
+        if line == last_line:
+            continue
+        last_line = line
+        line_end = text.find("\n", start)
+        preview = text[line_start : line_end if line_end >= 0 else len(text)]
+        hits.append(
+            (
+                line,
+                tk_length(text[line_start:start]),
+                preview[:PREVIEW_CHARS].rstrip("\r"),
+            )
+        )
+        if len(hits) >= MAX_HITS_PER_FILE:
+            return
+
+
+class FileSearch:
+    """Scan a directory tree for a query on a pool of worker processes.
+
+    Files are listed lazily and sent to the workers in batches, with only a
+    few batches in flight, so memory stays flat on very large trees. Results
+    arrive on ``results`` as ``FileHits`` in completion order, followed by
+    ``None`` once the scan has finished or been cancelled.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        query: str,
+        use_regex: bool,
+        include: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+        jobs: int | None = None,
+    ) -> None:
+        self.root = root
+        self.query = query
+        self.use_regex = use_regex
+        self.include = include
+        self.exclude = exclude
+        self.jobs = jobs or os.cpu_count() or 1
+        self.results: queue.Queue[FileHits | None] = queue.Queue()
+        self.files_scanned = 0
+        self._cancel = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="tkeditor-find-in-files", daemon=True
+        )
+        self._thread.start()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def _run(self) -> None:
+        # Workers are spawned rather than forked: the GUI process has Tk and
+        # other threads running, which a forked child must not inherit.
+        context = multiprocessing.get_context("spawn")
+        try:
+            with ProcessPoolExecutor(self.jobs, mp_context=context) as pool:
+                self._scan(pool)
+                if self.cancelled:
+                    pool.shutdown(wait=False, cancel_futures=True)
+        finally:
+            self.results.put(None)
+
+    def _scan(self, pool: ProcessPoolExecutor) -> None:
+        files = iter_files([self.root], self.include, self.exclude)
+        pending: set[Future[tuple[int, list[FileHits]]]] = set()
+        limit = self.jobs * TASKS_PER_WORKER
+        for batch in _batched((str(path) for path in files), FILES_PER_TASK):
+            while len(pending) >= limit and not self.cancelled:
+                pending = self._collect(pending)
+            if self.cancelled:
+                return
+            pending.add(pool.submit(search_files, batch, self.query, self.use_regex))
+        while pending and not self.cancelled:
+            pending = self._collect(pending)
+
+    def _collect(
+        self, pending: set[Future[tuple[int, list[FileHits]]]]
+    ) -> set[Future[tuple[int, list[FileHits]]]]:
+        done, remaining = wait(pending, WAIT_SECONDS, return_when=FIRST_COMPLETED)
+        for future in done:
+            scanned, found = future.result()
+            self.files_scanned += scanned
+            for file_hits in found:
+                self.results.put(file_hits)
+        return remaining
+
+
+def _batched(items: Iterable[str], size: int) -> Iterator[list[str]]:
+    iterator = iter(items)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
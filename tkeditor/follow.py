@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import codecs
+import os
+from pathlib import Path
+
+from .io import TextIOError, detect_encoding, read_samples
+
+# How far back from the end of the file following starts.
+TAIL_START_BYTES = 1024 * 1024
+# Most bytes decoded by one ``read``; a bigger burst is picked up next time.
+TAIL_READ_BYTES = 4 * 1024 * 1024
+_CHUNK_SIZE = 256 * 1024
+_LINE_SEARCH_BYTES = 64 * 1024
+
+
+class LogTail:
+    """Decode what is appended to a growing file, like ``tail -F``.
+
+    Reading starts about ``start_bytes`` before the end of the file, at the
+    beginning of a line. Each ``read`` then decodes only the bytes appended
+    since the previous one. A file that shrinks or is replaced by a new one
+    (log rotation) is read again from its beginning.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        encoding: str | None = None,
+        start_bytes: int = TAIL_START_BYTES,
+    ) -> None:
+        if encoding is None:
+            guess = detect_encoding(read_samples(path))
+            if guess.binary:
+                raise TextIOError("File appears to be binary or non-text.")
+            encoding = guess.encoding
+        stat = path.stat()
+        self.path = path
+        self.encoding = encoding
+        self.offset = 0
+        self._inode = stat.st_ino
+        # Bad bytes in a log should not stop following it.
+        self._decoder = codecs.getincrementaldecoder(encoding)("replace")
+        # Wide encodings have no byte-sized line breaks to resume at.
+        wide = codecs.lookup(encoding).name.startswith(("utf-16", "utf-32"))
+        if stat.st_size > start_bytes and not wide:
+            self.offset = self._next_line(stat.st_size - start_bytes)
+
+    def read(self, max_bytes: int = TAIL_READ_BYTES) -> tuple[str, bool]:
+        """Text appended since the last call, and whether reading restarted.
+
+        A missing file (between a rotation's rename and re-creation) reads
+        as no new text.
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return "", False
+        restarted = stat.st_ino != self._inode or stat.st_size < self.offset
+        if restarted:
+            self._inode = stat.st_ino
+            self.offset = 0
+            self._decoder.reset()
+        if stat.st_size == self.offset:
+            return "", restarted
+        parts = []
+        with self.path.open("rb") as handle:
+            handle.seek(self.offset)
+            remaining = max_bytes
+            while remaining > 0:
+                data = handle.read(min(_CHUNK_SIZE, remaining))
+                if not data:
+                    break
+                self.offset += len(data)
+                remaining -= len(data)
+                parts.append(self._decoder.decode(data))
+        return "".join(parts), restarted
+
+    def _next_line(self, offset: int) -> int:
+        with self.path.open("rb") as handle:
+            handle.seek(offset)
+            data = handle.read(_LINE_SEARCH_BYTES)
+        cut = data.find(b"\n")
+        return offset + cut + 1 if cut >= 0 else offset
+
+
+def keep_last_lines(text: str, count: int) -> str:
+    """The last ``count`` lines of ``text``; all of it when ``count`` is 0."""
+    if count <= 0:
+        return text
+    cut = len(text) - 1 if text.endswith("\n") else len(text)
+    for _ in range(count):
+        cut = text.rfind("\n", 0, cut)
+        if cut < 0:
+            return text
+    return text[cut + 1 :]
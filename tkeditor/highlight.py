@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import bisect
+import re
+from collections.abc import Callable, Mapping, Sequence
+from pathlib import Path
+from typing import ClassVar
+
+# (start column, end column, kind)
+Token = tuple[int, int, str]
+# A lexer rule: regex, token kind (None to skip the match) and the state to
+# switch to, which also ends the line (None keeps the current state).
+Rule = tuple[str, str | None, int | None]
+
+TOKEN_KINDS = (
+    "keyword",
+    "string",
+    "comment",
+    "number",
+    "constant",
+    "key",
+    "decorator",
+    "warning",
+    "error",
+)
+# Start state of a line that has not been lexed since it was inserted.
+UNKNOWN = -1
+
+
+class Lexer:
+    """Line-at-a-time regex lexer.
+
+    State 0 is the normal state; other states mean a construct (such as a
+    triple-quoted string) is still open at the end of the line, and
+    ``continuations`` gives the regex that closes it.
+    """
+
+    rules: ClassVar[Sequence[Rule]] = ()
+    continuations: ClassVar[Mapping[int, tuple[str, str]]] = {}
+
+    def __init__(self) -> None:
+        self._master = re.compile(
+            "|".join(f"(?P<t{i}>{rule[0]})" for i, rule in enumerate(self.rules))
+        )
+        # Indexed by group number; every rule is exactly one capturing group.
+        self._actions = [(None, None)] + [
+            (kind, state) for _, kind, state in self.rules
+        ]
+        self._continue = {
+            state: (re.compile(regex), kind)
+            for state, (regex, kind) in self.continuations.items()
+        }
+
+    def lex_line(self, line: str, state: int = 0) -> tuple[list[Token], int]:
+        """Tokens of ``line`` and the state at its end."""
+        tokens: list[Token] = []
+        pos = 0
+        if state > 0:
+            closing, open_kind = self._continue[state]
+            match = closing.match(line)
+            if match is None:
+                return ([(0, len(line), open_kind)] if line else []), state
+            pos = match.end()
+            if pos:
+                tokens.append((0, pos, open_kind))
+            state = 0
+        for match in self._master.finditer(line, pos):
+            kind, next_state = self._actions[match.lastindex or 0]
+            if kind is not None:
+                tokens.append((match.start(), match.end(), kind))
+            if next_state is not None:
+                state = next_state
+                break
+        return tokens, state
+
+
+_PY_KEYWORDS = (
+    "and as assert async await break case class continue def del elif else except "
+    "finally for from global if import in is lambda match nonlocal not or pass "
+    "raise return try while with yield"
+)
+_PY_PREFIX = r"(?:\b[rRbBuUfF]{1,2})?"
+
+
+class PythonLexer(Lexer):
+    continuations = {
+        1: (r"(?:[^'\\]|\\.|'(?!''))*'''", "string"),
+        2: (r'(?:[^"\\]|\\.|"(?!""))*"""', "string"),
+    }
+    rules = (
+        (r"#.*", "comment", None),
+        (_PY_PREFIX + r"'''(?:[^'\\]|\\.|'(?!''))*'''", "string", None),
+        (_PY_PREFIX + r'"""(?:[^"\\]|\\.|"(?!""))*"""', "string", None),
+        (_PY_PREFIX + r"'''.*", "string", 1),
+        (_PY_PREFIX + r'""".*', "string", 2),
+        (_PY_PREFIX + r"'(?:[^'\\]|\\.)*'?", "string", None),
+        (_PY_PREFIX + r'"(?:[^"\\]|\\.)*"?', "string", None),
+        (r"(?<![\w)\]])@[\w.]+", "decorator", None),
+        (r"\b(?:" + "|".join(_PY_KEYWORDS.split()) + r")\b", "keyword", None),
+        (r"\b(?:True|False|None)\b", "constant", None),
+        (r"\b0[xXoObB][\da-fA-F_]+\b", "number", None),
+        (r"\b\d[\d_]*(?:\.[\d_]*)?(?:[eE][+-]?\d+)?[jJ]?\b", "number", None),
+        (r"\w+", None, None),
+    )
+
+
+class JsonLexer(Lexer):
+    rules = (
+        (r'"(?:[^"\\]|\\.)*"(?=\s*:)', "key", None),
+        (r'"(?:[^"\\]|\\.)*"?', "string", None),
+        (r"-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b", "number", None),
+        (r"\b(?:true|false|null)\b", "constant", None),
+    )
+
+
+class YamlLexer(Lexer):
+    rules = (
+        (r"(?<!\S)#.*", "comment", None),
+        (r"^(?:---|\.\.\.)(?=\s|$)", "keyword", None),
+        (r'"(?:[^"\\]|\\.)*"?', "string", None),
+        (r"'(?:[^']|'')*'?", "string", None),
+        (r"[^\s\-?:,\[\]{}#&*!|>'\"%@`][^:#]*?(?=\s*:(?:\s|$))", "key", None),
+        (r"[&*][\w-]+", "decorator", None),
+        (r"!\S*", "decorator", None),
+        (
+            r"(?<![\w.-])(?:true|false|yes|no|on|off|null|True|False|Yes|No|"
+            r"TRUE|FALSE|Null|NULL|~)(?![\w.-])",
+            "constant",
+            None,
+        ),
+        (
+            r"(?<![\w.-])[-+]?(?:\d[\d_]*(?:\.\d*)?(?:[eE][-+]?\d+)?|\.inf|\.nan)"
+            r"(?![\w.:-])",
+            "number",
+            None,
+        ),
+    )
+
+
+class LogLexer(Lexer):
+    rules = (
+        (
+            r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?"
+            r"(?:Z|[+-]\d{2}:?\d{2})?",
+            "comment",
+            None,
+        ),
+        (r"\b\d{2}:\d{2}:\d{2}(?:[.,]\d+)?\b", "comment", None),
+        (r"\b(?:ERROR|FATAL|CRITICAL|SEVERE|EXCEPTION|Traceback)\b", "error", None),
+        (r"\b(?:WARN|WARNING)\b", "warning", None),
+        (r"\b(?:INFO|DEBUG|TRACE|NOTICE)\b", "keyword", None),
+        (r'"[^"]*"', "string", None),
+        (r"\b\d+(?:\.\d+)*\b", "number", None),
+    )
+
+
+_LEXERS: dict[str, type[Lexer]] = {
+    ".py": PythonLexer,
+    ".pyw": PythonLexer,
+    ".json": JsonLexer,
+    ".yaml": YamlLexer,
+    ".yml": YamlLexer,
+    ".log": LogLexer,
+}
+_instances: dict[type[Lexer], Lexer] = {}
+
+
+def lexer_for(path: Path | None) -> Lexer | None:
+    """Lexer for the file type of ``path``, or None if it is not highlighted."""
+    if path is None:
+        return None
+    cls = _LEXERS.get(path.suffix.lower())
+    if cls is None:
+        return None
+    # Compiled once, on first use.
+    lexer = _instances.get(cls)
+    if lexer is None:
+        lexer = _instances[cls] = cls()
+    return lexer
+
+
+class LineStates:
+    """Lexer state at the start of each line, plus the lines still to lex.
+
+    After an edit only the edited lines are marked dirty; ``relex`` lexes
+    forward from them until a line ends in the state already recorded for
+    the next one, at which point the rest of the file is known to be
+    unaffected.
+    """
+
+    def __init__(self, lexer: Lexer, line_count: int) -> None:
+        self.lexer = lexer
+        self.states = [0] + [UNKNOWN] * (max(line_count, 1) - 1)
+        # Sorted 0-based line numbers whose tokens (and so end state) may
+        # have changed; the start state of the first one is always valid.
+        self.dirty = [0]
+
+    def copy(self) -> LineStates:
+        other = LineStates.__new__(LineStates)
+        other.lexer = self.lexer
+        other.states = list(self.states)
+        other.dirty = list(self.dirty)
+        return other
+
+    def edit(self, line: int, removed: int, added: int) -> None:
+        """Lines ``line`` to ``line + removed`` became ``line + added``."""
+        self.states[line + 1 : line + 1 + removed] = [UNKNOWN] * added
+        low = bisect.bisect_right(self.dirty, line)
+        high = bisect.bisect_right(self.dirty, line + removed)
+        shift = added - removed
+        if not shift:
+            # Nothing after the edit moves; leave the rest of the list alone.
+            del self.dirty[low:high]
+            if not (low and self.dirty[low - 1] == line):
+                self.dirty.insert(low, line)
+            return
+        self.dirty[low:] = [line] + [d + shift for d in self.dirty[high:]]
+        if low and self.dirty[low - 1] == line:
+            del self.dirty[low]
+
+    def restart(self, line: int, line_count: int) -> None:
+        """Forget every state after ``line``, where a bulk change began.
+
+        The document has ``line_count`` lines after the change.
+        """
+        line = min(line, len(self.states) - 1, max(line_count, 1) - 1)
+        self.states[line + 1 :] = [UNKNOWN] * (max(line_count, 1) - line - 1)
+        del self.dirty[bisect.bisect_left(self.dirty, line) :]
+        self.dirty.append(line)
+
+    def relex(self, get_line: Callable[[int], str], budget: int) -> int:
+        """Lex dirty lines, at most ``budget`` of them; return the last one lexed.
+
+        Lines left over are kept in ``dirty`` for the next call.
+        """
+        last = -1
+        count = len(self.states)
+        while self.dirty and budget > 0:
+            line = self.dirty.pop(0)
+            state = max(self.states[line], 0)
+            while True:
+                _, state = self.lexer.lex_line(get_line(line), state)
+                budget -= 1
+                last = line
+                line += 1
+                if line >= count:
+                    break
+                if self.dirty and self.dirty[0] == line:
+                    self.dirty.pop(0)
+                elif self.states[line] == state:
+                    break
+                self.states[line] = state
+                if budget <= 0:
+                    bisect.insort(self.dirty, line)
+                    break
+        return last
@@ -1,31 +1,131 @@
 from __future__ import annotations
 
+import codecs
 import contextlib
 import os
+import stat
 import tempfile
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
 from pathlib import Path
 
+from .perf import timed
+
+STREAM_CHUNK_SIZE = 256 * 1024
+WRITE_CHUNK_SIZE = 256 * 1024
+SAMPLE_SIZE = 64 * 1024
+
+ENCODING_CHOICES = [
+    "utf-8",
+    "utf-8-sig",
+    "utf-16",
+    "utf-16-le",
+    "utf-16-be",
+    "iso-8859-1",
+    "cp1252",
+    "ascii",
+]
+
+# Control bytes that do not normally occur in text; tab, newlines, form feed,
+# backspace and escape are allowed.
+_CONTROL_BYTES = bytes(set(range(32)) - {8, 9, 10, 12, 13, 27})
+# Bytes that cp1252 leaves undefined; their presence points to iso-8859-1.
+_CP1252_UNDEFINED = b"\x81\x8d\x8f\x90\x9d"
+_CP1252_PUNCTUATION = set("€‚ƒ„…†‡ˆ‰Š‹ŒŽ‘’“”•–—˜™š›œžŸ")
+
 
 class TextIOError(Exception):
     """Raised when a file cannot be processed as text."""
 
 
-def read_text_file(path: Path) -> tuple[str, str]:
-    """Read a text file and return content plus detected encoding."""
-    data = path.read_bytes()
-    if is_binary_bytes(data):
-        raise TextIOError("File appears to be binary or non-text.")
+@dataclass(frozen=True)
+class EncodingGuess:
+    """Result of ``detect_encoding``; ``confidence`` ranges from 0 to 1."""
 
-    encoding = sniff_encoding(data)
-    try:
-        text = data.decode(encoding)
-    except UnicodeDecodeError as exc:
-        raise TextIOError("Unable to decode file with detected encoding.") from exc
+    encoding: str
+    confidence: float
+    binary: bool = False
+
+
+class TextStreamReader:
+    """Incrementally decode a text file in bounded chunks.
+
+    The encoding is detected up front from a bounded sample, so ``encoding``
+    is valid before the first chunk is produced; the full decode while
+    iterating verifies it. ``bytes_read`` and ``size`` can be used to report
+    progress while iterating. Passing ``encoding`` overrides the detected
+    one, for re-reading a file whose codec is already known.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        encoding: str | None = None,
+    ) -> None:
+        self.path = path
+        self.chunk_size = chunk_size
+        self.size = path.stat().st_size
+        self.bytes_read = 0
+        self.guess = detect_encoding(read_samples(path))
+        self.encoding = encoding or self.guess.encoding
+        # NUL bytes are expected in UTF-16 text.
+        if self.guess.binary and not self.encoding.startswith("utf-16"):
+            raise TextIOError("File appears to be binary or non-text.")
 
-    return text, encoding
+    def __iter__(self) -> Iterator[str]:
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        check_binary = not self.encoding.startswith("utf-16")
+        with self.path.open("rb") as handle:
+            while True:
+                data = handle.read(self.chunk_size)
+                if not data:
+                    break
+                if check_binary and is_binary_bytes(data):
+                    raise TextIOError("File appears to be binary or non-text.")
+                self.bytes_read += len(data)
+                text = self._decode(decoder, data, final=False)
+                if text:
+                    yield text
+        tail = self._decode(decoder, b"", final=True)
+        if tail:
+            yield tail
 
+    @staticmethod
+    def _decode(decoder: codecs.IncrementalDecoder, data: bytes, final: bool) -> str:
+        try:
+            return decoder.decode(data, final)
+        except UnicodeDecodeError as exc:
+            raise TextIOError("Unable to decode file with detected encoding.") from exc
 
-def write_text_file(path: Path, text: str, encoding: str) -> None:
+
+@timed("io.read_text_file")
+def read_text_file(path: Path, encoding: str | None = None) -> tuple[str, str]:
+    """Read a text file and return content plus detected encoding.
+
+    A known ``encoding`` is used instead of the detected one.
+    """
+    reader = TextStreamReader(path, encoding=encoding)
+    text = "".join(reader)
+    return text, reader.encoding
+
+
+def iter_line_blocks(chunks: Iterable[str]) -> Iterator[str]:
+    """Regroup decoded chunks into blocks that end at a line break."""
+    pending: list[str] = []
+    for chunk in chunks:
+        cut = chunk.rfind("\n") + 1
+        if not cut:
+            pending.append(chunk)
+            continue
+        pending.append(chunk[:cut])
+        yield "".join(pending)
+        pending = [chunk[cut:]] if cut < len(chunk) else []
+    if pending:
+        yield "".join(pending)
+
+
+def write_text_file(path: Path, text: str | Iterable[str], encoding: str) -> None:
     """Write text to a file using an atomic write strategy."""
     atomic_write(path, text, encoding)
 
@@ -44,8 +144,118 @@ def is_binary_bytes(data: bytes) -> bool:
     return b"\x00" in data
 
 
-def atomic_write(path: Path, text: str, encoding: str = "utf-8") -> None:
-    """Atomically write text to path using a temp file and replace."""
+@timed("io.read_samples")
+def read_samples(path: Path, sample_size: int = SAMPLE_SIZE) -> list[bytes]:
+    """Read up to three samples (head, middle, tail) of ``path``.
+
+    Samples are aligned to four bytes so UTF-16 code units are not split, and
+    the total read is bounded by ``3 * sample_size`` whatever the file size.
+    """
+    with path.open("rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size <= 3 * sample_size:
+            return [handle.read()]
+        samples = []
+        for start in (0, size // 2, size - sample_size):
+            handle.seek(start - start % 4)
+            samples.append(handle.read(sample_size))
+        return samples
+
+
+@timed("io.detect_encoding")
+def detect_encoding(samples: Sequence[bytes]) -> EncodingGuess:
+    """Guess the encoding of a file from ``read_samples`` output.
+
+    BOMs are trusted outright. Otherwise UTF-16 is recognised by the pattern
+    of NUL bytes, other NULs or control bytes mark the file as binary, and
+    text that is not valid UTF-8 is assigned to cp1252 or iso-8859-1 using
+    byte-frequency heuristics.
+    """
+    head = samples[0] if samples else b""
+    bom = sniff_encoding(head)
+    if bom != "utf-8":
+        return EncodingGuess(bom, 1.0)
+    data = b"".join(samples)
+    if not data:
+        return EncodingGuess("utf-8", 1.0)
+
+    utf16 = _guess_utf16(data)
+    if utf16 is not None:
+        return utf16
+    if is_binary_bytes(data):
+        return EncodingGuess("utf-8", 1.0, binary=True)
+    if _control_count(data) * 10 > len(data):
+        return EncodingGuess("utf-8", 0.9, binary=True)
+
+    if data.isascii():
+        return EncodingGuess("utf-8", 1.0)
+    if all(_is_utf8_sample(sample, i > 0) for i, sample in enumerate(samples)):
+        return EncodingGuess("utf-8", 0.99)
+    return _guess_single_byte(data)
+
+
+def _guess_utf16(data: bytes) -> EncodingGuess | None:
+    pairs = len(data) // 2
+    if pairs < 2:
+        return None
+    even_nuls = data[0::2].count(0)
+    odd_nuls = data[1::2].count(0)
+    # Mostly-Latin UTF-16 has a NUL in one half of nearly every code unit
+    # and almost none in the other half.
+    for encoding, nuls, other in (
+        ("utf-16-le", odd_nuls, even_nuls),
+        ("utf-16-be", even_nuls, odd_nuls),
+    ):
+        if nuls * 10 >= pairs * 3 and other * 20 <= pairs:
+            try:
+                text = data[: pairs * 2].decode(encoding)
+            except UnicodeDecodeError:
+                continue
+            if _control_count(text.encode("latin-1", "ignore")) * 10 > len(text):
+                continue
+            return EncodingGuess(encoding, min(0.99, 0.5 + nuls / pairs / 2))
+    return None
+
+
+def _control_count(data: bytes) -> int:
+    return len(data) - len(data.translate(None, _CONTROL_BYTES))
+
+
+def _is_utf8_sample(sample: bytes, mid_stream: bool) -> bool:
+    if mid_stream:
+        # Skip continuation bytes of a character cut by the sample start.
+        skip = 0
+        while skip < min(3, len(sample)) and 0x80 <= sample[skip] <= 0xBF:
+            skip += 1
+        sample = sample[skip:]
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _guess_single_byte(data: bytes) -> EncodingGuess:
+    if any(byte in data for byte in _CP1252_UNDEFINED):
+        encoding = "iso-8859-1"
+    else:
+        encoding = "cp1252"
+    high = [char for char in data.decode(encoding) if ord(char) > 127]
+    plausible = sum(char.isalpha() or char in _CP1252_PUNCTUATION for char in high)
+    return EncodingGuess(encoding, round(0.5 + 0.4 * plausible / len(high), 2))
+
+
+@timed("io.atomic_write")
+def atomic_write(
+    path: Path, text: str | Iterable[str], encoding: str = "utf-8"
+) -> None:
+    """Atomically write text to path using a temp file and replace.
+
+    ``text`` may be a string or an iterable of string chunks, such as
+    ``DocumentSnapshot.iter_chunks()``. It is encoded incrementally, so only
+    about ``WRITE_CHUNK_SIZE`` bytes are buffered beyond the text itself.
+    Raises ``TextIOError`` if the text cannot be encoded.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
     temp_file = None
     try:
@@ -57,11 +267,34 @@ def atomic_write(path: Path, text: str, encoding: str = "utf-8") -> None:
             suffix=".tmp",
         ) as handle:
             temp_file = Path(handle.name)
-            handle.write(text.encode(encoding))
+            encoder = codecs.getincrementalencoder(encoding)()
+            buffer = bytearray()
+            try:
+                for chunk in _iter_write_chunks(text):
+                    buffer += encoder.encode(chunk)
+                    if len(buffer) >= WRITE_CHUNK_SIZE:
+                        handle.write(buffer)
+                        buffer.clear()
+                buffer += encoder.encode("", final=True)
+            except UnicodeEncodeError as exc:
+                raise TextIOError(f"Unable to encode text as {encoding}.") from exc
+            handle.write(buffer)
             handle.flush()
             os.fsync(handle.fileno())
+        # The temp file is created 0600; keep the permissions of the file
+        # being replaced.
+        with contextlib.suppress(FileNotFoundError):
+            os.chmod(temp_file, stat.S_IMODE(path.stat().st_mode))
         os.replace(temp_file, path)
     finally:
         if temp_file and temp_file.exists():
             with contextlib.suppress(OSError):
                 temp_file.unlink()
+
+
+def _iter_write_chunks(text: str | Iterable[str]) -> Iterator[str]:
+    if not isinstance(text, str):
+        yield from text
+        return
+    for start in range(0, len(text), WRITE_CHUNK_SIZE):
+        yield text[start : start + WRITE_CHUNK_SIZE]
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .document import DocumentSnapshot, PieceTable, TextEdit
+from .io import TextIOError, atomic_write, read_text_file
+
+JOURNAL_COMPACT_BYTES = 4 * 1024 * 1024
+
+# Journal records are (offset, deleted length, inserted text).
+Record = tuple[int, int, str]
+
+
+@dataclass
+class _Batch:
+    epoch: int
+    records: list[Record]
+    snapshot: DocumentSnapshot
+    meta: dict[str, Any]
+
+
+class RecoveryJournal:
+    """Append-only autosave journal replayed on top of a base text.
+
+    The base is the file the document was loaded from or saved to, an empty
+    document, or a checkpoint written during compaction. Edits are recorded
+    on the Tk thread, queued as batches by ``queue_batch`` and written by
+    ``flush`` on a worker thread, so autosave I/O scales with the amount of
+    editing rather than the document size.
+    """
+
+    def __init__(
+        self, checkpoint_path: Path, meta_path: Path, journal_path: Path
+    ) -> None:
+        self.checkpoint_path = checkpoint_path
+        self.meta_path = meta_path
+        self.journal_path = journal_path
+        self._records: list[Record] = []
+        self._batches: deque[_Batch] = deque()
+        self._needs_checkpoint = False
+        # Set on the Tk thread by ``clear``: the new epoch and its base, None
+        # meaning a checkpoint of the first flushed snapshot. The worker that
+        # next holds ``_io_lock`` applies it and removes the old files.
+        self._reset: tuple[int, dict[str, Any] | None] = (0, {"base": "empty"})
+        self._io_lock = threading.Lock()
+        self._epoch = 0
+        self._base: dict[str, Any] | None = {"base": "empty"}
+        self._meta_written = False
+        self._journal_size = 0
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._records) or self._needs_checkpoint
+
+    def exists(self) -> bool:
+        return self.meta_path.exists() or self.checkpoint_path.exists()
+
+    def record(self, edit: TextEdit) -> None:
+        self._records.append((edit.offset, len(edit.deleted), edit.inserted))
+
+    def queue_batch(self, snapshot: DocumentSnapshot, meta: dict[str, Any]) -> None:
+        """Hand the recorded edits, and the state they lead to, to ``flush``."""
+        records, self._records = self._records, []
+        self._needs_checkpoint = False
+        self._batches.append(_Batch(self._reset[0], records, snapshot, meta))
+
+    def discard_pending(self) -> None:
+        """Forget edits recorded since the last ``queue_batch``."""
+        self._records = []
+
+    def clear(self, base_path: Path | None = None) -> None:
+        """Discard the journal; later edits are relative to ``base_path``.
+
+        The file is stat'ed now, so that recovery can tell whether it still
+        holds the text the edits apply to. The old journal files are removed
+        by the next ``flush`` or ``purge``.
+        """
+        base: dict[str, Any] | None = {"base": "empty"}
+        if base_path is not None:
+            try:
+                stat = base_path.stat()
+            except OSError:
+                base = None
+            else:
+                base = {
+                    "base": "file",
+                    "base_path": str(base_path),
+                    "base_size": stat.st_size,
+                    "base_mtime_ns": stat.st_mtime_ns,
+                }
+        self._restart(base)
+
+    def rebase(self) -> None:
+        """Restart the journal from a checkpoint of the next queued snapshot.
+
+        For edits whose base text is not on disk, such as ones made while a
+        save was writing an earlier snapshot.
+        """
+        self._restart(None)
+
+    def purge(self) -> None:
+        """Remove the files of a cleared journal. Runs on a worker thread."""
+        with self._io_lock:
+            self._apply_reset()
+
+    def flush(self) -> None:
+        """Write every queued batch in order. Runs on a worker thread."""
+        with self._io_lock:
+            # Batches are taken before the reset is read, so none of them can
+            # belong to a newer epoch than the one applied.
+            batches = []
+            with contextlib.suppress(IndexError):
+                while True:
+                    batches.append(self._batches.popleft())
+            self._apply_reset()
+            batches = [batch for batch in batches if batch.epoch == self._epoch]
+            if not batches:
+                return
+            records = [record for batch in batches for record in batch.records]
+            last = batches[-1]
+            # ASCII-only JSON keeps character and byte offsets identical.
+            payload = "".join(json.dumps(record) + "\n" for record in records)
+            threshold = max(JOURNAL_COMPACT_BYTES, len(last.snapshot) // 4)
+            if self._base is None or self._journal_size + len(payload) > threshold:
+                self._compact(last)
+                return
+            if not self._meta_written:
+                try:
+                    self._write_meta(last.meta, self._base)
+                except OSError:
+                    self._compact(last)
+                    return
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.journal_path.open("a", encoding="ascii") as handle:
+                handle.write(payload)
+                handle.flush()
+                os.fsync(handle.fileno())
+            self._journal_size += len(payload)
+
+    def recover(self) -> tuple[str, dict[str, Any]]:
+        """Rebuild the document from base plus journal.
+
+        Raises ``OSError``, ``TextIOError`` or ``json.JSONDecodeError``. After a
+        successful recovery further edits keep appending to the same journal.
+        """
+        meta: dict[str, Any] = {}
+        if self.meta_path.exists():
+            meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+        base = meta.get("base", "checkpoint")
+        if base == "file":
+            base_path = Path(str(meta.get("base_path", "")))
+            stat = base_path.stat()
+            if (stat.st_size, stat.st_mtime_ns) != (
+                meta.get("base_size"),
+                meta.get("base_mtime_ns"),
+            ):
+                raise TextIOError(f"{base_path} changed since it was autosaved.")
+            encoding = str(meta.get("encoding") or "utf-8")
+            text, _ = read_text_file(base_path, encoding)
+        elif base == "checkpoint":
+            # Written as plain UTF-8; a leading U+FEFF is document text.
+            text, _ = read_text_file(self.checkpoint_path, "utf-8")
+        else:
+            text = ""
+
+        document = PieceTable(text)
+        skip = int(meta.get("journal_skip", 0))
+        size = 0
+        if self.journal_path.exists():
+            with self.journal_path.open("rb+") as handle:
+                handle.seek(skip)
+                for line in handle:
+                    try:
+                        offset, deleted, inserted = json.loads(line)
+                    except (json.JSONDecodeError, ValueError):
+                        break  # torn write at the end of the journal
+                    document.delete(offset, deleted)
+                    document.insert(offset, inserted)
+                    size += len(line)
+                # Drop a torn tail so later appends start on a fresh line.
+                handle.truncate(skip + size)
+
+        with self._io_lock:
+            self._epoch = self._reset[0]
+            self._base = {
+                key: value
+                for key, value in meta.items()
+                if key.startswith("base") or key == "journal_skip"
+            }
+            self._meta_written = False
+            self._journal_size = size
+        return document.text(), meta
+
+    def _restart(self, base: dict[str, Any] | None) -> None:
+        self._records = []
+        self._batches.clear()
+        self._needs_checkpoint = base is None
+        self._reset = (self._reset[0] + 1, base)
+
+    def _apply_reset(self) -> None:
+        epoch, base = self._reset
+        if epoch == self._epoch:
+            return
+        self._epoch = epoch
+        self._base = base
+        self._meta_written = False
+        self._journal_size = 0
+        for path in (self.checkpoint_path, self.meta_path, self.journal_path):
+            with contextlib.suppress(OSError):
+                path.unlink(missing_ok=True)
+
+    def _write_meta(self, meta: dict[str, Any], base: dict[str, Any]) -> None:
+        self._base = base
+        atomic_write(self.meta_path, json.dumps({**meta, **base}, indent=2), "utf-8")
+        self._meta_written = True
+
+    def _compact(self, batch: _Batch) -> None:
+        # The meta write is the commit point: until it lands, recovery still
+        # uses the old base plus the full journal. ``journal_skip`` covers a
+        # crash between the meta write and removing the old journal.
+        atomic_write(self.checkpoint_path, batch.snapshot.iter_chunks(), "utf-8")
+        skip = self.journal_path.stat().st_size if self.journal_path.exists() else 0
+        self._write_meta(batch.meta, {"base": "checkpoint", "journal_skip": skip})
+        self.journal_path.unlink(missing_ok=True)
+        self._write_meta(batch.meta, {"base": "checkpoint"})
+        self._journal_size = 0
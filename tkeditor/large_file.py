@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import codecs
+import mmap
+import threading
+from array import array
+from pathlib import Path
+
+from .io import TextIOError, detect_encoding, read_samples
+
+INDEX_STRIDE = 64
+INDEX_BLOCK_LINES = 4096
+BINARY_SAMPLE_SIZE = 8192
+MAX_LINE_BYTES = 64 * 1024
+
+
+class MappedTextFile:
+    """Read-only memory map of a text file with a sparse line-offset index.
+
+    Only the start of every ``INDEX_STRIDE``-th line is stored, so the index
+    stays small even for files with hundreds of millions of lines.
+    ``build_index`` is meant to run on a worker thread; ``lines`` may be called
+    while it is still running and sees the lines indexed so far.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        try:
+            with path.open("rb") as handle:
+                self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:
+            raise TextIOError("Cannot map an empty file.") from exc
+
+        self.size = len(self._map)
+        head = self._map[:BINARY_SAMPLE_SIZE]
+        guess = detect_encoding(read_samples(path))
+        if guess.binary:
+            self._map.close()
+            raise TextIOError("File appears to be binary or non-text.")
+        self.encoding = guess.encoding
+        self._codec, self._data_start = _line_codec(head, self.encoding)
+        self._newline = "\n".encode(self._codec)
+        self._unit = len(self._newline)
+
+        self._lock = threading.Lock()
+        self._closed = False
+        self._checkpoints = array("q", [self._data_start])
+        self._line_count = 0
+        self._indexed_to = self._data_start
+        self.index_complete = False
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines indexed so far."""
+        return self._line_count
+
+    @property
+    def index_progress(self) -> int:
+        """Indexing progress as a percentage of the file size."""
+        return self._indexed_to * 100 // max(self.size, 1)
+
+    def build_index(self, cancel: threading.Event | None = None) -> None:
+        """Scan the file for line starts, publishing results in blocks."""
+        pos = self._data_start
+        newlines = 0
+        while cancel is None or not cancel.is_set():
+            with self._lock:
+                if self._closed:
+                    return
+                idx = 0
+                for _ in range(INDEX_BLOCK_LINES):
+                    idx = self._find_newline(pos)
+                    if idx < 0:
+                        break
+                    pos = idx + self._unit
+                    newlines += 1
+                    if newlines % INDEX_STRIDE == 0:
+                        self._checkpoints.append(pos)
+                if idx < 0:
+                    self._line_count = newlines + 1
+                    self._indexed_to = self.size
+                    self.index_complete = True
+                    return
+                self._line_count = newlines
+                self._indexed_to = pos
+
+    def lines(self, first: int, count: int) -> list[str]:
+        """Decode ``count`` lines starting at the zero-based line ``first``."""
+        with self._lock:
+            if self._closed:
+                return []
+            first = max(0, first)
+            last = min(first + count, self._line_count)
+            if first >= last:
+                return []
+            pos = self._checkpoints[first // INDEX_STRIDE]
+            for _ in range(first % INDEX_STRIDE):
+                pos = self._find_newline(pos) + self._unit
+            result = []
+            for _ in range(first, last):
+                idx = self._find_newline(pos)
+                end = self.size if idx < 0 else idx
+                raw = self._map[pos : min(end, pos + MAX_LINE_BYTES)]
+                result.append(raw.decode(self._codec, errors="replace").rstrip("\r"))
+                pos = end + self._unit
+            return result
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._map.close()
+
+    def _find_newline(self, pos: int) -> int:
+        while True:
+            idx = self._map.find(self._newline, pos)
+            if idx < 0 or (idx - self._data_start) % self._unit == 0:
+                return idx
+            pos = idx + 1
+
+
+def _line_codec(head: bytes, encoding: str) -> tuple[str, int]:
+    """Return a BOM-free codec for slicing lines and the offset of the text."""
+    if encoding == "utf-16":
+        if head.startswith(codecs.BOM_UTF16_BE):
+            return "utf-16-be", 2
+        return "utf-16-le", 2
+    if encoding == "utf-8-sig":
+        return "utf-8", 3
+    return encoding, 0
@@ -1,13 +1,117 @@
 from __future__ import annotations
 
+import atexit
+import copy
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 from .config import get_log_path
 
+TEXT_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+# At most RATE_LIMIT_BURST records per call site every RATE_LIMIT_INTERVAL
+# seconds below INFO; the rest are counted and reported with the next one.
+RATE_LIMIT_BURST = 20
+RATE_LIMIT_INTERVAL = 1.0
 
-def get_logger(name: str = "tkeditor", debug: bool = False) -> logging.Logger:
-    """Return a configured logger with rotating file output."""
+_installed: list[tuple[logging.Logger, logging.Handler, QueueListener]] = []
+_installed_lock = threading.Lock()
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _QueueHandler(QueueHandler):
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Filters and prepare() change the record; other handlers of the
+        # logger and its ancestors must still see the original.
+        return bool(super().handle(copy.copy(record)))
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args and render the traceback on the emitting thread, where
+        # they are still valid, but leave the layout to the file formatter.
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class RateLimitFilter(logging.Filter):
+    """Drop bursts of low-level records from the same call site.
+
+    Each call site (logger, file, line) may emit ``burst`` records per
+    ``interval`` seconds; records at or above ``level`` always pass. The next
+    record let through after a suppression notes how many were dropped, in
+    its message; attach the filter to a handler that passes it a copy of
+    each record, like the one installed by ``get_logger``.
+    """
+
+    def __init__(
+        self,
+        burst: int = RATE_LIMIT_BURST,
+        interval: float = RATE_LIMIT_INTERVAL,
+        level: int = logging.INFO,
+    ) -> None:
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.level = level
+        # key -> [window start, records in window, suppressed since last pass]
+        self._windows: dict[tuple[str, str, int], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.level:
+            return True
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = int(window[2]) if window else 0
+                self._windows[key] = [now, 1, 0]
+            elif window[1] < self.burst:
+                window[1] += 1
+                suppressed = int(window[2])
+                window[2] = 0
+            else:
+                window[2] += 1
+                return False
+        if suppressed:
+            record.msg = f"{record.msg} ({suppressed} similar messages suppressed)"
+        return True
+
+
+def get_logger(
+    name: str = "tkeditor", debug: bool = False, json_lines: bool = False
+) -> logging.Logger:
+    """Return a logger whose records are written by a background thread.
+
+    Emitting a record only formats it and puts it on a queue; a
+    ``QueueListener`` thread does the file I/O and rotation, so logging from
+    the Tk thread never waits on the disk.
+    """
     logger = logging.getLogger(name)
     if logger.handlers:
         return logger
@@ -22,9 +126,31 @@ def get_logger(name: str = "tkeditor", debug: bool = False) -> logging.Logger:
         backupCount=3,
         encoding="utf-8",
     )
-    formatter = logging.Formatter(
-        "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+    handler.setFormatter(
+        JsonLinesFormatter() if json_lines else logging.Formatter(TEXT_FORMAT)
     )
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = _QueueHandler(records)
+    queue_handler.addFilter(RateLimitFilter())
+    logger.addHandler(queue_handler)
+
+    listener = QueueListener(records, handler, respect_handler_level=True)
+    listener.start()
+    with _installed_lock:
+        if not _installed:
+            atexit.register(shutdown_logging)
+        _installed.append((logger, queue_handler, listener))
     return logger
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the listener threads."""
+    with _installed_lock:
+        installed = list(_installed)
+        _installed.clear()
+        atexit.unregister(shutdown_logging)
+    for logger, queue_handler, listener in installed:
+        logger.removeHandler(queue_handler)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from typing import ParamSpec, TypeVar
+
+# Upper bounds of the histogram buckets in seconds; one more bucket holds the
+# slower samples.
+BUCKET_BOUNDS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+RECENT_SAMPLES = 20
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+class Histogram:
+    """Latency distribution of one named span."""
+
+    __slots__ = ("buckets", "count", "total", "max", "recent")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: deque[float] = deque(maxlen=RECENT_SAMPLES)
+
+    def add(self, seconds: float) -> None:
+        index = 0
+        while index < len(BUCKET_BOUNDS) and seconds > BUCKET_BOUNDS[index]:
+            index += 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of samples."""
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                if index < len(BUCKET_BOUNDS):
+                    return min(BUCKET_BOUNDS[index], self.max)
+                break
+        return self.max
+
+    def copy(self) -> Histogram:
+        other = Histogram()
+        other.buckets = list(self.buckets)
+        other.count = self.count
+        other.total = self.total
+        other.max = self.max
+        other.recent.extend(self.recent)
+        return other
+
+
+class PerfRecorder:
+    """Thread-safe collection of span timings, aggregated per name.
+
+    Every sample is also logged at DEBUG level on ``tkeditor.perf``.
+    """
+
+    def __init__(self) -> None:
+        self._histograms: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger("tkeditor.perf")
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.add(seconds)
+        self._logger.debug("%s took %.2f ms", name, seconds * 1000)
+
+    def snapshot(self) -> dict[str, Histogram]:
+        with self._lock:
+            return {name: hist.copy() for name, hist in self._histograms.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def log_summary(self) -> None:
+        for name, hist in sorted(self.snapshot().items()):
+            self._logger.info(
+                "%s: n=%d mean=%.2f ms p50=%.2f ms p95=%.2f ms max=%.2f ms",
+                name,
+                hist.count,
+                hist.mean * 1000,
+                hist.percentile(0.5) * 1000,
+                hist.percentile(0.95) * 1000,
+                hist.max * 1000,
+            )
+
+
+recorder = PerfRecorder()
+
+
+def span(name: str) -> AbstractContextManager[None]:
+    """Time the enclosed block under ``name`` on the shared recorder."""
+    return recorder.span(name)
+
+
+def timed(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorator form of ``span``."""
+
+    def decorate(fn: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(fn)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with recorder.span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
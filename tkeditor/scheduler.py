@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Hashable
+from typing import Any
+
+IO_WORKERS = 3
+
+
+class IOTask:
+    """A unit of work queued on an ``IOScheduler``."""
+
+    __slots__ = ("key", "fn", "args", "cancel_event", "coalesce")
+
+    def __init__(
+        self,
+        key: Hashable,
+        fn: Callable[..., object],
+        args: tuple[Any, ...],
+        cancel_event: threading.Event,
+        coalesce: bool,
+    ) -> None:
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.cancel_event = cancel_event
+        self.coalesce = coalesce
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def cancel(self) -> None:
+        """Skip the task if it has not started; running tasks see the event."""
+        self.cancel_event.set()
+
+
+class IOScheduler:
+    """Bounded worker pool that serializes file operations per key.
+
+    Tasks sharing a key (typically a file path) run one at a time in
+    submission order, so a save can never overtake an earlier save of the
+    same file. Tasks with different keys run concurrently on at most
+    ``workers`` threads, which are started on demand and reused.
+    """
+
+    def __init__(self, workers: int = IO_WORKERS) -> None:
+        self._workers = workers
+        self._threads: list[threading.Thread] = []
+        self._idle = 0
+        self._cond = threading.Condition()
+        self._queues: dict[Hashable, deque[IOTask]] = {}
+        self._ready: deque[Hashable] = deque()
+        self._running: set[Hashable] = set()
+        self._closed = False
+        self._logger = logging.getLogger("tkeditor")
+
+    def submit(
+        self,
+        key: Hashable | None,
+        fn: Callable[..., object],
+        *args: Any,
+        cancel: threading.Event | None = None,
+        coalesce: bool = False,
+    ) -> IOTask:
+        """Queue ``fn(*args)`` behind earlier tasks with the same ``key``.
+
+        ``key=None`` means no ordering constraint. With ``coalesce=True`` the
+        task replaces a coalescing task for the same key that is still
+        waiting to run, so bursts of identical work collapse into one run.
+        ``cancel`` is an optional event shared with the task body; once set,
+        the task is skipped if it has not started yet. Tasks submitted after
+        ``close`` are returned already cancelled.
+        """
+        task = IOTask(
+            object() if key is None else key,
+            fn,
+            args,
+            cancel or threading.Event(),
+            coalesce,
+        )
+        with self._cond:
+            if self._closed:
+                task.cancel()
+                return task
+            pending = self._queues.get(task.key)
+            if coalesce and pending and pending[-1].coalesce:
+                pending[-1] = task
+                return task
+            if pending is None:
+                pending = self._queues[task.key] = deque()
+                if task.key not in self._running:
+                    self._ready.append(task.key)
+            pending.append(task)
+            self._spawn_worker()
+            self._cond.notify()
+        return task
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Wait for queued and running tasks; return False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queues or self._running:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self) -> None:
+        """Stop accepting work. Queued tasks still run; idle workers exit."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _spawn_worker(self) -> None:
+        if self._idle or len(self._threads) >= self._workers:
+            return
+        thread = threading.Thread(
+            target=self._worker, name=f"tkeditor-io-{len(self._threads)}", daemon=True
+        )
+        self._threads.append(thread)
+        thread.start()
+
+    def _next_task(self) -> IOTask | None:
+        with self._cond:
+            while not self._ready:
+                if self._closed:
+                    return None
+                self._idle += 1
+                self._cond.wait()
+                self._idle -= 1
+            key = self._ready.popleft()
+            pending = self._queues[key]
+            task = pending.popleft()
+            if not pending:
+                del self._queues[key]
+            self._running.add(key)
+            return task
+
+    def _finish_task(self, task: IOTask) -> None:
+        with self._cond:
+            self._running.discard(task.key)
+            if task.key in self._queues:
+                self._ready.append(task.key)
+            self._cond.notify_all()
+
+    def _worker(self) -> None:
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+            try:
+                if not task.cancelled:
+                    task.fn(*task.args)
+            except Exception:
+                self._logger.exception("Background I/O task failed")
+            finally:
+                self._finish_task(task)
@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import re
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+from typing import Any
+
+from .document import PieceTable, TextEdit, tk_length
+
+if sys.version_info >= (3, 11):
+    from re import _parser as sre_parse
+else:
+    import sre_parse
+
+BLOCK_SIZE = 1024
+
+Span = tuple[int, int]
+# (start index, end index, new text) using Tk "line.column" indices.
+Replacement = tuple[str, str, str]
+
+_NEWLINE = ord("\n")
+# Character classes that include the newline.
+_NEWLINE_CATEGORIES = {"CATEGORY_SPACE", "CATEGORY_NOT_DIGIT", "CATEGORY_NOT_WORD"}
+# Anchors that look no further than the neighbouring character.
+_LOCAL_ANCHORS = {"AT_BOUNDARY", "AT_NON_BOUNDARY"}
+_REPEATS = {"MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT"}
+
+
+@lru_cache(maxsize=64)
+def compile_pattern(query: str, use_regex: bool) -> re.Pattern[str]:
+    """Compile a find query, caching recent patterns. Raises ``re.error``."""
+    return re.compile(query if use_regex else re.escape(query))
+
+
+def is_line_local(query: str, use_regex: bool) -> bool:
+    """Return True if matches of ``query`` can never span a line break."""
+    if not use_regex:
+        return "\n" not in query
+    try:
+        parsed = sre_parse.parse(query)
+    except re.error:
+        return False
+    return _line_local(parsed, bool(parsed.state.flags & re.DOTALL))
+
+
+def _line_local(items: Any, dotall: bool) -> bool:
+    # Lookarounds and line or string anchors depend on text outside the line,
+    # so they count as non-local as well.
+    for op, arg in items:
+        name = op.name
+        if name == "LITERAL":
+            local = arg != _NEWLINE
+        elif name == "NOT_LITERAL":
+            local = arg == _NEWLINE
+        elif name == "ANY":
+            local = not dotall
+        elif name == "IN":
+            local = not _set_has_newline(arg)
+        elif name == "AT":
+            local = arg.name in _LOCAL_ANCHORS
+        elif name == "GROUPREF":
+            local = True  # the group itself is checked where it is defined
+        elif name == "SUBPATTERN":
+            _, add_flags, del_flags, body = arg
+            inner = (dotall or bool(add_flags & re.DOTALL)) and not (
+                del_flags & re.DOTALL
+            )
+            local = _line_local(body, inner)
+        elif name == "BRANCH":
+            local = all(_line_local(branch, dotall) for branch in arg[1])
+        elif name in _REPEATS:
+            local = _line_local(arg[2], dotall)
+        elif name == "ATOMIC_GROUP":
+            local = _line_local(arg, dotall)
+        elif name == "GROUPREF_EXISTS":
+            _, yes, no = arg
+            local = _line_local(yes, dotall) and (no is None or _line_local(no, dotall))
+        else:
+            # Lookarounds, and anything not known to stay on one line.
+            local = False
+        if not local:
+            return False
+    return True
+
+
+def _set_has_newline(items: Iterable[tuple[Any, Any]]) -> bool:
+    negated = False
+    found = False
+    for op, arg in items:
+        name = op.name
+        if name == "NEGATE":
+            negated = True
+        elif name == "LITERAL":
+            found = found or arg == _NEWLINE
+        elif name == "RANGE":
+            found = found or arg[0] <= _NEWLINE <= arg[1]
+        elif name == "CATEGORY":
+            found = found or arg.name in _NEWLINE_CATEGORIES
+        else:
+            return True
+    return found != negated
+
+
+def plan_replacements(
+    pattern: re.Pattern[str], text: str, replacement: str, use_regex: bool
+) -> tuple[int, list[Replacement]]:
+    """Compute the spans a replace-all would change, in document order.
+
+    Returns the number of matches and the edits for matches whose text
+    actually changes. Indices refer to ``text`` as given, so applying the
+    edits from last to first keeps every remaining index valid. Regex
+    replacements are expanded like ``re.sub``; an invalid template raises
+    ``re.error``.
+    """
+    count = 0
+    edits: list[Replacement] = []
+    line = 1
+    column = 0
+    scanned = 0
+
+    def index_of(offset: int) -> str:
+        nonlocal line, column, scanned
+        newlines = text.count("\n", scanned, offset)
+        if newlines:
+            line += newlines
+            column = tk_length(text[text.rfind("\n", scanned, offset) + 1 : offset])
+        else:
+            column += tk_length(text[scanned:offset])
+        scanned = offset
+        return f"{line}.{column}"
+
+    for match in pattern.finditer(text):
+        count += 1
+        new_text = match.expand(replacement) if use_regex else replacement
+        if new_text == match.group():
+            continue
+        start = index_of(match.start())
+        edits.append((start, index_of(match.end()), new_text))
+    return count, edits
+
+
+def replace_text(
+    pattern: re.Pattern[str], text: str, replacement: str, use_regex: bool
+) -> tuple[str, int]:
+    """Return ``text`` with every match replaced and the number of matches.
+
+    Same semantics as ``plan_replacements``: regex templates are expanded like
+    ``re.sub``, plain replacements are inserted verbatim.
+    """
+    return pattern.subn(replacement if use_regex else lambda _: replacement, text)
+
+
+class _MatchBlock:
+    __slots__ = ("starts", "ends", "shift")
+
+    def __init__(self, spans: list[Span]) -> None:
+        self.starts = array("q", (start for start, _ in spans))
+        self.ends = array("q", (end for _, end in spans))
+        self.shift = 0
+
+    def spans(self) -> Iterator[Span]:
+        shift = self.shift
+        for start, end in zip(self.starts, self.ends, strict=True):
+            yield start + shift, end + shift
+
+
+class MatchIndex:
+    """Sorted match spans for one pattern over one document.
+
+    Spans are kept in blocks of ``BLOCK_SIZE`` with a per-block offset shift,
+    so an edit only rewrites the blocks it touches and shifts the rest in
+    O(number of blocks).
+    """
+
+    def __init__(
+        self, pattern: re.Pattern[str], line_local: bool, spans: Iterable[Span]
+    ) -> None:
+        self.pattern = pattern
+        self.line_local = line_local
+        self._blocks = _chunk(list(spans))
+        self._count = sum(len(block.starts) for block in self._blocks)
+
+    @classmethod
+    def build(cls, pattern: re.Pattern[str], line_local: bool, text: str) -> MatchIndex:
+        spans = (match.span() for match in pattern.finditer(text))
+        return cls(pattern, line_local, spans)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def spans(self) -> Iterator[Span]:
+        for block in self._blocks:
+            yield from block.spans()
+
+    def spans_between(self, start: int, end: int) -> Iterator[Span]:
+        """Yield matches starting in ``[start, end)``."""
+        first = max(0, bisect_right(self._firsts(), start) - 1)
+        for block in self._blocks[first:]:
+            j = bisect_left(block.starts, start - block.shift)
+            for k in range(j, len(block.starts)):
+                span_start = block.starts[k] + block.shift
+                if span_start >= end:
+                    return
+                yield span_start, block.ends[k] + block.shift
+
+    def next_after(self, offset: int) -> Span | None:
+        """Return the first non-empty-at-cursor match at or after ``offset``."""
+        for span_start, span_end in self.spans_between(offset, 1 << 62):
+            if span_start > offset or span_end > span_start:
+                return span_start, span_end
+        return next(self.spans(), None)
+
+    def previous_before(self, offset: int) -> Span | None:
+        """Return the last match ending before ``offset``, wrapping around."""
+        block_index = bisect_left(self._firsts(), offset) - 1
+        if block_index >= 0:
+            block = self._blocks[block_index]
+            j = bisect_left(block.ends, offset - block.shift) - 1
+            if j >= 0:
+                return block.starts[j] + block.shift, block.ends[j] + block.shift
+            if block_index > 0:
+                block = self._blocks[block_index - 1]
+                return block.starts[-1] + block.shift, block.ends[-1] + block.shift
+        if not self._blocks:
+            return None
+        block = self._blocks[-1]
+        return block.starts[-1] + block.shift, block.ends[-1] + block.shift
+
+    def apply_edit(self, edit: TextEdit, document: PieceTable) -> bool:
+        """Update the index for ``edit`` already applied to ``document``."""
+        delta = len(edit.inserted) - len(edit.deleted)
+        return self.repair(
+            edit.offset, edit.offset + len(edit.inserted), delta, document
+        )
+
+    def repair(self, start: int, end: int, delta: int, document: PieceTable) -> bool:
+        """Rescan the lines covering ``[start, end)`` in the edited document.
+
+        ``delta`` is the change in document length; text after ``end`` is
+        assumed to be unchanged apart from that shift. Returns False if the
+        pattern can span lines and the index must be rebuilt instead.
+        """
+        if not self.line_local:
+            return False
+        window_start = document.offset_of(document.line_col(start)[0], 0)
+        window_end = document.offset_of(document.line_col(end)[0] + 1, 0)
+        old_end = window_end - delta
+
+        context = 1 if window_start > 0 else 0
+        text = document.get(window_start - context, window_end + 1)
+        fresh = []
+        for match in self.pattern.finditer(text, context):
+            span_start = match.start() - context + window_start
+            if span_start >= window_end:
+                break
+            fresh.append((span_start, match.end() - context + window_start))
+
+        firsts = self._firsts()
+        lo = max(0, bisect_right(firsts, window_start) - 1)
+        hi = max(lo, bisect_left(firsts, old_end))
+        before: list[Span] = []
+        after: list[Span] = []
+        for block in self._blocks[lo:hi]:
+            for span in block.spans():
+                if span[0] < window_start:
+                    before.append(span)
+                elif span[0] >= old_end:
+                    after.append((span[0] + delta, span[1] + delta))
+        for block in self._blocks[hi:]:
+            block.shift += delta
+        replaced = _chunk(before + fresh + after)
+        self._blocks[lo:hi] = replaced
+        self._count = sum(len(block.starts) for block in self._blocks)
+        return True
+
+    def _firsts(self) -> list[int]:
+        return [block.starts[0] + block.shift for block in self._blocks]
+
+
+class SearchEngine:
+    """Tracks the match index for the active query across edits.
+
+    Building happens elsewhere (typically on a worker thread from a document
+    snapshot); edits that arrive while a build is in flight are folded into a
+    single dirty region and repaired when the build completes.
+    """
+
+    def __init__(self) -> None:
+        self.key: tuple[str, bool] | None = None
+        self.index: MatchIndex | None = None
+        self.building = False
+        self._dirty: tuple[int, int, int] | None = None
+
+    def lookup(self, query: str, use_regex: bool) -> MatchIndex | None:
+        if self.key != (query, use_regex) or self.building:
+            return None
+        return self.index
+
+    def begin_build(self, query: str, use_regex: bool) -> re.Pattern[str]:
+        pattern = compile_pattern(query, use_regex)
+        self.key = (query, use_regex)
+        self.index = None
+        self.building = True
+        self._dirty = None
+        return pattern
+
+    def finish_build(
+        self, index: MatchIndex, document: PieceTable
+    ) -> MatchIndex | None:
+        """Install a freshly built index, or return None if it must be rebuilt."""
+        self.building = False
+        if self._dirty is not None:
+            start, end, delta = self._dirty
+            if not index.repair(start, end, delta, document):
+                return None
+        self._dirty = None
+        self.index = index
+        return index
+
+    def clear(self) -> None:
+        self.key = None
+        self.index = None
+        self.building = False
+        self._dirty = None
+
+    def note_edit(self, edit: TextEdit, document: PieceTable) -> None:
+        if self.index is not None:
+            if not self.index.apply_edit(edit, document):
+                self.index = None
+                self.key = None
+        elif self.building:
+            self._merge_dirty(edit)
+
+    def _merge_dirty(self, edit: TextEdit) -> None:
+        offset = edit.offset
+        removed_end = offset + len(edit.deleted)
+        delta = len(edit.inserted) - len(edit.deleted)
+        if self._dirty is None:
+            self._dirty = (offset, offset + len(edit.inserted), delta)
+            return
+        start, end, total = self._dirty
+        if end >= removed_end:
+            end += delta
+        elif end > offset:
+            end = offset + len(edit.inserted)
+        self._dirty = (
+            min(start, offset),
+            max(end, offset + len(edit.inserted)),
+            total + delta,
+        )
+
+
+def _chunk(spans: list[Span]) -> list[_MatchBlock]:
+    return [
+        _MatchBlock(spans[i : i + BLOCK_SIZE]) for i in range(0, len(spans), BLOCK_SIZE)
+    ]
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .io import atomic_write
+from .watcher import FileStat
+
+
+@dataclass
+class SessionDocument:
+    """One tab of a saved session."""
+
+    path: str | None
+    encoding: str = "utf-8"
+    # Text widget index of the cursor and the first visible fraction.
+    cursor: str = "1.0"
+    top: float = 0.0
+    # file_stat() of the file when the session was saved.
+    stat: FileStat | None = None
+    # Recovery journal id holding unsaved changes, if any.
+    unsaved_id: str | None = None
+
+
+@dataclass
+class Session:
+    documents: list[SessionDocument] = field(default_factory=list)
+    active: int = 0
+
+
+def save_session(path: Path, session: Session) -> None:
+    atomic_write(path, json.dumps(asdict(session), indent=2), encoding="utf-8")
+
+
+def load_session(path: Path) -> Session | None:
+    """Read a saved session; None if there is none or it cannot be parsed.
+
+    Malformed entries are skipped rather than failing the whole session.
+    """
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get("documents"), list):
+        return None
+    documents = []
+    for item in data["documents"]:
+        document = _parse_document(item)
+        if document is not None:
+            documents.append(document)
+    active = data.get("active", 0)
+    return Session(documents, active if isinstance(active, int) else 0)
+
+
+def _parse_document(item: Any) -> SessionDocument | None:
+    if not isinstance(item, dict):
+        return None
+    path = item.get("path")
+    unsaved_id = item.get("unsaved_id")
+    if not isinstance(path, str) or not path:
+        path = None
+    if not isinstance(unsaved_id, str) or not unsaved_id:
+        unsaved_id = None
+    if path is None and unsaved_id is None:
+        return None
+    raw_stat = item.get("stat")
+    stat: FileStat | None = None
+    if (
+        isinstance(raw_stat, list)
+        and len(raw_stat) == 3
+        and all(isinstance(value, int) for value in raw_stat)
+    ):
+        stat = (raw_stat[0], raw_stat[1], raw_stat[2])
+    try:
+        top = float(item.get("top", 0.0))
+    except (TypeError, ValueError):
+        top = 0.0
+    return SessionDocument(
+        path=path,
+        encoding=str(item.get("encoding") or "utf-8"),
+        cursor=str(item.get("cursor") or "1.0"),
+        top=top,
+        stat=stat,
+        unsaved_id=unsaved_id,
+    )
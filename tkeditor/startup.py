@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import sys
+import time
+from typing import TextIO
+
+
+class StartupProfile:
+    """Wall-clock timings of the startup phases, for ``--startup-profile``.
+
+    ``started`` is the earliest timestamp available (the entry module records
+    it before importing the editor); each ``mark`` closes the phase that began
+    at the previous mark.
+    """
+
+    def __init__(self, started: float | None = None) -> None:
+        self.started = time.perf_counter() if started is None else started
+        self._last = self.started
+        self.phases: list[tuple[str, float]] = []
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        return self._last - self.started
+
+    def report(self, stream: TextIO | None = None) -> None:
+        stream = stream or sys.stderr
+        width = max((len(phase) for phase, _ in self.phases), default=0)
+        width = max(width, len("total"))
+        print("TkEditor startup profile:", file=stream)
+        for phase, seconds in self.phases:
+            print(f"  {phase:<{width}} {seconds * 1000:>9.1f} ms", file=stream)
+        print(f"  {'total':<{width}} {self.total * 1000:>9.1f} ms", file=stream)
+        print(
+            "  (run with `python -X importtime -m tkeditor` for per-module imports)",
+            file=stream,
+        )
+        stream.flush()
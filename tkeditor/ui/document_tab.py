@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import threading
+import time
+import tkinter as tk
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+from tkinter import ttk
+from typing import TYPE_CHECKING
+
+from ..config import EditorConfig, get_recovery_paths, new_recovery_id
+from ..document import DocumentSnapshot, Fingerprint, PieceTable
+from ..journal import RecoveryJournal
+from ..search import SearchEngine
+from ..undo import UndoManager
+from ..workspace import CompressedText, memory_estimate
+from .idle import IdleCoalescer
+from .syntax import SyntaxHighlighter
+from .text_proxy import Position, TextChangeProxy
+
+if TYPE_CHECKING:
+    from ..follow import LogTail
+    from ..watcher import FileStat
+    from .large_file_view import LargeFileView
+
+ChangeHandler = Callable[["DocumentTab", Position, Position, str], None]
+
+
+class DocumentTab:
+    """One open document: its widgets, text model, history and autosave journal.
+
+    Widget edits are reported to ``on_change`` together with the tab.
+    """
+
+    def __init__(
+        self,
+        notebook: ttk.Notebook,
+        config: EditorConfig,
+        on_change: ChangeHandler,
+        ui_updates: IdleCoalescer,
+        doc_id: str | None = None,
+    ) -> None:
+        self.doc_id = doc_id or new_recovery_id()
+        self.frame = tk.Frame(notebook)
+        # Undo is handled by self.history, fed from the change proxy.
+        self.text = tk.Text(self.frame, wrap="word", undo=False)
+        self.text.pack(expand=True, fill="both")
+        self.text.tag_configure("find_match", background="#ffe082")
+        self.text.tag_configure("find_all", background="#fff3c4")
+        self.text.tag_raise("find_match")
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical")
+        self._proxy = TextChangeProxy(self.text, partial(on_change, self))
+
+        self.document = PieceTable()
+        self.search = SearchEngine()
+        self.history = UndoManager(config.undo_memory_limit, config.undo_spill_limit)
+        self.journal = RecoveryJournal(*get_recovery_paths(self.doc_id))
+        self.syntax = SyntaxHighlighter(self.text, self.document, ui_updates)
+
+        self.path: Path | None = None
+        self.encoding = "utf-8"
+        self.dirty = False
+        # Last persisted content and the stat of the file it was read from
+        # or written to; None when unknown, in which case the dirty flag
+        # alone decides.
+        self.saved_fingerprint: Fingerprint | None = (
+            self.document.snapshot().fingerprint()
+        )
+        self.saved_stat: FileStat | None = None
+        # Set by the file watcher until the change has been dealt with.
+        self.disk_changed = False
+        self.edit_count = 0
+        self.save_generation = 0
+        self.loading = False
+        self.replacing = False
+        self.load_cancel: threading.Event | None = None
+        self.load_started = 0.0
+        self.load_progress = 0
+        # Text shown before a reload of the open file, put back if it fails.
+        self.reload_backup: DocumentSnapshot | None = None
+        self.replace_started = 0.0
+        self.large_view: LargeFileView | None = None
+        # Follow mode: the widget is read-only and shows the end of the file.
+        self.follow: LogTail | None = None
+        self.follow_job: str | None = None
+        # While evicted the widget and model are empty; the text is kept
+        # compressed, re-read from ``path`` when the tab was clean, or for a
+        # tab restored from the last session, replayed from its journal.
+        self.evicted: CompressedText | Path | RecoveryJournal | None = None
+        self.view = ("1.0", 0.0)
+        self.pending_goto: tuple[int, int] | None = None
+        self.last_used = time.monotonic()
+
+        notebook.add(self.frame, text=self.title)
+
+    @property
+    def title(self) -> str:
+        name = self.path.name if self.path else "Untitled"
+        return f"{name}*" if self.dirty else name
+
+    @property
+    def pristine(self) -> bool:
+        """True for an untouched Untitled tab that an opened file can replace."""
+        return (
+            self.path is None
+            and not self.dirty
+            and not self.loading
+            and self.evicted is None
+            and len(self.document) == 0
+        )
+
+    def memory_usage(self) -> int:
+        if isinstance(self.evicted, CompressedText):
+            held = self.evicted.nbytes
+        elif self.evicted is not None or self.large_view is not None:
+            held = 0
+        else:
+            held = memory_estimate(len(self.document))
+        return held + self.history.memory_usage
+
+    def close(self) -> None:
+        self.syntax.set_lexer(None)
+        self.history.close()
+        self.frame.destroy()
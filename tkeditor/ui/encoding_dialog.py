@@ -3,16 +3,10 @@ from __future__ import annotations
 import tkinter as tk
 from tkinter import messagebox, ttk
 
+from ..io import ENCODING_CHOICES
 from .window_utils import center_window
 
-ENCODING_CHOICES = [
-    "utf-8",
-    "utf-8-sig",
-    "utf-16",
-    "iso-8859-1",
-    "cp1252",
-    "ascii",
-]
+__all__ = ["ENCODING_CHOICES", "EncodingDialog"]
 
 
 class EncodingDialog:
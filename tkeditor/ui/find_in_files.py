@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import queue
+import re
+import time
+import tkinter as tk
+from collections.abc import Callable
+from pathlib import Path
+from tkinter import filedialog, messagebox, ttk
+
+from ..find_in_files import FileHits, FileSearch
+from ..search import compile_pattern
+from .window_utils import center_window
+
+POLL_MS = 50
+POLL_BATCH_SECONDS = 0.02
+MAX_RESULTS = 10_000
+
+
+class FindInFilesPanel:
+    """Search a directory tree and list the matching lines.
+
+    Results are added as the worker processes report them; double-clicking
+    (or pressing Return on) a hit calls ``on_open(path, line, column)``.
+    """
+
+    def __init__(
+        self,
+        parent: tk.Tk,
+        on_open: Callable[[Path, int, int], None],
+        initial_dir: Path,
+        on_close: Callable[[], None] | None = None,
+    ) -> None:
+        self._on_open = on_open
+        self._on_close = on_close
+        self._search: FileSearch | None = None
+        self._poll_job: str | None = None
+        self._hit_count = 0
+        self._file_count = 0
+        # Treeview item id -> (path, line, column)
+        self._targets: dict[str, tuple[Path, int, int]] = {}
+
+        self._window = tk.Toplevel(parent)
+        self._window.title("Find in Files")
+        self._window.transient(parent)
+        self._window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.find_var = tk.StringVar()
+        self.dir_var = tk.StringVar(value=str(initial_dir))
+        self.include_var = tk.StringVar()
+        self.exclude_var = tk.StringVar()
+        self.regex_var = tk.BooleanVar(value=False)
+        self.status_var = tk.StringVar(value="")
+
+        self._build_ui()
+        center_window(self._window)
+
+    def _build_ui(self) -> None:
+        frame = tk.Frame(self._window, padx=10, pady=10)
+        frame.pack(fill="both", expand=True)
+
+        tk.Label(frame, text="Find:").grid(row=0, column=0, sticky="w")
+        find_entry = tk.Entry(frame, textvariable=self.find_var, width=40)
+        find_entry.grid(row=0, column=1, columnspan=2, sticky="ew", pady=2)
+        find_entry.bind("<Return>", lambda _e: self.start())
+        find_entry.focus_set()
+
+        tk.Label(frame, text="Directory:").grid(row=1, column=0, sticky="w")
+        tk.Entry(frame, textvariable=self.dir_var, width=40).grid(
+            row=1, column=1, sticky="ew", pady=2
+        )
+        tk.Button(frame, text="Browse...", command=self._browse).grid(
+            row=1, column=2, padx=(4, 0), pady=2
+        )
+
+        tk.Label(frame, text="Include:").grid(row=2, column=0, sticky="w")
+        tk.Entry(frame, textvariable=self.include_var, width=40).grid(
+            row=2, column=1, columnspan=2, sticky="ew", pady=2
+        )
+        tk.Label(frame, text="Exclude:").grid(row=3, column=0, sticky="w")
+        tk.Entry(frame, textvariable=self.exclude_var, width=40).grid(
+            row=3, column=1, columnspan=2, sticky="ew", pady=2
+        )
+
+        options = tk.Frame(frame)
+        options.grid(row=4, column=0, columnspan=3, sticky="ew", pady=4)
+        tk.Checkbutton(options, text="Regex", variable=self.regex_var).pack(side="left")
+        tk.Label(options, text="(comma-separated globs, e.g. *.py, build)").pack(
+            side="left", padx=8
+        )
+        tk.Button(options, text="Close", command=self.close).pack(side="right")
+        self._cancel_button = tk.Button(
+            options, text="Cancel", command=self.cancel, state="disabled"
+        )
+        self._cancel_button.pack(side="right", padx=2)
+        tk.Button(options, text="Search", command=self.start).pack(side="right")
+
+        results = tk.Frame(frame)
+        results.grid(row=5, column=0, columnspan=3, sticky="nsew")
+        self._tree = ttk.Treeview(results, show="tree", height=18)
+        scrollbar = ttk.Scrollbar(results, orient="vertical", command=self._tree.yview)
+        self._tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self._tree.pack(side="left", fill="both", expand=True)
+        self._tree.bind("<Double-1>", self._open_selected)
+        self._tree.bind("<Return>", self._open_selected)
+
+        tk.Label(frame, textvariable=self.status_var, anchor="w").grid(
+            row=6, column=0, columnspan=3, sticky="ew", pady=(4, 0)
+        )
+
+        frame.grid_columnconfigure(1, weight=1)
+        frame.grid_rowconfigure(5, weight=1)
+
+    def _browse(self) -> None:
+        directory = filedialog.askdirectory(
+            parent=self._window, initialdir=self.dir_var.get() or None
+        )
+        if directory:
+            self.dir_var.set(directory)
+
+    def start(self) -> None:
+        query = self.find_var.get()
+        root = Path(self.dir_var.get()).expanduser()
+        if not query:
+            messagebox.showinfo(
+                "Find in Files", "Enter text to find.", parent=self._window
+            )
+            return
+        if not root.is_dir():
+            messagebox.showinfo(
+                "Find in Files", "Choose an existing directory.", parent=self._window
+            )
+            return
+        try:
+            pattern = compile_pattern(query, self.regex_var.get())
+        except re.error as exc:
+            messagebox.showerror("Find in Files", str(exc), parent=self._window)
+            return
+        if pattern.search("") is not None:
+            messagebox.showinfo(
+                "Find in Files", "The pattern matches empty text.", parent=self._window
+            )
+            return
+
+        self.cancel()
+        self._tree.delete(*self._tree.get_children())
+        self._targets.clear()
+        self._hit_count = 0
+        self._file_count = 0
+        self._search = FileSearch(
+            root,
+            query,
+            self.regex_var.get(),
+            include=_globs(self.include_var.get()),
+            exclude=_globs(self.exclude_var.get()),
+        )
+        self._search.start()
+        self._cancel_button.config(state="normal")
+        self.status_var.set("Searching...")
+        self._poll_job = self._window.after(POLL_MS, self._poll, self._search)
+
+    def cancel(self) -> None:
+        if self._search is not None:
+            self._search.cancel()
+            self._finish(self._search, "Cancelled")
+
+    def _poll(self, search: FileSearch) -> None:
+        self._poll_job = None
+        deadline = time.monotonic() + POLL_BATCH_SECONDS
+        while time.monotonic() < deadline:
+            try:
+                item = search.results.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._finish(search, "Done")
+                return
+            self._add_file(item)
+            if self._hit_count >= MAX_RESULTS:
+                search.cancel()
+                self._finish(search, f"Stopped after {MAX_RESULTS} results")
+                return
+        self._show_progress(search, "Searching...")
+        self._poll_job = self._window.after(POLL_MS, self._poll, search)
+
+    def _add_file(self, file_hits: FileHits) -> None:
+        path = Path(file_hits.path)
+        parent = self._tree.insert(
+            "",
+            "end",
+            text=f"{path}  ({len(file_hits.hits)})",
+            open=True,
+        )
+        self._targets[parent] = (path, *file_hits.hits[0][:2])
+        for line, column, preview in file_hits.hits:
+            item = self._tree.insert(parent, "end", text=f"{line}: {preview.strip()}")
+            self._targets[item] = (path, line, column)
+        self._file_count += 1
+        self._hit_count += len(file_hits.hits)
+
+    def _show_progress(self, search: FileSearch, state: str) -> None:
+        self.status_var.set(
+            f"{state} {self._hit_count} match(es) in {self._file_count} file(s); "
+            f"{search.files_scanned} file(s) scanned"
+        )
+
+    def _finish(self, search: FileSearch, state: str) -> None:
+        if self._poll_job is not None:
+            self._window.after_cancel(self._poll_job)
+            self._poll_job = None
+        if self._search is search:
+            self._search = None
+        self._cancel_button.config(state="disabled")
+        self._show_progress(search, f"{state}:")
+
+    def _open_selected(self, _event: tk.Event | None = None) -> None:
+        selection = self._tree.focus()
+        target = self._targets.get(selection)
+        if target is not None:
+            self._on_open(*target)
+
+    def focus(self) -> None:
+        self._window.deiconify()
+        self._window.lift()
+        self._window.focus_force()
+
+    def close(self) -> None:
+        self.cancel()
+        self._window.destroy()
+        if self._on_close:
+            self._on_close()
+
+
+def _globs(value: str) -> list[str]:
+    return [part.strip() for part in value.split(",") if part.strip()]
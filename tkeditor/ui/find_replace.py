@@ -17,9 +17,13 @@ class FindReplaceDialog:
         on_replace: Callable[[str, str, bool], None],
         on_replace_all: Callable[[str, str, bool], None],
         on_close: Callable[[], None] | None = None,
+        on_find_previous: Callable[[str, bool], None] | None = None,
+        on_highlight_all: Callable[[str, bool, bool], None] | None = None,
     ) -> None:
         self._parent = parent
         self._on_find = on_find
+        self._on_find_previous = on_find_previous
+        self._on_highlight_all = on_highlight_all
         self._on_replace = on_replace
         self._on_replace_all = on_replace_all
         self._on_close = on_close
@@ -33,6 +37,8 @@ class FindReplaceDialog:
         self.find_var = tk.StringVar()
         self.replace_var = tk.StringVar()
         self.regex_var = tk.BooleanVar(value=False)
+        self.highlight_var = tk.BooleanVar(value=False)
+        self.count_var = tk.StringVar(value="")
 
         self._build_ui()
         center_window(self._window)
@@ -43,29 +49,45 @@ class FindReplaceDialog:
 
         tk.Label(frame, text="Find:").grid(row=0, column=0, sticky="w")
         tk.Entry(frame, textvariable=self.find_var, width=30).grid(
-            row=0, column=1, columnspan=3, sticky="ew", pady=2
+            row=0, column=1, columnspan=4, sticky="ew", pady=2
         )
 
         tk.Label(frame, text="Replace:").grid(row=1, column=0, sticky="w")
         tk.Entry(frame, textvariable=self.replace_var, width=30).grid(
-            row=1, column=1, columnspan=3, sticky="ew", pady=2
+            row=1, column=1, columnspan=4, sticky="ew", pady=2
         )
 
         tk.Checkbutton(frame, text="Regex", variable=self.regex_var).grid(
             row=2, column=1, sticky="w", pady=4
         )
+        tk.Checkbutton(
+            frame,
+            text="Highlight all",
+            variable=self.highlight_var,
+            command=self._handle_highlight_all,
+            state="normal" if self._on_highlight_all else "disabled",
+        ).grid(row=2, column=2, sticky="w", pady=4)
+        tk.Label(frame, textvariable=self.count_var, anchor="e").grid(
+            row=2, column=3, columnspan=2, sticky="e", pady=4
+        )
 
         tk.Button(frame, text="Find Next", command=self._handle_find).grid(
             row=3, column=0, padx=2, pady=4
         )
+        tk.Button(
+            frame,
+            text="Find Previous",
+            command=self._handle_find_previous,
+            state="normal" if self._on_find_previous else "disabled",
+        ).grid(row=3, column=1, padx=2, pady=4)
         tk.Button(frame, text="Replace", command=self._handle_replace).grid(
-            row=3, column=1, padx=2, pady=4
+            row=3, column=2, padx=2, pady=4
         )
         tk.Button(frame, text="Replace All", command=self._handle_replace_all).grid(
-            row=3, column=2, padx=2, pady=4
+            row=3, column=3, padx=2, pady=4
         )
         tk.Button(frame, text="Close", command=self.close).grid(
-            row=3, column=3, padx=2, pady=4
+            row=3, column=4, padx=2, pady=4
         )
 
         frame.grid_columnconfigure(1, weight=1)
@@ -75,8 +97,32 @@ class FindReplaceDialog:
         if not query:
             messagebox.showinfo("Find", "Enter text to find.")
             return
+        if self.highlight_var.get():
+            self._handle_highlight_all()
         self._on_find(query, self.regex_var.get())
 
+    def _handle_find_previous(self) -> None:
+        query = self.find_var.get()
+        if not query:
+            messagebox.showinfo("Find", "Enter text to find.")
+            return
+        if self._on_find_previous:
+            self._on_find_previous(query, self.regex_var.get())
+
+    def _handle_highlight_all(self) -> None:
+        if not self._on_highlight_all:
+            return
+        enabled = self.highlight_var.get()
+        query = self.find_var.get()
+        if not query:
+            enabled = False
+        if not enabled:
+            self.count_var.set("")
+        self._on_highlight_all(query, self.regex_var.get(), enabled)
+
+    def set_match_count(self, count: int) -> None:
+        self.count_var.set("1 match" if count == 1 else f"{count} matches")
+
     def _handle_replace(self) -> None:
         query = self.find_var.get()
         if not query:
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import tkinter as tk
+from collections.abc import Callable
+
+Refresh = Callable[[], None]
+
+
+class IdleCoalescer:
+    """Batch UI refreshes into a single ``after_idle`` callback.
+
+    Requesting the same refresh many times before Tk goes idle (key repeat,
+    a burst of edits) runs it once, after pending events have been handled.
+    Refreshes run in the order they were first requested.
+    """
+
+    def __init__(self, widget: tk.Misc) -> None:
+        self._widget = widget
+        self._pending: dict[Refresh, None] = {}
+        self._job: str | None = None
+
+    def request(self, refresh: Refresh) -> None:
+        self._pending[refresh] = None
+        if self._job is None:
+            self._job = self._widget.after_idle(self._on_idle)
+
+    def flush(self) -> None:
+        """Run every pending refresh now."""
+        if self._job is not None:
+            self._widget.after_cancel(self._job)
+            self._job = None
+        self._run_pending()
+
+    def _on_idle(self) -> None:
+        self._job = None
+        self._run_pending()
+
+    def _run_pending(self) -> None:
+        pending, self._pending = self._pending, {}
+        for refresh in pending:
+            refresh()
+
+    def cancel(self) -> None:
+        if self._job is not None:
+            self._widget.after_cancel(self._job)
+            self._job = None
+        self._pending.clear()
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import tkinter as tk
+from collections.abc import Callable
+from functools import partial
+from tkinter import ttk
+
+from ..large_file import MappedTextFile
+
+SCROLL_MARGIN = 200
+INDEX_POLL_MS = 200
+WHEEL_LINES = 3
+
+_SCROLL_KEYS = {
+    "<Up>": ("units", -1),
+    "<Down>": ("units", 1),
+    "<Prior>": ("pages", -1),
+    "<Next>": ("pages", 1),
+    "<Control-Home>": ("start", 0),
+    "<Control-End>": ("end", 0),
+}
+
+
+class LargeFileView:
+    """Virtualized read-only view over a memory-mapped file.
+
+    Only the visible lines plus ``SCROLL_MARGIN`` lines on either side are
+    materialized in the text widget; the scrollbar tracks the position in
+    the whole file.
+    """
+
+    def __init__(
+        self,
+        text: tk.Text,
+        scrollbar: ttk.Scrollbar,
+        source: MappedTextFile,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> None:
+        self._text = text
+        self._scrollbar = scrollbar
+        self._source = source
+        self._on_progress = on_progress
+        self._top = 0
+        self._window_start = 0
+        self._window_end = 0
+        self._poll_job: str | None = None
+        self._saved_wrap = str(text.cget("wrap"))
+        self._saved_yscroll = str(text.cget("yscrollcommand"))
+        self._saved_undo = bool(text.cget("undo"))
+
+        text.config(wrap="none", undo=False, state="normal", yscrollcommand="")
+        text.delete("1.0", tk.END)
+        text.config(state="disabled")
+        scrollbar.config(command=self._on_scrollbar)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            text.bind(sequence, self._on_wheel)
+        for sequence, (what, amount) in _SCROLL_KEYS.items():
+            text.bind(sequence, partial(self._on_key_event, what, amount))
+        self._poll_index()
+
+    @property
+    def source(self) -> MappedTextFile:
+        return self._source
+
+    def absolute_line(self, widget_line: int) -> int:
+        """Map a 1-based widget line number to a 1-based file line number."""
+        return self._window_start + widget_line
+
+    def scroll_to(self, top: int) -> None:
+        total = self._source.line_count
+        rows = self._visible_rows()
+        top = max(0, min(top, max(total - rows, 0)))
+        self._top = top
+        if top < self._window_start or min(total, top + rows) > self._window_end:
+            self._materialize(top, rows)
+        self._text.yview(f"{top - self._window_start + 1}.0")
+        if total:
+            self._scrollbar.set(top / total, min(top + rows, total) / total)
+        else:
+            self._scrollbar.set(0.0, 1.0)
+
+    def close(self) -> None:
+        if self._poll_job is not None:
+            self._text.after_cancel(self._poll_job)
+            self._poll_job = None
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>", *_SCROLL_KEYS):
+            self._text.unbind(sequence)
+        self._text.config(state="normal")
+        self._text.delete("1.0", tk.END)
+        self._text.config(
+            {"wrap": self._saved_wrap, "yscrollcommand": self._saved_yscroll},
+            undo=self._saved_undo,
+        )
+        self._text.edit_reset()
+        self._source.close()
+
+    def _materialize(self, top: int, rows: int) -> None:
+        start = max(0, top - SCROLL_MARGIN)
+        lines = self._source.lines(start, rows + 2 * SCROLL_MARGIN)
+        self._window_start = start
+        self._window_end = start + len(lines)
+        self._text.config(state="normal")
+        self._text.delete("1.0", tk.END)
+        self._text.insert("1.0", "\n".join(lines))
+        self._text.config(state="disabled")
+
+    def _visible_rows(self) -> int:
+        linespace = int(
+            self._text.tk.call("font", "metrics", self._text.cget("font"), "-linespace")
+        )
+        return max(1, self._text.winfo_height() // max(linespace, 1))
+
+    def _poll_index(self) -> None:
+        self._poll_job = None
+        self.scroll_to(self._top)
+        if self._on_progress:
+            self._on_progress(self._source.index_progress)
+        if not self._source.index_complete:
+            self._poll_job = self._text.after(INDEX_POLL_MS, self._poll_index)
+
+    def _on_scrollbar(self, action: str, *args: str) -> None:
+        if action == "moveto":
+            self.scroll_to(int(float(args[0]) * self._source.line_count))
+        elif action == "scroll":
+            self._on_key(args[1], int(args[0]))
+
+    def _on_key(self, what: str, amount: int) -> str:
+        if what == "units":
+            self.scroll_to(self._top + amount)
+        elif what == "pages":
+            self.scroll_to(self._top + amount * self._visible_rows())
+        elif what == "start":
+            self.scroll_to(0)
+        else:
+            self.scroll_to(self._source.line_count)
+        return "break"
+
+    def _on_key_event(self, what: str, amount: int, _event: tk.Event) -> str:
+        return self._on_key(what, amount)
+
+    def _on_wheel(self, event: tk.Event) -> str:
+        if event.num == 4:
+            step = -WHEEL_LINES
+        elif event.num == 5:
+            step = WHEEL_LINES
+        elif abs(event.delta) >= 120:
+            step = -WHEEL_LINES * (event.delta // 120)
+        else:
+            step = -event.delta
+        self.scroll_to(self._top + step)
+        return "break"
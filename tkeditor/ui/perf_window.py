@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import time
+import tkinter as tk
+from collections.abc import Callable
+from tkinter import ttk
+
+from ..perf import PerfRecorder
+from .window_utils import center_window
+
+STALL_SPAN = "tk.stall"
+STALL_INTERVAL_MS = 100
+STALL_THRESHOLD = 0.05
+REFRESH_MS = 1000
+RECENT_SHOWN = 5
+
+COLUMNS = (
+    ("count", "Count", 60),
+    ("mean", "Mean ms", 80),
+    ("p50", "p50 ms", 80),
+    ("p95", "p95 ms", 80),
+    ("max", "Max ms", 80),
+    ("recent", "Recent ms", 220),
+)
+
+
+class StallMonitor:
+    """Record how long the Tk event loop was blocked.
+
+    A timer is scheduled every ``interval_ms``; when it fires more than
+    ``threshold`` seconds late, the delay is recorded as a ``tk.stall`` span.
+    """
+
+    def __init__(
+        self,
+        widget: tk.Misc,
+        recorder: PerfRecorder,
+        interval_ms: int = STALL_INTERVAL_MS,
+        threshold: float = STALL_THRESHOLD,
+    ) -> None:
+        self._widget = widget
+        self._recorder = recorder
+        self._interval_ms = interval_ms
+        self._threshold = threshold
+        self._expected = 0.0
+        self._job: str | None = None
+
+    def start(self) -> None:
+        if self._job is None:
+            self._schedule()
+
+    def stop(self) -> None:
+        if self._job is not None:
+            self._widget.after_cancel(self._job)
+            self._job = None
+
+    def _schedule(self) -> None:
+        self._expected = time.perf_counter() + self._interval_ms / 1000
+        self._job = self._widget.after(self._interval_ms, self._tick)
+
+    def _tick(self) -> None:
+        lag = time.perf_counter() - self._expected
+        if lag > self._threshold:
+            self._recorder.record(STALL_SPAN, lag)
+        self._schedule()
+
+
+class PerformanceWindow:
+    """Table of span latencies, refreshed while the window is open."""
+
+    def __init__(
+        self,
+        parent: tk.Tk,
+        recorder: PerfRecorder,
+        on_close: Callable[[], None] | None = None,
+    ) -> None:
+        self._recorder = recorder
+        self._on_close = on_close
+        self._job: str | None = None
+
+        self._window = tk.Toplevel(parent)
+        self._window.title("Performance")
+        self._window.transient(parent)
+        self._window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self._build_ui()
+        self.refresh()
+        center_window(self._window)
+
+    def _build_ui(self) -> None:
+        frame = tk.Frame(self._window, padx=10, pady=10)
+        frame.pack(fill="both", expand=True)
+
+        self._tree = ttk.Treeview(
+            frame, columns=[name for name, _, _ in COLUMNS], height=14
+        )
+        self._tree.heading("#0", text="Span")
+        self._tree.column("#0", width=180)
+        for name, title, width in COLUMNS:
+            self._tree.heading(name, text=title)
+            self._tree.column(name, width=width, anchor="e")
+        self._tree.pack(fill="both", expand=True)
+
+        buttons = tk.Frame(frame)
+        buttons.pack(fill="x", pady=(8, 0))
+        tk.Button(buttons, text="Reset", command=self._reset).pack(side="left")
+        tk.Button(buttons, text="Close", command=self.close).pack(side="right")
+
+    def refresh(self) -> None:
+        self._job = None
+        self._tree.delete(*self._tree.get_children())
+        for name, hist in sorted(self._recorder.snapshot().items()):
+            recent = list(hist.recent)[-RECENT_SHOWN:]
+            self._tree.insert(
+                "",
+                "end",
+                text=name,
+                values=(
+                    hist.count,
+                    f"{hist.mean * 1000:.1f}",
+                    f"{hist.percentile(0.5) * 1000:.1f}",
+                    f"{hist.percentile(0.95) * 1000:.1f}",
+                    f"{hist.max * 1000:.1f}",
+                    " ".join(f"{seconds * 1000:.1f}" for seconds in reversed(recent)),
+                ),
+            )
+        self._job = self._window.after(REFRESH_MS, self.refresh)
+
+    def _reset(self) -> None:
+        self._recorder.reset()
+        if self._job is not None:
+            self._window.after_cancel(self._job)
+        self.refresh()
+
+    def focus(self) -> None:
+        self._window.deiconify()
+        self._window.lift()
+        self._window.focus_force()
+
+    def close(self) -> None:
+        if self._job is not None:
+            self._window.after_cancel(self._job)
+            self._job = None
+        self._window.destroy()
+        if self._on_close:
+            self._on_close()
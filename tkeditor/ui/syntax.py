@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import threading
+import tkinter as tk
+from collections import defaultdict
+from collections.abc import Mapping
+from itertools import accumulate
+
+from .. import perf
+from ..document import DocumentSnapshot, PieceTable, tk_length
+from ..highlight import TOKEN_KINDS, UNKNOWN, Lexer, LineStates
+from .idle import IdleCoalescer
+from .text_proxy import Position
+
+TAG_PREFIX = "syntax."
+# Lines lexed on the Tk thread after an edit; anything left goes to a worker.
+FOREGROUND_BUDGET = 200
+JOB_CHUNK_LINES = 20_000
+JOB_RESTART_MS = 300
+WINDOW_MARGIN_LINES = 100
+
+
+class SyntaxHighlighter:
+    """Colour the tokens of a Text widget's document.
+
+    The whole document is lexed on a worker thread that only records the
+    lexer state at the start of every line. Tags are applied to the lines
+    around the viewport, lexing them from the recorded state, and an edit
+    re-lexes from the edited line until the states converge again.
+    """
+
+    def __init__(
+        self, text: tk.Text, document: PieceTable, ui_updates: IdleCoalescer
+    ) -> None:
+        self._text = text
+        self._document = document
+        self._ui_updates = ui_updates
+        self._states: LineStates | None = None
+        # Cancel event of the running worker; bumping the generation makes
+        # the results it has already posted stale.
+        self._job: threading.Event | None = None
+        self._generation = 0
+        self._restart_job: str | None = None
+        # 0-based first and last line currently tagged.
+        self._window: tuple[int, int] | None = None
+        # Between begin_bulk and end_bulk edits only move the first edited line.
+        self._bulk = False
+        self._bulk_first: int | None = None
+
+    @property
+    def lexer(self) -> Lexer | None:
+        return self._states.lexer if self._states is not None else None
+
+    def set_colors(self, colors: Mapping[str, str]) -> None:
+        for kind in TOKEN_KINDS:
+            tag = TAG_PREFIX + kind
+            self._text.tag_configure(tag, foreground=colors.get(kind, ""))
+            # Below the selection and the find tags.
+            self._text.tag_lower(tag)
+
+    def set_lexer(self, lexer: Lexer | None) -> None:
+        """Highlight the current document with ``lexer`` (None to stop)."""
+        self._cancel_job()
+        if self._restart_job is not None:
+            self._text.after_cancel(self._restart_job)
+            self._restart_job = None
+        self._clear_tags()
+        self._states = None
+        self._bulk = False
+        self._bulk_first = None
+        if lexer is not None:
+            self._states = LineStates(lexer, self._document.line_count)
+            self._start_job()
+
+    def note_edit(self, start: Position, end: Position, inserted: str) -> None:
+        """Record an edit reported by the change proxy (positions before it)."""
+        if self._states is None:
+            return
+        self._cancel_job()
+        line = start[0] - 1
+        if self._bulk:
+            first = self._bulk_first
+            self._bulk_first = line if first is None else min(first, line)
+            return
+        removed = end[0] - start[0]
+        added = inserted.count("\n")
+        self._states.edit(line, removed, added)
+        self._shift_window(line, added - removed)
+        self._ui_updates.request(self._update)
+
+    def begin_bulk(self) -> None:
+        """Treat the edits until ``end_bulk`` as one change to re-lex."""
+        self._bulk = True
+        self._bulk_first = None
+
+    def end_bulk(self) -> None:
+        first = self._bulk_first
+        self._bulk = False
+        self._bulk_first = None
+        if self._states is None or first is None:
+            return
+        self._states.restart(first, self._document.line_count)
+        self._clear_tags()
+        self._ui_updates.request(self._update)
+
+    def refresh_window(self) -> None:
+        """Retag if the viewport has moved outside the tagged lines."""
+        if self._states is None or self._bulk:
+            return
+        first, last = self._visible_lines()
+        if self._window is not None:
+            low, high = self._window
+            if low <= first and last <= high:
+                return
+        self._tag_window()
+
+    @perf.timed("syntax.update")
+    def _update(self) -> None:
+        states = self._states
+        if states is None or self._bulk or not states.dirty:
+            return
+        first = states.dirty[0]
+        last = states.relex(self._line, FOREGROUND_BUDGET)
+        if states.dirty:
+            # Lines further down may change colour once the worker is done;
+            # until then they are lexed on from the states known so far.
+            last = len(states.states) - 1
+            self._schedule_restart()
+        self._retag(first, last)
+
+    def _line(self, line: int) -> str:
+        return self._text.get(f"{line + 1}.0", f"{line + 1}.end")
+
+    def _schedule_restart(self) -> None:
+        # Typing cancels the worker; start it again once the edits pause.
+        if self._restart_job is not None:
+            self._text.after_cancel(self._restart_job)
+        self._restart_job = self._text.after(JOB_RESTART_MS, self._start_job)
+
+    def _start_job(self) -> None:
+        self._restart_job = None
+        states = self._states
+        if states is None or not states.dirty or self._job is not None:
+            return
+        cancel = threading.Event()
+        self._job = cancel
+        self._generation += 1
+        threading.Thread(
+            target=self._lex_thread,
+            args=(states.copy(), self._document.snapshot(), self._generation, cancel),
+            name="tkeditor-syntax",
+            daemon=True,
+        ).start()
+
+    def _cancel_job(self) -> None:
+        if self._job is not None:
+            self._job.set()
+            self._job = None
+        self._generation += 1
+
+    @perf.timed("syntax.lex")
+    def _lex_thread(
+        self,
+        states: LineStates,
+        snapshot: DocumentSnapshot,
+        generation: int,
+        cancel: threading.Event,
+    ) -> None:
+        lines = snapshot.text().split("\n")
+        while states.dirty and not cancel.is_set():
+            states.relex(lines.__getitem__, JOB_CHUNK_LINES)
+            try:
+                self._text.after(0, self._merge, states.copy(), generation)
+            except (RuntimeError, tk.TclError):
+                # The main loop has gone away.
+                return
+
+    def _merge(self, states: LineStates, generation: int) -> None:
+        if generation != self._generation or self._states is None:
+            return
+        self._states = states
+        if not states.dirty:
+            self._job = None
+        self._tag_window()
+
+    def _visible_lines(self) -> tuple[int, int]:
+        first = int(self._text.index("@0,0").split(".")[0])
+        height = self._text.winfo_height()
+        last = int(self._text.index(f"@0,{height}").split(".")[0])
+        return first - 1, last - 1
+
+    def _shift_window(self, line: int, delta: int) -> None:
+        if self._window is None or not delta:
+            return
+        low, high = self._window
+        if line < low:
+            low = max(0, low + delta)
+        if line <= high:
+            high += delta
+        self._window = (low, high) if high >= low else None
+
+    def _tag_window(self) -> None:
+        if self._states is None:
+            return
+        first, last = self._visible_lines()
+        low = max(0, first - WINDOW_MARGIN_LINES)
+        high = min(len(self._states.states) - 1, last + WINDOW_MARGIN_LINES)
+        self._clear_tags()
+        self._window = (low, high)
+        self._tag_lines(low, high)
+
+    def _retag(self, first: int, last: int) -> None:
+        if self._window is None:
+            self._tag_window()
+            return
+        low, high = self._window
+        first, last = max(first, low), min(last, high)
+        if first <= last:
+            self._tag_lines(first, last)
+
+    def _tag_lines(self, first: int, last: int) -> None:
+        """Lex lines ``first`` to ``last`` and replace their tags."""
+        assert self._states is not None
+        start, end = f"{first + 1}.0", f"{last + 1}.end"
+        for kind in TOKEN_KINDS:
+            self._text.tag_remove(TAG_PREFIX + kind, start, end)
+        lexer = self._states.lexer
+        state = self._states.states[first] if first < len(self._states.states) else 0
+        if state == UNKNOWN:
+            state = 0
+        ranges: defaultdict[str, list[str]] = defaultdict(list)
+        for number, line in enumerate(
+            self._text.get(start, end).split("\n"), first + 1
+        ):
+            tokens, state = lexer.lex_line(line, state)
+            columns = _tk_columns(line)
+            for token_start, token_end, kind in tokens:
+                if columns is not None:
+                    token_start, token_end = columns[token_start], columns[token_end]
+                ranges[kind] += (f"{number}.{token_start}", f"{number}.{token_end}")
+        for kind, indices in ranges.items():
+            self._text.tag_add(TAG_PREFIX + kind, *indices)
+
+    def _clear_tags(self) -> None:
+        self._window = None
+        for kind in TOKEN_KINDS:
+            self._text.tag_remove(TAG_PREFIX + kind, "1.0", tk.END)
+
+
+def _tk_columns(line: str) -> list[int] | None:
+    """Tk column of each character offset in ``line``, or None if they match."""
+    if tk_length(line) == len(line):
+        return None
+    return list(accumulate((2 if ord(c) > 0xFFFF else 1 for c in line), initial=0))
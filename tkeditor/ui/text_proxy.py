@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import tkinter as tk
+from collections.abc import Callable
+from typing import Any
+
+Position = tuple[int, int]
+ChangeCallback = Callable[[Position, Position, str], None]
+
+
+class TextChangeProxy:
+    """Intercept ``insert``/``delete``/``replace`` calls on a Tk text widget.
+
+    The widget command is renamed, as ``idlelib.redirector`` does, and
+    replaced by a small Tcl proc so every modification -- from key bindings,
+    the clipboard, undo/redo or application code -- is reported to
+    ``on_change`` as "range ``start``-``end`` replaced by ``inserted``".
+    Positions are Tk ``(line, column)`` pairs taken before the edit. Other
+    widget subcommands go straight to the original command without a Python
+    round trip, and Tcl errors propagate to the caller unchanged.
+    """
+
+    def __init__(self, text: tk.Text, on_change: ChangeCallback) -> None:
+        self._text = text
+        self._on_change = on_change
+        self._widget = str(text)
+        self._orig = f"{self._widget}_orig"
+        self._handler = f"{self._widget}_change"
+        text.tk.call("rename", self._widget, self._orig)
+        text.tk.createcommand(self._handler, self._dispatch)
+        text.tk.eval(
+            _PROXY_PROC.format(
+                widget=self._widget, orig=self._orig, handler=self._handler
+            )
+        )
+
+    def close(self) -> None:
+        """Restore the original widget command."""
+        self._text.tk.call("rename", self._widget, "")
+        self._text.tk.call("rename", self._orig, self._widget)
+        self._text.tk.deletecommand(self._handler)
+
+    def _call(self, *args: str) -> Any:
+        return self._text.tk.call(self._orig, *args)
+
+    def _dispatch(self, operation: str, *args: str) -> tuple[int, Any]:
+        try:
+            if not args or not self._editable():
+                result = self._call(operation, *args)
+            elif operation == "insert":
+                result = self._insert(*args)
+            elif operation == "delete":
+                result = self._delete(*args)
+            else:
+                result = self._replace(*args)
+        except tk.TclError as exc:
+            return 1, str(exc)
+        return 0, result
+
+    def _editable(self) -> bool:
+        return str(self._call("cget", "-state")) == "normal"
+
+    def _insert(self, index: str, *chunks: str) -> Any:
+        start = self._position(index)
+        result = self._call("insert", index, *chunks)
+        inserted = "".join(chunks[::2])
+        if inserted:
+            self._on_change(start, start, inserted)
+        return result
+
+    def _delete(self, *indices: str) -> Any:
+        if len(indices) > 2:
+            # Multiple ranges: apply them back to front so positions stay valid.
+            pairs = [indices[i : i + 2] for i in range(0, len(indices), 2)]
+            ranges = sorted((self._range(*pair) for pair in pairs), reverse=True)
+            for start, end in ranges:
+                self._delete(_format(start), _format(end))
+            return ""
+        start, end = self._range(*indices)
+        if start >= end:
+            return ""
+        result = self._call("delete", _format(start), _format(end))
+        self._on_change(start, end, "")
+        return result
+
+    def _replace(self, first: str, last: str, *chunks: str) -> Any:
+        start, end = self._range(first, last)
+        result = self._call("replace", _format(start), _format(end), *chunks)
+        inserted = "".join(chunks[::2])
+        if start < end or inserted:
+            self._on_change(start, max(start, end), inserted)
+        return result
+
+    def _range(self, first: str, last: str | None = None) -> tuple[Position, Position]:
+        start = self._position(first)
+        end = self._position(last if last is not None else f"{first}+1c")
+        return start, end
+
+    def _position(self, index: str) -> Position:
+        """Normalize ``index``, clamping to the last editable position."""
+        if self._text.tk.getboolean(self._call("compare", index, ">", "end-1c")):
+            index = "end-1c"
+        line, column = str(self._call("index", index)).split(".")
+        return int(line), int(column)
+
+
+_PROXY_PROC = """
+proc {{{widget}}} {{operation args}} {{
+    if {{$operation in {{insert delete replace}}}} {{
+        lassign [{{{handler}}} $operation {{*}}$args] code result
+        return -code $code $result
+    }}
+    tailcall {{{orig}}} $operation {{*}}$args
+}}
+"""
+
+
+def _format(position: Position) -> str:
+    return f"{position[0]}.{position[1]}"
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import IO
+
+from .document import TextEdit
+
+DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024
+DEFAULT_SPILL_LIMIT = 512 * 1024 * 1024
+# The spill file is compacted once it is twice its live size, or this.
+SPILL_COMPACT_MIN_BYTES = 1024 * 1024
+
+Group = list[TextEdit]
+
+
+class _SpilledGroup:
+    __slots__ = ("offset", "size")
+
+    def __init__(self, offset: int, size: int) -> None:
+        self.offset = offset
+        self.size = size
+
+
+class UndoManager:
+    """Undo/redo history of ``TextEdit`` groups with a memory budget.
+
+    Edits are grouped the way Tk's autoseparators group them: consecutive
+    single-character inserts or deletes at adjacent positions form one
+    group, anything else starts a new one. ``begin_group``/``end_group``
+    force a single group (e.g. for Replace All).
+
+    When the resident history exceeds ``memory_limit`` bytes, the oldest
+    groups are spilled to an anonymous temp file, up to ``spill_limit``
+    bytes; beyond that (or with ``spill_limit=0``) they are discarded.
+    """
+
+    def __init__(
+        self,
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+        spill_limit: int = DEFAULT_SPILL_LIMIT,
+    ) -> None:
+        self.memory_limit = memory_limit
+        self.spill_limit = spill_limit
+        self._undo: deque[Group] = deque()
+        self._redo: list[Group] = []
+        self._spilled: deque[_SpilledGroup] = deque()
+        self._spill_file: IO[bytes] | None = None
+        self._spill_end = 0
+        self._memory = 0
+        self._disk = 0
+        self._open = False
+        self._depth = 0
+        self._applying = False
+
+    @property
+    def memory_usage(self) -> int:
+        return self._memory
+
+    @property
+    def disk_usage(self) -> int:
+        return self._disk
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo or self._spilled)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def record(self, edit: TextEdit) -> None:
+        """Add an edit made to the document; ignored while undoing."""
+        if self._applying:
+            return
+        if self._redo:
+            self._memory -= sum(_group_cost(group) for group in self._redo)
+            self._redo.clear()
+        if self._open and self._undo and self._continues(self._undo[-1], edit):
+            self._undo[-1].append(edit)
+        else:
+            self._undo.append([edit])
+            self._open = True
+        self._memory += _edit_cost(edit)
+        if self._depth == 0 and not _is_single(edit):
+            self._open = False
+        self._enforce_budget()
+
+    def separator(self) -> None:
+        """Make the next recorded edit start a new group."""
+        if self._depth == 0:
+            self._open = False
+
+    def begin_group(self) -> None:
+        if self._depth == 0:
+            self._open = False
+        self._depth += 1
+
+    def end_group(self) -> None:
+        self._depth = max(0, self._depth - 1)
+        if self._depth == 0:
+            self._open = False
+
+    def undo(self) -> list[TextEdit]:
+        """Pop the newest group and return the edits that revert it, in order."""
+        group = self._pop_undo()
+        if group is None:
+            return []
+        self._redo.append(group)
+        self._open = False
+        return [
+            TextEdit(edit.offset, edit.inserted, edit.deleted)
+            for edit in reversed(group)
+        ]
+
+    def redo(self) -> list[TextEdit]:
+        """Pop the newest undone group and return its edits, in order."""
+        if not self._redo:
+            return []
+        group = self._redo.pop()
+        self._undo.append(group)
+        self._open = False
+        self._enforce_budget()
+        return list(group)
+
+    @contextmanager
+    def applying(self) -> Iterator[None]:
+        """Suppress ``record`` while undo/redo edits are applied."""
+        self._applying = True
+        try:
+            yield
+        finally:
+            self._applying = False
+
+    def reset(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
+        self._spilled.clear()
+        self._memory = 0
+        self._disk = 0
+        self._spill_end = 0
+        self._open = False
+        self._depth = 0
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def close(self) -> None:
+        self.reset()
+
+    def _continues(self, group: Group, edit: TextEdit) -> bool:
+        if self._depth:
+            return True
+        last = group[-1]
+        if not (_is_single(edit) and _is_single(last)):
+            return False
+        if edit.inserted and last.inserted:
+            return edit.offset == last.offset + 1
+        if edit.deleted and last.deleted:
+            # Backspace moves left; forward delete stays put.
+            return edit.offset in (last.offset - 1, last.offset)
+        return False
+
+    def _pop_undo(self) -> Group | None:
+        if self._undo:
+            return self._undo.pop()  # still counted, now on the redo stack
+        if not self._spilled:
+            return None
+        # The newest spilled group is always the last record in the file.
+        spilled = self._spilled.pop()
+        group = self._read_spilled(spilled)
+        self._disk -= spilled.size
+        self._spill_end = spilled.offset
+        assert self._spill_file is not None
+        self._spill_file.truncate(spilled.offset)
+        self._memory += _group_cost(group)
+        return group
+
+    def _enforce_budget(self) -> None:
+        # Keep the newest group resident so typing never hits the disk.
+        while self._memory > self.memory_limit and len(self._undo) > 1:
+            group = self._undo.popleft()
+            self._memory -= _group_cost(group)
+            if self.spill_limit > 0:
+                self._spill(group)
+        while self._disk > self.spill_limit and self._spilled:
+            self._disk -= self._spilled.popleft().size
+        if self._spill_end > 2 * max(self._disk, SPILL_COMPACT_MIN_BYTES):
+            self._compact_spill()
+
+    def _spill(self, group: Group) -> None:
+        # Spilled groups are older than every resident one, so they are
+        # appended in order and read back from the end of the file.
+        if self._spill_file is None:
+            self._spill_file = _open_spill_file()
+        payload = json.dumps(
+            [(edit.offset, edit.deleted, edit.inserted) for edit in group]
+        ).encode("utf-8", "surrogatepass")
+        self._spill_file.seek(self._spill_end)
+        self._spill_file.write(payload)
+        self._spilled.append(_SpilledGroup(self._spill_end, len(payload)))
+        self._spill_end += len(payload)
+        self._disk += len(payload)
+
+    def _read_spilled(self, spilled: _SpilledGroup) -> Group:
+        assert self._spill_file is not None
+        self._spill_file.seek(spilled.offset)
+        records = json.loads(self._spill_file.read(spilled.size))
+        return [TextEdit(*record) for record in records]
+
+    def _compact_spill(self) -> None:
+        """Rewrite the spill file without the space of evicted groups."""
+        old_file, old_groups = self._spill_file, list(self._spilled)
+        if old_file is None:
+            return
+        self._spill_file = _open_spill_file()
+        self._spilled.clear()
+        self._spill_end = 0
+        for spilled in old_groups:
+            old_file.seek(spilled.offset)
+            payload = old_file.read(spilled.size)
+            self._spill_file.write(payload)
+            self._spilled.append(_SpilledGroup(self._spill_end, spilled.size))
+            self._spill_end += spilled.size
+        old_file.close()
+
+
+def _open_spill_file() -> IO[bytes]:
+    # Owned by the manager and closed in reset(); deleted by the OS on close.
+    return tempfile.TemporaryFile(prefix="tkeditor-undo-")  # noqa: SIM115
+
+
+def _is_single(edit: TextEdit) -> bool:
+    return len(edit.inserted) + len(edit.deleted) == 1
+
+
+def _edit_cost(edit: TextEdit) -> int:
+    return (
+        sys.getsizeof(edit) + sys.getsizeof(edit.deleted) + sys.getsizeof(edit.inserted)
+    )
+
+
+def _group_cost(group: Group) -> int:
+    return sum(_edit_cost(edit) for edit in group)
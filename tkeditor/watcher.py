@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+# (st_mtime_ns, st_size, st_ino): rewriting, appending to or replacing the
+# file (an atomic save or log rotation gives it a new inode) all change it.
+FileStat = tuple[int, int, int]
+ChangeHandler = Callable[[Path], None]
+
+POLL_INTERVAL = 2.0
+# With inotify the events say which files to check, but everything is still
+# stat'ed this often for file systems (network shares) that send none.
+FULL_POLL_SECONDS = 30.0
+
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+)
+# struct inotify_event: wd, mask, cookie, len, then a padded name.
+_EVENT = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+def file_stat(path: Path) -> FileStat | None:
+    """Identity of the current contents of ``path``, or None if it is missing."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class _Inotify:
+    """Minimal ctypes binding to Linux inotify.
+
+    Directories are watched rather than files, so that a file replaced by a
+    rename is still reported under its name.
+    """
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = (ctypes.c_int, ctypes.c_int)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, Path] = {}
+        self._watches: dict[Path, int] = {}
+
+    def add(self, directory: Path) -> None:
+        wd = self._add_watch(self.fd, os.fsencode(directory), _IN_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(directory))
+        self._watches[directory] = wd
+        self._dirs[wd] = directory
+
+    def remove(self, directory: Path) -> None:
+        wd = self._watches.pop(directory, None)
+        if wd is not None:
+            del self._dirs[wd]
+            self._rm_watch(self.fd, wd)
+
+    def read(self) -> set[Path]:
+        """Paths named by the events queued so far."""
+        named: set[Path] = set()
+        while True:
+            try:
+                data = os.read(self.fd, _READ_SIZE)
+            except BlockingIOError:
+                return named
+            offset = 0
+            while offset < len(data):
+                wd, _mask, _cookie, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                directory = self._dirs.get(wd)
+                if directory is not None and name:
+                    named.add(directory / os.fsdecode(name))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """Report watched files whose contents change on disk.
+
+    ``on_change(path)`` is called on the watcher thread when the
+    ``file_stat`` of a watched path differs from the last one seen, which
+    starts out as the stat passed to ``watch``. Paths are reported in
+    absolute form. On Linux, inotify events name the files to check;
+    elsewhere, or when inotify is unavailable, every file is stat'ed each
+    ``interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        on_change: ChangeHandler,
+        interval: float = POLL_INTERVAL,
+        use_inotify: bool = True,
+    ) -> None:
+        self._on_change = on_change
+        self._interval = interval
+        self._files: dict[Path, FileStat | None] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._logger = logging.getLogger("tkeditor")
+        self._inotify: _Inotify | None = None
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as exc:
+                self._logger.debug("Polling for file changes: %s", exc)
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._inotify is not None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="tkeditor-watcher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self._interval + 1)
+            self._thread = None
+        with self._lock:
+            if self._inotify is not None:
+                self._inotify.close()
+                self._inotify = None
+
+    def watch(self, path: Path, stat: FileStat | None) -> None:
+        """Watch ``path``, whose contents were last seen with ``stat``."""
+        path = Path(os.path.abspath(path))
+        with self._lock:
+            new_dir = all(known.parent != path.parent for known in self._files)
+            self._files[path] = stat
+            if new_dir and self._inotify is not None:
+                try:
+                    self._inotify.add(path.parent)
+                except OSError as exc:
+                    # Still covered by the periodic full poll.
+                    self._logger.debug("Cannot watch %s: %s", path.parent, exc)
+
+    def unwatch(self, path: Path) -> None:
+        path = Path(os.path.abspath(path))
+        with self._lock:
+            if self._files.pop(path, False) is False:
+                return
+            last_in_dir = all(known.parent != path.parent for known in self._files)
+            if last_in_dir and self._inotify is not None:
+                self._inotify.remove(path.parent)
+
+    def _run(self) -> None:
+        full_poll = FULL_POLL_SECONDS if self._inotify is not None else self._interval
+        next_poll = time.monotonic()
+        while not self._stop.is_set():
+            if time.monotonic() >= next_poll:
+                next_poll = time.monotonic() + full_poll
+                with self._lock:
+                    paths = list(self._files)
+                self._check(paths)
+            timeout = min(self._interval, max(next_poll - time.monotonic(), 0.0))
+            self._check(self._wait(timeout))
+
+    def _wait(self, timeout: float) -> set[Path]:
+        inotify = self._inotify
+        if inotify is None:
+            self._stop.wait(timeout)
+            return set()
+        try:
+            ready, _, _ = select.select([inotify.fd], [], [], timeout)
+        except (OSError, ValueError):
+            # Closed by stop().
+            return set()
+        with self._lock:
+            if not ready or self._inotify is None:
+                return set()
+            return self._inotify.read()
+
+    def _check(self, paths: Iterable[Path]) -> None:
+        for path in paths:
+            stat = file_stat(path)
+            with self._lock:
+                if path not in self._files or self._files[path] == stat:
+                    continue
+                self._files[path] = stat
+            self._on_change(path)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import codecs
+import zlib
+from collections.abc import Hashable, Iterable, Iterator, Sequence
+from typing import TypeVar
+
+from .io import STREAM_CHUNK_SIZE
+
+# Rough resident cost of one character of an open document: the text
+# widget's copy, the piece table's buffers and the search index.
+BYTES_PER_CHAR = 4
+COMPRESS_LEVEL = 1
+
+K = TypeVar("K", bound=Hashable)
+
+
+class CompressedText:
+    """A document's text kept zlib-compressed in memory.
+
+    Used for background tabs with unsaved changes, which cannot simply be
+    dropped and read back from disk.
+    """
+
+    __slots__ = ("data", "length")
+
+    def __init__(self, data: bytes, length: int) -> None:
+        self.data = data
+        self.length = length
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[str]) -> CompressedText:
+        compressor = zlib.compressobj(COMPRESS_LEVEL)
+        parts = []
+        length = 0
+        for chunk in chunks:
+            length += len(chunk)
+            parts.append(compressor.compress(chunk.encode("utf-8", "surrogatepass")))
+        parts.append(compressor.flush())
+        return cls(b"".join(parts), length)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data)
+
+    def iter_chunks(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+        decompressor = zlib.decompressobj()
+        decoder = codecs.getincrementaldecoder("utf-8")("surrogatepass")
+        for start in range(0, len(self.data), chunk_size):
+            raw = decompressor.decompress(self.data[start : start + chunk_size])
+            if text := decoder.decode(raw):
+                yield text
+        if text := decoder.decode(decompressor.flush(), final=True):
+            yield text
+
+    def text(self) -> str:
+        return "".join(self.iter_chunks())
+
+
+def memory_estimate(length: int) -> int:
+    """Approximate bytes held for an open document of ``length`` characters."""
+    return length * BYTES_PER_CHAR
+
+
+def select_evictions(
+    candidates: Sequence[tuple[K, int]], total: int, budget: int
+) -> list[K]:
+    """Keys to evict, least recently used first, to bring ``total`` under ``budget``.
+
+    ``candidates`` are ``(key, bytes freed by evicting it)`` pairs ordered
+    from least to most recently used.
+    """
+    evict = []
+    for key, size in candidates:
+        if total <= budget:
+            break
+        evict.append(key)
+        total -= size
+    return evict